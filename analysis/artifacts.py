@@ -0,0 +1,175 @@
+# analysis/artifacts.py
+#
+# Content-addressed cache for derived analysis artifacts.
+#
+# A Step names its inputs (the run itself, "run", or other steps) and
+# its parameters. Its artifact key is a hash of the step name, version,
+# parameters and the keys of its inputs; the run's key is a hash of its
+# JSON content. An artifact is recomputed only when that key is new.
+# Artifacts live under root/objects/<key>.pkl. Each run gets a manifest,
+# root/runs/<run key>.json, mapping step name -> artifact key.
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+
+class Step:
+    def __init__(self, name, func, inputs=("run",), params=None, version=1):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.version = version
+
+
+def content_hash(obj):
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _topological(steps):
+    by_name = {s.name: s for s in steps}
+    order, seen = [], set()
+
+    def visit(step, stack=()):
+        if step.name in seen:
+            return
+        if step.name in stack:
+            raise ValueError(f"cyclic step dependency at {step.name}")
+        for dep in step.inputs:
+            if dep != "run":
+                visit(by_name[dep], stack + (step.name,))
+        seen.add(step.name)
+        order.append(step)
+
+    for step in steps:
+        visit(step)
+    return order
+
+
+def _select(steps, targets=None):
+    """
+    Steps in dependency order; only `targets` and what they need.
+    """
+    order = _topological(steps)
+    if targets is None:
+        return order
+    by_name = {s.name: s for s in steps}
+    needed, stack = set(), list(targets)
+    while stack:
+        name = stack.pop()
+        if name in needed or name == "run":
+            continue
+        needed.add(name)
+        stack.extend(by_name[name].inputs)
+    return [s for s in order if s.name in needed]
+
+
+def compute(steps, run, targets=None):
+    """
+    Uncached evaluation of the steps on one run.
+    """
+    values = {"run": run}
+    for step in _select(steps, targets):
+        values[step.name] = step.func(
+            *[values[dep] for dep in step.inputs], **step.params
+        )
+    del values["run"]
+    return values
+
+
+class ArtifactCache:
+    def __init__(self, root=".artifacts"):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+
+    def _object_path(self, key):
+        return os.path.join(self.root, "objects", key + ".pkl")
+
+    def _atomic_write(self, path, write):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+
+    def has(self, key):
+        return os.path.exists(self._object_path(key))
+
+    def load(self, key):
+        with open(self._object_path(key), "rb") as f:
+            return pickle.load(f)
+
+    def store(self, key, value):
+        self._atomic_write(
+            self._object_path(key), lambda f: pickle.dump(value, f)
+        )
+
+    def manifest(self, run_key):
+        path = os.path.join(self.root, "runs", run_key + ".json")
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_manifest(self, run_key, manifest):
+        path = os.path.join(self.root, "runs", run_key + ".json")
+        data = json.dumps(manifest, indent=2, sort_keys=True).encode()
+        self._atomic_write(path, lambda f: f.write(data))
+
+    def evaluate(self, steps, run, targets=None):
+        """
+        Results of `steps` (or only `targets` and what they need) on
+        one run. Returns (results, computed), where computed lists
+        the steps that missed the cache.
+        """
+        run_key = content_hash(run)
+
+        keys = {"run": run_key}
+        values = {"run": run}
+        computed = []
+        manifest = self.manifest(run_key)
+
+        for step in _select(steps, targets):
+            key = content_hash({
+                "step": step.name,
+                "version": step.version,
+                "params": step.params,
+                "inputs": [keys[dep] for dep in step.inputs],
+            })
+            keys[step.name] = key
+            if self.has(key):
+                values[step.name] = self.load(key)
+            else:
+                args = [values[dep] for dep in step.inputs]
+                values[step.name] = step.func(*args, **step.params)
+                self.store(key, values[step.name])
+                computed.append(step.name)
+            manifest[step.name] = key
+
+        self._save_manifest(run_key, manifest)
+        del values["run"]
+        return values, computed
+
+
+def _evaluate_one(job):
+    root, steps, run, targets = job
+    return ArtifactCache(root).evaluate(steps, run, targets)
+
+
+def evaluate_runs(cache, steps, runs, targets=None, workers=None):
+    """
+    evaluate() over independent runs (e.g. variants), in parallel
+    worker processes when workers > 1. Step functions must be
+    importable (module level) for the process pool.
+    """
+    jobs = [(cache.root, steps, run, targets) for run in runs]
+    if not workers or workers <= 1:
+        return [_evaluate_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_evaluate_one, jobs))
@@ -1,15 +1,89 @@
 import json
 import numpy as np
 
+from analysis.track_particles import defect_support
+
 WINDOW = 5
+MIN_CHANNEL = 3
 
-def main():
-    with open("analysis/particles.json") as f:
-        particles = json.load(f)
+def local_omega_series(run):
+    """
+    Per-step local Ω at the rewrite site, as [{"time", "omega"}],
+    or None if the run did not record it.
+    """
+    if not run.get("local_omega"):
+        return None
+    return [
+        {"time": r["time"], "omega": r["local_omega"]}
+        for r in run["local_omega"]
+    ]
+
+
+def has_clustering_log(run):
+    """
+    Whether the run logged per-vertex local clustering values.
+    """
+    return bool(run.get("local_clustering"))
+
+
+def support_clustering_channels(particles, run):
+    """
+    Local channels indexed by particle support: at each defect time of
+    a particle, the mean local clustering over its support vertices
+    (as defect_support finds them) minus the mean over the whole field.
+
+    The per-vertex field is replayed from the run's clustering log
+    (one record every clustering_log_interval steps) up to the last
+    record at or before each defect time; times whose support has no
+    vertex in the field are skipped.
+    """
+    log = run["local_clustering"]
+    history = run.get("rewrite_history", [])
+
+    queries = sorted(
+        (t, pid)
+        for pid, p in enumerate(particles)
+        for t in p["times"]
+    )
+
+    field = {}
+    total = 0.0
+    k = 0
+    channels = {}
+    for t, pid in queries:
+        while k < len(log) and log[k]["time"] <= t:
+            record = log[k]
+            if record.get("rebuilt"):
+                field.clear()
+                total = 0.0
+            for v, omega in record["values"]:
+                total -= field.pop(v, 0.0)
+                if omega is not None:
+                    field[v] = omega
+                    total += omega
+            k += 1
 
-    with open("analysis/omega_timeseries.json") as f:
-        omega_series = json.load(f)
+        vals = [field[v] for v in defect_support(t, history) if v in field]
+        if not vals:
+            continue
+        channels.setdefault(pid, []).append({
+            "time": t,
+            "omega_local": float(np.mean(vals) - total / len(field)),
+        })
 
+    return [
+        {"particle": pid, "channel": channel}
+        for pid, channel in sorted(channels.items())
+        if len(channel) >= MIN_CHANNEL
+    ]
+
+
+def local_omega_channels(particles, omega_series):
+    """
+    Channels from an Ω time series (the global one, or the rewrite-site
+    local Ω of runs without a clustering log): Ω interpolated at each
+    defect time minus its mean over the neighbouring samples.
+    """
     times = np.array([o["time"] for o in omega_series])
     omegas = np.array([o["omega"] for o in omega_series])
 
@@ -30,23 +104,50 @@ def main():
             hi = min(len(omegas), idx + WINDOW)
 
             local_mean = omegas[lo:hi].mean()
-            omega_local = omega_t - local_mean
+            omega_local = float(omega_t - local_mean)
 
             channel.append({
                 "time": t,
                 "omega_local": omega_local
             })
 
-        if len(channel) >= 3:
+        if len(channel) >= MIN_CHANNEL:
             local_channels.append({
                 "particle": pid,
                 "channel": channel
             })
 
+    return local_channels
+
+
+def load_latest_run(path="timeseries.json"):
+    try:
+        with open(path) as f:
+            runs = json.load(f).get("runs", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return runs[-1] if runs else None
+
+
+def main():
+    with open("analysis/particles.json") as f:
+        particles = json.load(f)
+
+    run = load_latest_run()
+    if run is not None and has_clustering_log(run):
+        local_channels = support_clustering_channels(particles, run)
+    else:
+        omega_series = run and local_omega_series(run)
+        if omega_series is None:
+            # no local record: fall back to the global Ω samples
+            with open("analysis/omega_timeseries.json") as f:
+                omega_series = json.load(f)
+        local_channels = local_omega_channels(particles, omega_series)
+
     with open("analysis/local_omega_channels.json", "w") as f:
         json.dump(local_channels, f, indent=2)
 
     print(f"Saved {len(local_channels)} local Ω channels")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
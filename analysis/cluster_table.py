@@ -0,0 +1,149 @@
+# analysis/cluster_table.py
+#
+# Streaming reader for the ξ-cluster table (engine/clustertable.py):
+# long-format rows (time, cluster_id, size, xi_support) in binary
+# chunks. Chunks are read one at a time, so the ξ-interaction analyses
+# share one fast parse and never hold more than a chunk (or one group of
+# clusters, see iter_clusters) in memory.
+#
+# Legacy interaction JSON files (rewrite_history with cluster_sizes /
+# xi_support per record) are converted once by open_table().
+
+import json
+import os
+
+import numpy as np
+
+from engine.clustertable import (
+    MAGIC,
+    COLUMNS,
+    STEP_ROW,
+    CHUNK_HEADER,
+    ClusterTableWriter,
+)
+
+
+NAMES = tuple(name for name, _ in COLUMNS)
+DTYPE = np.dtype("<i8")
+
+
+def read_chunks(path):
+    """
+    Yield each chunk as a dict of column name -> int64 array.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a cluster table")
+        while True:
+            head = f.read(CHUNK_HEADER.size)
+            if len(head) < CHUNK_HEADER.size:
+                return
+            (n,) = CHUNK_HEADER.unpack(head)
+            yield {
+                name: np.fromfile(f, dtype=DTYPE, count=n) for name in NAMES
+            }
+
+
+def read_steps(path):
+    """
+    (time, xi_support) arrays of the recorded steps.
+    """
+    times, xi = [], []
+    for chunk in read_chunks(path):
+        mask = chunk["cluster_id"] == STEP_ROW
+        times.append(chunk["time"][mask])
+        xi.append(chunk["xi_support"][mask])
+    if not times:
+        return np.zeros(0, DTYPE), np.zeros(0, DTYPE)
+    return np.concatenate(times), np.concatenate(xi)
+
+
+def cluster_row_counts(path):
+    """
+    Number of rows of each cluster id, in id order.
+    """
+    counts = {}
+    for chunk in read_chunks(path):
+        cid = chunk["cluster_id"]
+        ids, n = np.unique(cid[cid != STEP_ROW], return_counts=True)
+        for c, k in zip(ids.tolist(), n.tolist()):
+            counts[c] = counts.get(c, 0) + k
+    return dict(sorted(counts.items()))
+
+
+def iter_clusters(path, ids=None, max_rows=1 << 23):
+    """
+    Yield (cluster_id, {"time", "size", "xi_support"}) per cluster, in
+    id order, rows in time order.
+
+    Clusters are gathered in groups of at most max_rows rows (a larger
+    cluster forms its own group), one streaming pass per group, so
+    memory is bounded by max_rows rather than by the file size.
+    """
+    counts = cluster_row_counts(path)
+    if ids is not None:
+        wanted = set(ids)
+        counts = {c: n for c, n in counts.items() if c in wanted}
+
+    groups, group, size = [], [], 0
+    for c, n in counts.items():
+        if group and size + n > max_rows:
+            groups.append(group)
+            group, size = [], 0
+        group.append(c)
+        size += n
+    if group:
+        groups.append(group)
+
+    for group in groups:
+        keys = np.array(group, dtype=DTYPE)
+        parts = {c: [] for c in group}
+        for chunk in read_chunks(path):
+            mask = np.isin(chunk["cluster_id"], keys)
+            if not mask.any():
+                continue
+            sub = {name: chunk[name][mask] for name in NAMES}
+            order = np.argsort(sub["cluster_id"], kind="stable")
+            cids = sub["cluster_id"][order]
+            bounds = np.flatnonzero(np.diff(cids)) + 1
+            for part in np.split(order, bounds):
+                c = int(sub["cluster_id"][part[0]])
+                parts[c].append({
+                    "time": sub["time"][part],
+                    "size": sub["size"][part],
+                    "xi_support": sub["xi_support"][part],
+                })
+        for c in group:
+            yield c, {
+                name: np.concatenate([p[name] for p in parts[c]])
+                for name in ("time", "size", "xi_support")
+            }
+
+
+def from_rewrite_history(rewrites, path):
+    """
+    Write a cluster table from rewrite records carrying cluster_sizes.
+    """
+    with ClusterTableWriter(path) as w:
+        for r in rewrites:
+            sizes = {int(c): s for c, s in r.get("cluster_sizes", {}).items()}
+            w.append(r["time"], sizes, len(r.get("xi_support", [])))
+
+
+def open_table(path):
+    """
+    Path of a cluster table for `path`: the path itself, or for a
+    legacy interaction JSON a converted copy next to it (path +
+    ".clusters"), rebuilt when the JSON is newer.
+    """
+    if not path.endswith(".json"):
+        return path
+    table = path + ".clusters"
+    if (
+        not os.path.exists(table)
+        or os.path.getmtime(table) < os.path.getmtime(path)
+    ):
+        with open(path) as f:
+            rewrites = json.load(f).get("rewrite_history", [])
+        from_rewrite_history(rewrites, table)
+    return table
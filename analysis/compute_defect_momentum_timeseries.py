@@ -2,7 +2,7 @@
 
 import json
 import numpy as np
-from analysis.defects import momentum_timeseries
+from analysis.momentum_series import momentum_series, series_stats
 
 WINDOW = 20
 STEP = 5
@@ -24,28 +24,27 @@ def main():
 
     results = []
 
-    for i, d in enumerate(defects):
-        ts, ps = momentum_timeseries(
-            defects=defects,
-            defect=d,
-            window=WINDOW,
-            step=STEP
-        )
+    # all series in one batched pass over the sorted defect times
+    order = np.argsort([d["time"] for d in defects], kind="stable")
+    times = np.array([defects[i]["time"] for i in order], dtype=np.int64)
+    n, _, mean, var = series_stats(*momentum_series(times, WINDOW, STEP))
 
-        if len(ps) < 2:
+    for j, i in enumerate(order):
+        d = defects[i]
+        if n[j] < 2:
             continue
 
-        mean_p = float(np.mean(ps))
-        var_p  = float(np.var(ps))
+        mean_p = float(mean[j])
+        var_p  = float(var[j])
 
         print(f"\nDefect {i} at t={d['time']}")
-        print(f"  samples: {len(ps)}")
+        print(f"  samples: {int(n[j])}")
         print(f"  mean p: {mean_p:.3f}")
         print(f"  var(p): {var_p:.3f}")
 
         results.append({
             "time": d["time"],
-            "samples": len(ps),
+            "samples": int(n[j]),
             "mean_p": mean_p,
             "var_p": var_p
         })
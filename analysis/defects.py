@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from analysis.momentum_series import sorted_times, momentum_at
+
 def defect_momentum(defects, defect, window=20):
     """
     Purely observational momentum:
@@ -51,22 +53,18 @@ def defect_momentum_at_time(defects, center_time, window=20):
 def momentum_timeseries(defects, defect, window=20, step=5):
     """
     Returns (times, momenta) for one defect.
+    For every defect at once use momentum_series.momentum_series.
     """
     t0 = defect["time"]
 
     # estimate lifetime from neighboring defects
-    times = [d["time"] for d in defects]
-    idx = times.index(t0)
-
-    t_start = times[idx - 1] if idx > 0 else t0
-    t_end   = times[idx + 1] if idx < len(times) - 1 else t0
+    times = sorted_times(defects)
+    idx = int(np.searchsorted(times, t0))
 
-    ts = []
-    ps = []
+    t_start = int(times[idx - 1]) if idx > 0 else t0
+    t_end   = int(times[idx + 1]) if idx < len(times) - 1 else t0
 
-    for t in range(t_start, t_end + 1, step):
-        p = defect_momentum_at_time(defects, t, window)
-        ts.append(t)
-        ps.append(p)
+    ts = list(range(t_start, t_end + 1, step))
+    ps = momentum_at(times, ts, window).tolist()
 
-    return ts, ps
\ No newline at end of file
+    return ts, ps
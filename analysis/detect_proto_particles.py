@@ -1,8 +1,8 @@
 # analysis/detect_proto_particles.py
 
-import json
 import sys
-from collections import defaultdict
+
+from analysis.cluster_table import open_table, iter_clusters
 
 # -----------------------------
 # Detection thresholds
@@ -14,48 +14,35 @@ MIN_MEAN_SIZE = 10
 # ============================================================
 # CORE FUNCTION (IMPORT-SAFE)
 # ============================================================
-def detect_clusters(rewrites):
+def detect_clusters(clusters):
     """
     Detect and track proto-particles (ξ-clusters) by cluster ID.
 
+    clusters: (cluster_id, arrays) pairs, as from
+    cluster_table.iter_clusters.
+
     Returns:
         dict with statistics and per-cluster data
     """
 
-    cluster_birth = {}
-    cluster_last_seen = {}
-    cluster_sizes = defaultdict(list)
-
-    # -----------------------------
-    # Track clusters over time
-    # -----------------------------
-    for r in rewrites:
-        t = r["time"]
-        sizes = r.get("cluster_sizes", {})
-
-        for cid, size in sizes.items():
-            if size <= 0:
-                continue
-
-            if cid not in cluster_birth:
-                cluster_birth[cid] = t
-
-            cluster_last_seen[cid] = t
-            cluster_sizes[cid].append(size)
+    lifetimes = {}
+    mean_sizes = {}
 
     # -----------------------------
-    # Compute statistics
+    # Per-cluster statistics
     # -----------------------------
-    lifetimes = {}
-    mean_sizes = {}
+    for cid, rows in clusters:
+        alive = rows["size"] > 0
+        if not alive.any():
+            continue
 
-    for cid in cluster_birth:
-        lifetime = cluster_last_seen[cid] - cluster_birth[cid]
+        times = rows["time"][alive]
+        lifetime = int(times[-1] - times[0])
         if lifetime <= 0:
             continue
 
         lifetimes[cid] = lifetime
-        mean_sizes[cid] = sum(cluster_sizes[cid]) / len(cluster_sizes[cid])
+        mean_sizes[cid] = float(rows["size"][alive].mean())
 
     # -----------------------------
     # Global stats
@@ -93,16 +80,11 @@ def detect_clusters(rewrites):
 # ============================================================
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 -m analysis.detect_proto_particles <json_file>")
+        print("Usage: python3 -m analysis.detect_proto_particles <clusters|json>")
         sys.exit(1)
 
-    path = sys.argv[1]
-    with open(path) as f:
-        data = json.load(f)
-
-    rewrites = data.get("rewrite_history", [])
-
-    stats = detect_clusters(rewrites)
+    table = open_table(sys.argv[1])
+    stats = detect_clusters(iter_clusters(table))
 
     # -----------------------------
     # Report
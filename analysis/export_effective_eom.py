@@ -1,10 +1,20 @@
 # analysis/export_effective_eom.py
 import json
 
-with open("analysis/effective_eom.json") as f:
-    eom = json.load(f)
 
-with open("analysis/effective_eom.json", "w") as f:
-    json.dump(eom, f, indent=2)
+def load_effective_eom(path="analysis/effective_eom.json"):
+    with open(path) as f:
+        return json.load(f)
 
-print("Saved  effective_eom.json")
\ No newline at end of file
+
+def main():
+    eom = load_effective_eom()
+
+    with open("analysis/effective_eom.json", "w") as f:
+        json.dump(eom, f, indent=2)
+
+    print("Saved  effective_eom.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import json
 import numpy as np
 from scipy.optimize import curve_fit
 
+from analysis.registry import RunRegistry
+
 # ---- critical model ----
 def critical_model(O, C, Oc, nu):
     return C * np.maximum(Oc - O, 0)**nu
@@ -10,6 +12,7 @@ def critical_model(O, C, Oc, nu):
 N_BINS = 5
 OMEGA_MAX = 1.2
 DT_SAMPLE = 100
+REGISTRY = "runs.sqlite"
 
 with open("timeseries.json") as f:
     runs = json.load(f)["runs"]
@@ -17,8 +20,11 @@ with open("timeseries.json") as f:
 results = []
 
 for i, run in enumerate(runs):
-    omega_ts = np.array(run["omega"])
-    times = np.array(run["t"])
+    # per-step engine series when recorded, else the sparse samples
+    source = run.get("series") or run
+    omega_ts = np.array(source["omega"])
+    times = np.array(source["t"])
+    dt = np.diff(times, prepend=0) if source is not run else None
     defects = run["defects"]
 
     defect_times = np.array([d["time"] for d in defects])
@@ -30,10 +36,10 @@ for i, run in enumerate(runs):
     time_in_bin = np.zeros(N_BINS)
     defects_in_bin = np.zeros(N_BINS)
 
-    for O in omega_ts:
+    for j, O in enumerate(omega_ts):
         idx = np.searchsorted(bins, O) - 1
         if 0 <= idx < N_BINS:
-            time_in_bin[idx] += DT_SAMPLE
+            time_in_bin[idx] += DT_SAMPLE if dt is None else dt[j]
 
     for t in defect_times:
         j = np.searchsorted(times, t) - 1
@@ -77,6 +83,14 @@ for i, run in enumerate(runs):
 with open("analysis/omega_c_by_variant.json", "w") as f:
     json.dump(results, f, indent=2)
 
+# ---- run registry (queried by test_finite_size_scaling) ----
+with RunRegistry(REGISTRY) as reg:
+    for r in results:
+        run = runs[r["run_index"]]
+        key = reg.register_run(run, run_index=r["run_index"],
+                               timeseries_path="timeseries.json")
+        reg.record_metrics(key, omega_c=r["Omega_c"], nu=r["nu"])
+
 print("\nΩc extraction complete:")
 for r in results:
     print(r)
\ No newline at end of file
@@ -1,13 +1,14 @@
 import json
 
-def main():
-    with open("timeseries.json") as f:
-        data = json.load(f)
 
-    run = data["runs"][-1]
-
-    t_list = run.get("t", [])
-    omega_list = run.get("omega", [])
+def omega_timeseries(run):
+    """
+    [{"time", "omega"}] for a run: the per-step engine series when
+    recorded, else the sparse samples.
+    """
+    source = run.get("series") or run
+    t_list = source.get("t", [])
+    omega_list = source.get("omega", [])
 
     if not t_list or not omega_list:
         raise ValueError("Missing 't' or 'omega' arrays in run data")
@@ -21,6 +22,14 @@ def main():
             "time": t,
             "omega": omega
         })
+    return records
+
+
+def main():
+    with open("timeseries.json") as f:
+        data = json.load(f)
+
+    records = omega_timeseries(data["runs"][-1])
 
     with open("analysis/omega_timeseries.json", "w") as f:
         json.dump(records, f, indent=2)
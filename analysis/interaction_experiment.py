@@ -6,6 +6,7 @@ import math
 
 from engine.hypergraph import Hypergraph
 from engine.rewrite_engine import RewriteEngine
+from engine.clustertable import ClusterTableWriter
 from engine.observables import (
     worldline_interaction_graph,
     hierarchical_closure,
@@ -99,6 +100,9 @@ second_injection_time = engine.time
 # -------------------------------
 interaction_log = []
 
+# per-step ξ-cluster sizes, streamed for the ξ-interaction analyses
+cluster_table = ClusterTableWriter("analysis/interaction_experiment.clusters")
+
 for _ in range(INTERACTION_STEPS):
     t0 = time.perf_counter()
     
@@ -151,6 +155,7 @@ for _ in range(INTERACTION_STEPS):
     xi_cluster_sizes = {}
     for v, cid in xi_clusters.items():
         xi_cluster_sizes[cid] = xi_cluster_sizes.get(cid, 0) + 1
+    cluster_table.append(engine.time, xi_cluster_sizes, xi_mass)
         
     # --------------------------------
     # Sanity check (DEBUG ONLY)
@@ -198,6 +203,8 @@ for _ in range(INTERACTION_STEPS):
         )
 # Save output
 # -------------------------------
+cluster_table.close()
+
 out = {
     "metadata": {
         "seed": SEED,
@@ -1,7 +1,9 @@
 import json
 import sys
 import math
-from collections import defaultdict, deque
+from collections import defaultdict
+
+from engine.distance import CSRGraph, set_distance
 
 
 def is_finite(x):
@@ -9,21 +11,8 @@ def is_finite(x):
 
 
 def bfs_cluster_distance(inter, cluster_A, cluster_B, max_depth=50):
-    visited = set(cluster_A)
-    queue = deque((v, 0) for v in cluster_A)
-
-    while queue:
-        v, d = queue.popleft()
-        if d > max_depth:
-            break
-        if v in cluster_B:
-            return d
-        for u in inter.get(v, []):
-            if u not in visited:
-                visited.add(u)
-                queue.append((u, d + 1))
-
-    return None
+    d = set_distance(CSRGraph(inter), cluster_A, cluster_B, max_depth=max_depth)
+    return d if math.isfinite(d) else None
 
 
 def main():
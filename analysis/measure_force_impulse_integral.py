@@ -1,9 +1,10 @@
 # analysis/measure_force_impulse_integral.py
 
-import json
 import sys
-from collections import defaultdict
-import math
+
+import numpy as np
+
+from analysis.cluster_table import open_table, iter_clusters
 
 
 # --------------------------------------------------
@@ -31,57 +32,39 @@ def variance(xs):
 # --------------------------------------------------
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 -m analysis.measure_force_impulse_integral <interaction.json>")
+        print("Usage: python3 -m analysis.measure_force_impulse_integral <clusters|json>")
         sys.exit(1)
 
-    path = sys.argv[1]
-
-    with open(path) as f:
-        data = json.load(f)
-
-    rewrites = data.get("rewrite_history", [])
-    if not rewrites:
-        print("❌ No rewrite history available")
-        return
+    table = open_table(sys.argv[1])
 
     # --------------------------------------------------
     # Extract impulse-like force events
     # --------------------------------------------------
-    # Force proxy: |Δ(cluster size)| per rewrite
-    impulse_events = []
-
-    prev_sizes = {}
-
-    for r in rewrites:
-        t = r["time"]
-        sizes = r.get("cluster_sizes", {})
-
-        for cid, size in sizes.items():
-            prev = prev_sizes.get(cid)
-            if prev is not None:
-                impulse = size - prev
-                if impulse != 0:
-                    impulse_events.append({
-                        "time": t,
-                        "cluster": cid,
-                        "impulse": impulse
-                    })
-
-            prev_sizes[cid] = size
-
-    if not impulse_events:
+    # Force proxy: Δ(cluster size) between a cluster's
+    # consecutive appearances
+    event_times = []
+    event_impulses = []
+
+    for cid, rows in iter_clusters(table):
+        impulse = np.diff(rows["size"])
+        nonzero = impulse != 0
+        event_times.append(rows["time"][1:][nonzero])
+        event_impulses.append(impulse[nonzero])
+
+    if not event_times or not sum(len(t) for t in event_times):
         print("❌ No impulse events detected")
         return
 
     # --------------------------------------------------
-    # Group impulses by time
+    # Order impulses by time (cumulative sums per window)
     # --------------------------------------------------
-    impulses_by_time = defaultdict(list)
-    for e in impulse_events:
-        impulses_by_time[e["time"]].append(e["impulse"])
+    times = np.concatenate(event_times)
+    impulses = np.concatenate(event_impulses)
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    cum = np.concatenate([[0], np.cumsum(impulses[order])])
 
-    times = sorted(impulses_by_time.keys())
-    t_min, t_max = times[0], times[-1]
+    t_min, t_max = int(times[0]), int(times[-1])
 
     # --------------------------------------------------
     # Coarse-graining
@@ -89,24 +72,15 @@ def main():
     print("\n=== Force Impulse Integral (C10B) ===")
 
     for W in WINDOW_SIZES:
-        window_forces = []
-
-        t = t_min
-        while t + W <= t_max:
-            total_impulse = 0.0
-
-            for τ in range(t, t + W + 1):
-                if τ in impulses_by_time:
-                    total_impulse += sum(impulses_by_time[τ])
-
-            F_eff = total_impulse / W
-            window_forces.append(F_eff)
-
-            t += W  # non-overlapping windows (conservative)
-
-        if not window_forces:
+        # non-overlapping windows [t, t + W] (conservative)
+        starts = np.arange(t_min, t_max - W + 1, W)
+        if len(starts) == 0:
             continue
 
+        lo = np.searchsorted(times, starts, "left")
+        hi = np.searchsorted(times, starts + W, "right")
+        window_forces = ((cum[hi] - cum[lo]) / W).tolist()
+
         print(f"\nΔt = {W}")
         print(f"Samples        : {len(window_forces)}")
         print(f"⟨F_eff⟩        : {mean(window_forces):.6f}")
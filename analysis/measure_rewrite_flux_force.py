@@ -1,8 +1,8 @@
 # analysis/measure_rewrite_flux_force.py
 
-import json
 import sys
-from collections import defaultdict
+
+from analysis.cluster_table import open_table, iter_clusters
 
 # ----------------------------------------
 # Purpose:
@@ -12,36 +12,26 @@ from collections import defaultdict
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 -m analysis.measure_rewrite_flux_force <interaction_json>")
+        print("Usage: python3 -m analysis.measure_rewrite_flux_force <clusters|json>")
         sys.exit(1)
 
-    path = sys.argv[1]
-
-    with open(path) as f:
-        data = json.load(f)
-
-    rewrites = data.get("rewrite_history", [])
-
-    if not rewrites:
-        print("❌ No rewrite history found")
-        sys.exit(1)
+    table = open_table(sys.argv[1])
 
     # ----------------------------------------
     # Accumulate rewrite flux per cluster
     # ----------------------------------------
-    flux_per_cluster = defaultdict(int)
-    cluster_sizes = defaultdict(list)
-
-    for r in rewrites:
-        sizes = r.get("cluster_sizes", {})
-        xi_support = r.get("xi_support", [])
+    flux_per_cluster = {}
+    total_size = {}
+    lifetime = {}
 
-        for cid, size in sizes.items():
-            cluster_sizes[cid].append(size)
+    for cid, rows in iter_clusters(table):
+        total_size[cid] = int(rows["size"].sum())
+        lifetime[cid] = len(rows["size"])
 
-            # If rewrite touched ξ-support, count as flux
-            if xi_support:
-                flux_per_cluster[cid] += 1
+        # If rewrite touched ξ-support, count as flux
+        flux = int((rows["xi_support"] > 0).sum())
+        if flux:
+            flux_per_cluster[cid] = flux
 
     if len(flux_per_cluster) < 2:
         print("❌ Insufficient clusters for interaction test")
@@ -52,7 +42,7 @@ def main():
     # ----------------------------------------
     clusters = sorted(
         flux_per_cluster.keys(),
-        key=lambda c: sum(cluster_sizes[c]),
+        key=lambda c: total_size[c],
         reverse=True
     )
 
@@ -64,7 +54,7 @@ def main():
     # ----------------------------------------
     # Define scalar interaction force
     # ----------------------------------------
-    tau = min(len(cluster_sizes[A]), len(cluster_sizes[B]))
+    tau = min(lifetime[A], lifetime[B])
 
     if tau == 0:
         print("❌ Zero coexistence time")
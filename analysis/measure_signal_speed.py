@@ -16,24 +16,26 @@ def influenced(d1, d2, rewrite_history):
     s2 = defect_support(d2["time"], rewrite_history)
     return len(s1 & s2) > 0
 
-def main():
-    with open("timeseries.json") as f:
-        data = json.load(f)
-
-    run = data["runs"][-1]
+def measure_signal_speed(run):
+    """
+    Pairwise defect influence samples and the speeds 1/dt of the
+    influenced pairs. Supports are computed once per defect.
+    Returns (samples, speeds).
+    """
     defects = run["defects"]
     history = run["rewrite_history"]
+    supports = [defect_support(d["time"], history) for d in defects]
 
     speeds = []
     samples = []
 
     for i, d1 in enumerate(defects):
-        for d2 in defects[i + 1:]:
-            dt = d2["time"] - d1["time"]
+        for j in range(i + 1, len(defects)):
+            dt = defects[j]["time"] - d1["time"]
             if dt <= 0:
                 continue
 
-            infl = influenced(d1, d2, history)
+            infl = len(supports[i] & supports[j]) > 0
 
             samples.append({
                 "dt": dt,
@@ -43,8 +45,10 @@ def main():
             if infl:
                 speeds.append(1.0 / dt)
 
-    speeds = np.array(speeds)
+    return samples, np.array(speeds)
+
 
+def report_signal_speed(speeds):
     print("\n=== Signal Speed Measurement ===")
     print(f"Samples: {len(speeds)}")
     if len(speeds) > 0:
@@ -52,6 +56,15 @@ def main():
         print(f"Mean speed: {speeds.mean():.4f}")
         print(f"Std: {speeds.std():.4f}")
 
+
+def main():
+    with open("timeseries.json") as f:
+        data = json.load(f)
+
+    run = data["runs"][-1]
+    samples, speeds = measure_signal_speed(run)
+    report_signal_speed(speeds)
+
     # --- SAVE FOR STEP 12 ---
     with open("analysis/signal_speed_samples.json", "w") as f:
         json.dump(samples, f, indent=2)
@@ -63,4 +76,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,28 +1,22 @@
 # analysis/measure_single_particle_flux.py
 
-import json
 import sys
-from collections import defaultdict
+
+from analysis.cluster_table import open_table, iter_clusters
 
 if len(sys.argv) < 2:
-    print("Usage: python3 -m analysis.measure_single_particle_flux <json>")
+    print("Usage: python3 -m analysis.measure_single_particle_flux <clusters|json>")
     sys.exit(1)
 
-path = sys.argv[1]
-with open(path) as f:
-    data = json.load(f)
-
-rewrites = data.get("rewrite_history", [])
+table = open_table(sys.argv[1])
 
 # cluster_id → cumulative size proxy
-cluster_flux = defaultdict(int)
-cluster_lifetime = defaultdict(int)
-
-for r in rewrites:
-    sizes = r.get("cluster_sizes", {})
-    for cid, size in sizes.items():
-        cluster_flux[cid] += size
-        cluster_lifetime[cid] += 1
+cluster_flux = {}
+cluster_lifetime = {}
+
+for cid, rows in iter_clusters(table):
+    cluster_flux[cid] = int(rows["size"].sum())
+    cluster_lifetime[cid] = len(rows["size"])
 
 if not cluster_flux:
     print("❌ No proto-particles detected")
@@ -1,30 +1,21 @@
 # analysis/measure_three_body_interaction.py
 
-import json
 import sys
 
+from analysis.cluster_table import open_table, iter_clusters
+
 if len(sys.argv) < 2:
-    print("Usage: python3 -m analysis.measure_three_body_interaction <interaction.json>")
+    print("Usage: python3 -m analysis.measure_three_body_interaction <clusters|json>")
     sys.exit(1)
 
-path = sys.argv[1]
-
-with open(path) as f:
-    data = json.load(f)
-
-rewrites = data["rewrite_history"]
+table = open_table(sys.argv[1])
 
 cluster_flux = {}
 cluster_birth = {}
 
-for r in rewrites:
-    t = r["time"]
-    sizes = r.get("cluster_sizes", {})
-    xi_support = r.get("xi_support", [])
-
-    for cid in sizes:
-        cluster_flux[cid] = cluster_flux.get(cid, 0) + len(xi_support)
-        cluster_birth.setdefault(cid, t)
+for cid, rows in iter_clusters(table):
+    cluster_flux[cid] = int(rows["xi_support"].sum())
+    cluster_birth[cid] = int(rows["time"][0])
 
 clusters = sorted(cluster_flux)
 
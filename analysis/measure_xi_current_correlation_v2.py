@@ -1,9 +1,17 @@
 # analysis/measure_xi_current_correlation_v2.py
 
-import json
 import sys
 import math
 
+import numpy as np
+
+from analysis.cluster_table import (
+    open_table,
+    read_steps,
+    cluster_row_counts,
+    iter_clusters,
+)
+
 def mean(xs):
     return sum(xs) / len(xs) if xs else 0.0
 
@@ -17,43 +25,32 @@ def covariance(xs, ys):
     return mean([(x - mx) * (y - my) for x, y in zip(xs, ys)])
 
 def main(path):
-    with open(path) as f:
-        data = json.load(f)
+    table = open_table(path)
 
-    rewrites = data.get("rewrite_history", [])
-    if not rewrites:
+    steps, _ = read_steps(table)
+    if len(steps) == 0:
         print("❌ No rewrite history")
         return
 
     # Identify clusters globally
-    cluster_ids = set()
-    for r in rewrites:
-        cluster_ids.update(r.get("cluster_sizes", {}).keys())
+    cluster_ids = list(cluster_row_counts(table))
 
     if len(cluster_ids) < 2:
         print("❌ Need ≥2 clusters")
         return
 
-    A, B = sorted(cluster_ids)[:2]
-
-    J_A = []
-    J_B = []
-
-    prev_sizes = None
-
-    for r in rewrites:
-        sizes = r.get("cluster_sizes", {})
-        if prev_sizes is None:
-            prev_sizes = sizes
-            continue
-
-        JA = sizes.get(A, 0) - prev_sizes.get(A, 0)
-        JB = sizes.get(B, 0) - prev_sizes.get(B, 0)
+    A, B = cluster_ids[:2]
 
-        J_A.append(JA)
-        J_B.append(JB)
+    # size of each cluster at every step (0 where absent),
+    # current = change between consecutive steps
+    size = {}
+    for cid, rows in iter_clusters(table, ids=(A, B)):
+        s = np.zeros(len(steps), dtype=np.int64)
+        s[np.searchsorted(steps, rows["time"])] = rows["size"]
+        size[cid] = s
 
-        prev_sizes = sizes
+    J_A = np.diff(size[A]).tolist()
+    J_B = np.diff(size[B]).tolist()
 
     if len(J_A) < 10:
         print("❌ Insufficient data")
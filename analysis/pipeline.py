@@ -0,0 +1,232 @@
+# analysis/pipeline.py
+#
+# Post-run pipeline in one process:
+#   track particles → signal speed → Lorentz cone → EOM → particle stats
+# The run is loaded once and each step hands its result to the next in
+# memory; files are written only as outputs, with the same names and
+# content the standalone scripts produce. With --cache, step results are
+# kept in a content-addressed ArtifactCache (analysis/artifacts.py) and
+# only recomputed when the run or the step changes.
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+from analysis.track_particles import track_particles, report_particles
+from analysis.measure_signal_speed import (
+    measure_signal_speed,
+    report_signal_speed,
+)
+from analysis.export_lorentz_cone import lorentz_cone
+from analysis.export_effective_eom import load_effective_eom
+from analysis.export_particle_stats import particle_stats
+from analysis.extract_omega_timeseries import omega_timeseries
+from analysis.build_local_omega_channels import (
+    has_clustering_log,
+    support_clustering_channels,
+    local_omega_series,
+    local_omega_channels,
+)
+from analysis.artifacts import Step, ArtifactCache, compute, evaluate_runs
+from analysis.registry import RunRegistry
+
+
+# outputs copied into a variant directory (run_variants.sh)
+VARIANT_OUTPUTS = (
+    "particle_stats.json",
+    "effective_eom.json",
+    "lorentz_cone.json",
+    "signal_speeds.npy",
+)
+
+
+def load_run(path="timeseries.json", run=-1):
+    with open(path) as f:
+        return json.load(f)["runs"][run]
+
+
+# ------------------------------------------------------------
+# Steps derived from a run (cacheable by content)
+# ------------------------------------------------------------
+
+def _particle_stats(particles):
+    return particle_stats(particles or [])
+
+
+def _lorentz_cone(signal_speed):
+    samples, _ = signal_speed
+    if not any(d["influence"] == 1 for d in samples):
+        return None
+    return lorentz_cone(samples)
+
+
+def _local_omega_channels(particles, run):
+    if particles is None:
+        return []
+    if has_clustering_log(run):
+        return support_clustering_channels(particles, run)
+    series = local_omega_series(run)
+    if series is None:
+        series = omega_timeseries(run)
+    return local_omega_channels(particles, series)
+
+
+STEPS = (
+    # None when the run has too little data (see run_pipeline)
+    Step("particles", track_particles, version=2),
+    Step("signal_speed", measure_signal_speed),
+    Step("lorentz_cone", _lorentz_cone, inputs=("signal_speed",)),
+    Step("particle_stats", _particle_stats, inputs=("particles",)),
+    Step("omega_timeseries", omega_timeseries),
+    Step("local_omega_channels", _local_omega_channels,
+         inputs=("particles", "run"), version=3),
+)
+
+PIPELINE_TARGETS = ("particles", "signal_speed", "lorentz_cone",
+                    "particle_stats")
+
+
+def run_pipeline(run, out_dir="analysis", write=True, verbose=True,
+                 cache=None, targets=PIPELINE_TARGETS):
+    """
+    Run the steps on one loaded run. Returns a dict of the results
+    (particles, samples, speeds, lorentz_cone, effective_eom,
+    particle_stats, plus any extra targets); with write=True they are
+    also saved to out_dir. particles (lorentz_cone) is None when the
+    run has too little data to track (no influenced defect pair); its
+    file is then left as it was. results["outputs"] lists the files this
+    call wrote. With an ArtifactCache, steps whose inputs did not change
+    are loaded instead of recomputed.
+    """
+    if cache is None:
+        results = compute(STEPS, run, targets)
+    else:
+        results, computed = cache.evaluate(STEPS, run, targets)
+        if verbose and computed:
+            print("Computed:", ", ".join(computed))
+        elif verbose:
+            print("All steps cached")
+
+    results["samples"], results["speeds"] = results.pop("signal_speed")
+    results["outputs"] = written = []
+
+    def save_json(name, obj):
+        if write:
+            with open(os.path.join(out_dir, name), "w") as f:
+                json.dump(obj, f, indent=2)
+            written.append(name)
+
+    # 1. particle tracks; with too little data the previous
+    # particles.json is kept, as track_particles.py does
+    if results["particles"] is None:
+        if verbose:
+            print("Not enough data to track particles.")
+    else:
+        if verbose:
+            report_particles(run, results["particles"])
+        save_json("particles.json", results["particles"])
+
+    # 2. signal speed
+    if verbose:
+        report_signal_speed(results["speeds"])
+    save_json("signal_speed_samples.json", results["samples"])
+    if write:
+        np.save(os.path.join(out_dir, "signal_speeds.npy"), results["speeds"])
+        written.append("signal_speeds.npy")
+
+    # 3. Lorentz cone (None without any causally connected pair)
+    if results["lorentz_cone"] is None:
+        if verbose:
+            print("No causally connected defects: Lorentz cone skipped.")
+    else:
+        save_json("lorentz_cone.json", results["lorentz_cone"])
+
+    # 4. effective EOM (carried over from analysis/effective_eom.json)
+    results["effective_eom"] = load_effective_eom(
+        os.path.join(out_dir, "effective_eom.json")
+    )
+    save_json("effective_eom.json", results["effective_eom"])
+
+    # 5. particle statistics
+    save_json("particle_stats.json", results["particle_stats"])
+
+    # extra derived series, when asked for
+    for name in ("omega_timeseries", "local_omega_channels"):
+        if name in results:
+            save_json(name + ".json", results[name])
+
+    return results
+
+
+def copy_outputs(out_dir, dest, outputs):
+    """
+    Copy the variant outputs this run wrote (run_pipeline's
+    results["outputs"]) from out_dir to dest. An output the run did not
+    produce is reported and any copy of it already in dest is removed,
+    so dest never mixes in a file from an earlier run. Returns the
+    names of the missing outputs.
+    """
+    os.makedirs(dest, exist_ok=True)
+    missing = []
+    for name in VARIANT_OUTPUTS:
+        if name in outputs:
+            shutil.copy(os.path.join(out_dir, name), dest)
+            continue
+        missing.append(name)
+        stale = os.path.join(dest, name)
+        if os.path.exists(stale):
+            os.remove(stale)
+        print(f"{name} not produced by this run; not copied")
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Post-run analysis pipeline in one process"
+    )
+    parser.add_argument("--timeseries", default="timeseries.json")
+    parser.add_argument("--run", type=int, default=-1)
+    parser.add_argument("--out-dir", default="analysis")
+    parser.add_argument("--copy-to", default=None,
+                        help="also copy the variant outputs here")
+    parser.add_argument("--cache", default=None,
+                        help="artifact cache directory (e.g. .artifacts)")
+    parser.add_argument("--all-steps", action="store_true",
+                        help="also derive omega_timeseries / local Ω channels")
+    parser.add_argument("--warm-all-runs", type=int, default=0, metavar="N",
+                        help="first fill the cache for every run with N workers")
+    parser.add_argument("--registry", default=None,
+                        help="record the run and its metrics in this SQLite "
+                             "run registry (e.g. runs.sqlite)")
+    args = parser.parse_args()
+
+    cache = ArtifactCache(args.cache) if args.cache else None
+    targets = (
+        tuple(s.name for s in STEPS) if args.all_steps else PIPELINE_TARGETS
+    )
+
+    with open(args.timeseries) as f:
+        runs = json.load(f)["runs"]
+    if cache is not None and args.warm_all_runs:
+        evaluate_runs(cache, STEPS, runs, targets, workers=args.warm_all_runs)
+
+    run = runs[args.run]
+    results = run_pipeline(run, out_dir=args.out_dir, cache=cache,
+                           targets=targets)
+    if args.copy_to:
+        copy_outputs(args.out_dir, args.copy_to, results["outputs"])
+        print(f"Saved results to {args.copy_to}")
+
+    if args.registry:
+        with RunRegistry(args.registry) as reg:
+            key = reg.register_run(run, run_index=args.run % len(runs),
+                                   timeseries_path=args.timeseries)
+            reg.record_pipeline(key, results, variant=args.copy_to,
+                                variant_dir=args.copy_to)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# analysis/registry.py
+#
+# Local SQLite registry of runs: one row per run with its config,
+# physics parameters, seed, summary metrics and pointers to the bulk
+# data (timeseries file + run index, variant directory, log). Runs are
+# keyed by the content hash of their JSON record (as in the artifact
+# cache), so registering the same run twice updates one row.
+#
+# Cross-variant scripts (test_universality, test_finite_size_scaling)
+# query this table instead of reloading per-variant JSON files.
+
+import argparse
+import json
+import sqlite3
+
+from analysis.artifacts import content_hash
+
+
+# metric columns that record_metrics() may set
+METRICS = (
+    "v_max",
+    "violations",
+    "c2",
+    "m2",
+    "r2",
+    "omega_c",
+    "nu",
+    "mean_lifetime",
+    "max_lifetime",
+    "min_lifetime",
+    "n_particles",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id                INTEGER PRIMARY KEY,
+    run_key           TEXT NOT NULL UNIQUE,
+    run_started       TEXT,
+    variant           TEXT,
+    run_index         INTEGER,
+    seed              INTEGER,
+    gamma_defect      REAL,
+    inertia_scale     REAL,
+    interaction_boost REAL,
+    config            TEXT,
+    t_final           INTEGER,
+    n_defects         INTEGER,
+    v_max             REAL,
+    violations        INTEGER,
+    c2                REAL,
+    m2                REAL,
+    r2                REAL,
+    omega_c           REAL,
+    nu                REAL,
+    mean_lifetime     REAL,
+    max_lifetime      REAL,
+    min_lifetime      REAL,
+    n_particles       INTEGER,
+    timeseries_path   TEXT,
+    variant_dir       TEXT,
+    log_path          TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_variant ON runs (variant);
+CREATE INDEX IF NOT EXISTS runs_physics
+    ON runs (gamma_defect, inertia_scale, interaction_boost);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs (seed);
+CREATE INDEX IF NOT EXISTS runs_t_final ON runs (t_final);
+"""
+
+
+PHYSICS = ("gamma_defect", "inertia_scale", "interaction_boost")
+
+
+def physics_of(run):
+    """
+    Physics parameters the run recorded. Older runs did not record
+    them, and the current engine.physics_params need not be what they
+    ran with, so their values are None (NULL in the registry).
+    """
+    physics = run.get("physics") or {}
+    return {name: physics.get(name) for name in PHYSICS}
+
+
+class RunRegistry:
+    def __init__(self, path="runs.sqlite"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- Writing ----------
+
+    def register_run(self, run, run_index=None, variant=None,
+                     timeseries_path=None, run_key=None):
+        """
+        Insert (or refresh) the row of a run record. Returns its run_key.
+        """
+        run_key = run_key or content_hash(run)
+        config = run.get("config", {})
+        physics = physics_of(run)
+        t = run.get("t") or [0]
+        row = {
+            "run_key": run_key,
+            "run_started": run.get("run_started"),
+            "run_index": run_index,
+            "seed": config.get("seed"),
+            **physics,
+            "config": json.dumps(config, sort_keys=True),
+            "t_final": t[-1],
+            "n_defects": len(run.get("defects", [])),
+            "timeseries_path": timeseries_path,
+            "log_path": config.get("log_file"),
+        }
+        if variant is not None:
+            row["variant"] = variant
+        cols = ", ".join(row)
+        marks = ", ".join("?" * len(row))
+        # keep fields that were set before (variant, metrics) on refresh
+        update = ", ".join(
+            f"{c} = COALESCE(excluded.{c}, {c})" for c in row if c != "run_key"
+        )
+        with self.db:
+            self.db.execute(
+                f"INSERT INTO runs ({cols}) VALUES ({marks}) "
+                f"ON CONFLICT(run_key) DO UPDATE SET {update}",
+                tuple(row.values()),
+            )
+        return run_key
+
+    def record_metrics(self, run_key, variant=None, variant_dir=None,
+                       **metrics):
+        """
+        Set summary metrics (names from METRICS) on a registered run.
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"unknown metrics: {sorted(unknown)}")
+        fields = dict(metrics)
+        if variant is not None:
+            fields["variant"] = variant
+        if variant_dir is not None:
+            fields["variant_dir"] = variant_dir
+        if not fields:
+            return
+        sets = ", ".join(f"{c} = ?" for c in fields)
+        with self.db:
+            cur = self.db.execute(
+                f"UPDATE runs SET {sets} WHERE run_key = ?",
+                (*fields.values(), run_key),
+            )
+        if cur.rowcount == 0:
+            raise KeyError(run_key)
+
+    def record_pipeline(self, run_key, results, variant=None,
+                        variant_dir=None):
+        """
+        Summary metrics from analysis.pipeline.run_pipeline results.
+        """
+        cone = results.get("lorentz_cone") or {}
+        eom = results.get("effective_eom") or {}
+        stats = results.get("particle_stats") or {}
+        self.record_metrics(
+            run_key,
+            variant=variant,
+            variant_dir=variant_dir,
+            v_max=cone.get("v_max"),
+            violations=cone.get("violations"),
+            c2=eom.get("c_omega_sq"),
+            m2=eom.get("m_omega_sq"),
+            r2=eom.get("r_squared"),
+            mean_lifetime=stats.get("mean_lifetime"),
+            max_lifetime=stats.get("max_lifetime"),
+            min_lifetime=stats.get("min_lifetime"),
+            n_particles=stats.get("count"),
+        )
+
+    # ---------- Queries ----------
+
+    def query(self, sql, params=()):
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    def latest_by_variant(self, variants=None):
+        """
+        Most recently registered run of each variant, as dicts.
+        """
+        sql = (
+            "SELECT * FROM runs WHERE id IN "
+            "(SELECT MAX(id) FROM runs WHERE variant IS NOT NULL "
+            "GROUP BY variant)"
+        )
+        rows = {r["variant"]: r for r in self.query(sql)}
+        if variants is None:
+            return list(rows.values())
+        return [rows[v] for v in variants if v in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Register runs of a timeseries file in the run registry"
+    )
+    parser.add_argument("--db", default="runs.sqlite")
+    parser.add_argument("--timeseries", default="timeseries.json")
+    args = parser.parse_args()
+
+    with open(args.timeseries) as f:
+        runs = json.load(f)["runs"]
+    with RunRegistry(args.db) as reg:
+        for i, run in enumerate(runs):
+            reg.register_run(run, run_index=i,
+                             timeseries_path=args.timeseries)
+        print(f"Registered {len(runs)} runs in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
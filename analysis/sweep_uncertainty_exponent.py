@@ -6,7 +6,11 @@ import subprocess
 import itertools
 from pathlib import Path
 
-from analysis.defects import momentum_timeseries
+from analysis.momentum_series import (
+    sorted_times,
+    momentum_series,
+    series_stats,
+)
 
 # -----------------------------
 # Sweep configuration
@@ -25,26 +29,13 @@ OUTPUT_FILE = "analysis/uncertainty_sweep_results.json"
 # Helper: extract alpha
 # -----------------------------
 def fit_uncertainty_exponent(defects):
-    lifetimes = []
-    variances = []
-
-    for d in defects:
-        ts, ps = momentum_timeseries(
-            defects=defects,
-            defect=d,
-            window=WINDOW,
-            step=STEP
-        )
-
-        if len(ps) < 5:
-            continue
-
-        lifetime = ts[-1] - ts[0]
-        var_p = np.var(ps)
+    # every defect's momentum series in one batched pass
+    series = momentum_series(sorted_times(defects), WINDOW, STEP)
+    n, lifetime, _, var_p = series_stats(*series)
 
-        if lifetime > 0 and var_p > 0:
-            lifetimes.append(lifetime)
-            variances.append(var_p)
+    keep = (n >= 5) & (lifetime > 0) & (var_p > 0)
+    lifetimes = lifetime[keep]
+    variances = var_p[keep]
 
     if len(lifetimes) < 5:
         return None, None
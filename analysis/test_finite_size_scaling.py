@@ -1,30 +1,20 @@
-import json
 import numpy as np
 from scipy.optimize import curve_fit
 
-# ----------------------------
-# Load Ωc extraction results
-# ----------------------------
-with open("analysis/omega_c_by_variant.json") as f:
-    omega_data = json.load(f)
+from analysis.registry import RunRegistry
 
 # ----------------------------
-# Load run lengths
+# Ωc per run (extract_omega_c_per_variant) and run length,
+# from the run registry
 # ----------------------------
-with open("timeseries.json") as f:
-    runs = json.load(f)["runs"]
-
-# Match runs
-Omega_c = []
-L = []
-
-for entry in omega_data:
-    i = entry["run_index"]
-    Omega_c.append(entry["Omega_c"])
-    L.append(runs[i]["t"][-1])   # total runtime as size proxy
+with RunRegistry("runs.sqlite") as reg:
+    rows = reg.query(
+        "SELECT omega_c, t_final FROM runs "
+        "WHERE omega_c IS NOT NULL ORDER BY id"
+    )
 
-Omega_c = np.array(Omega_c)
-L = np.array(L)
+Omega_c = np.array([r["omega_c"] for r in rows])
+L = np.array([r["t_final"] for r in rows])   # total runtime as size proxy
 
 # ----------------------------
 # Finite-size scaling model
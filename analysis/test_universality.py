@@ -1,10 +1,7 @@
 # analysis/test_universality.py
 import json
-import numpy as np
 
-def load_metrics(path):
-    with open(path) as f:
-        return json.load(f)
+from analysis.registry import RunRegistry
 
 variants = [
     "baseline",
@@ -14,22 +11,37 @@ variants = [
     "variant_4",
 ]
 
-results = []
 
-for v in variants:
+def load_metrics(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def from_files(v):
+    # variants analysed before the run registry existed
     cone = load_metrics(f"{v}/lorentz_cone.json")
     eom  = load_metrics(f"{v}/effective_eom.json")
     part = load_metrics(f"{v}/particle_stats.json")
-
-    results.append({
+    return {
         "variant": v,
         "v_max": cone["v_max"],
         "c2": eom["c_omega_sq"],
         "m2": eom["m_omega_sq"],
         "violations": cone["violations"],
         "mean_lifetime": part["mean_lifetime"]
-    })
+    }
+
+
+with RunRegistry("runs.sqlite") as reg:
+    registered = {r["variant"]: r for r in reg.latest_by_variant(variants)}
+
+COLUMNS = ("variant", "v_max", "c2", "m2", "violations", "mean_lifetime")
+results = [
+    {c: registered[v][c] for c in COLUMNS} if v in registered
+    else from_files(v)
+    for v in variants
+]
 
 print("\n=== Step 21: Universality Test ===")
 for r in results:
-    print(r)
\ No newline at end of file
+    print(r)
@@ -32,19 +32,17 @@ def persistence(s1, s2):
 # -----------------------------
 # Main particle tracking
 # -----------------------------
-def main():
-    with open("timeseries.json") as f:
-        data = json.load(f)
-
-    runs = data["runs"]
-    run = runs[-1]
-
+def track_particles(run):
+    """
+    Group a run's defects into particle tracks by support persistence.
+    Returns the particle records (as saved to analysis/particles.json),
+    or None if the run has too little data.
+    """
     defects = run.get("defects", [])
     rewrite_history = run.get("rewrite_history", [])
 
     if len(defects) < 2 or not rewrite_history:
-        print("Not enough data to track particles.")
-        return
+        return None
 
     # Precompute supports
     supports = [
@@ -70,39 +68,49 @@ def main():
         if not placed:
             particles.append([i])
 
-    # -----------------------------
-    # Report particle properties
-    # -----------------------------
+    return [
+        {
+            "particle_id": pid,
+            "defects": track,
+            "times": [defects[i]["time"] for i in track],
+            "omegas": [defects[i]["omega"] for i in track],
+        }
+        for pid, track in enumerate(particles)
+    ]
+
+
+def report_particles(run, particle_data):
+    defects = run.get("defects", [])
+
     print("\n=== Particle Tracking Results ===\n")
     print(f"Total defects:   {len(defects)}")
-    print(f"Total particles:{len(particles)}\n")
-
-    for pid, track in enumerate(particles):
-        times = [defects[i]["time"] for i in track]
-        omegas = [defects[i]["omega"] for i in track]
+    print(f"Total particles:{len(particle_data)}\n")
 
+    for p in particle_data:
+        times = p["times"]
         lifetime = max(times) - min(times)
-        mean_omega = np.mean(omegas)
+        mean_omega = np.mean(p["omegas"])
 
-        print(f"Particle {pid}:")
-        print(f"  Defects:  {len(track)}")
+        print(f"Particle {p['particle_id']}:")
+        print(f"  Defects:  {len(p['defects'])}")
         print(f"  Lifetime: {lifetime}")
         print(f"  Mean Ω:   {mean_omega:.3f}")
         print(f"  Times:    {times}")
         print()
 
-    # -----------------------------
-    # Save particle tracks
-    # -----------------------------
-    particle_data = []
 
-    for pid, track in enumerate(particles):
-        particle_data.append({
-            "particle_id": pid,
-            "defects": track,
-            "times": [defects[i]["time"] for i in track],
-            "omegas": [defects[i]["omega"] for i in track],
-        })
+def main():
+    with open("timeseries.json") as f:
+        data = json.load(f)
+
+    run = data["runs"][-1]
+
+    particle_data = track_particles(run)
+    if particle_data is None:
+        print("Not enough data to track particles.")
+        return
+
+    report_particles(run, particle_data)
 
     with open("analysis/particles.json", "w") as f:
         json.dump(particle_data, f, indent=2)
@@ -1,12 +1,11 @@
 def update_particle_activity(engine, particle_tracks):
-    touched = engine.touched_vertices()
+    """
+    One activity update for the last accepted rewrite.
 
-    for p in particle_tracks:
-        # particle support = union of defect supports
-        support = set(p["times"])  # or vertex support if you track that
-
-        if touched & support:
-            pid = p["particle_id"]
-            engine.particle_activity[pid] = (
-                engine.particle_activity.get(pid, 0) + 1
-            )
\ No newline at end of file
+    The engine does this itself once engine.track_particles(particles)
+    has been called; this entry point is kept for loops that call it
+    after each accepted step.
+    """
+    if engine.particle_tracker is None:
+        engine.track_particles(particle_tracks)
+    engine.particle_tracker.update(engine.touched_vertices())
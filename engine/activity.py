@@ -0,0 +1,36 @@
+# engine/activity.py
+
+
+class ParticleActivityTracker:
+    """
+    Counts, per particle, the accepted rewrites that touch its support.
+
+    A particle's support is p["vertices"] when tracked, else p["times"]
+    (the support analysis/update_particle_activity has always used).
+    The support → particle index is built once, so an update costs
+    O(touched vertices) instead of a pass over every particle.
+    """
+
+    def __init__(self, particles, counts=None):
+        self.counts = {} if counts is None else counts
+        self.index = {}
+        for p in particles:
+            pid = p["particle_id"]
+            for x in p.get("vertices", p["times"]):
+                self.index.setdefault(x, set()).add(pid)
+
+    def update(self, touched):
+        """
+        Add one count to every particle whose support meets touched.
+        Returns the set of particle ids hit.
+        """
+        index = self.index
+        hit = set()
+        for v in touched:
+            pids = index.get(v)
+            if pids:
+                hit |= pids
+        counts = self.counts
+        for pid in hit:
+            counts[pid] = counts.get(pid, 0) + 1
+        return hit
@@ -0,0 +1,480 @@
+# engine/causal.py
+
+from array import array
+from collections.abc import Mapping
+
+
+def bit_positions(x):
+    """
+    Indices of the set bits of a non-negative int, ascending.
+    """
+    s = bin(x)[:1:-1]
+    out = []
+    i = s.find("1")
+    while i >= 0:
+        out.append(i)
+        i = s.find("1", i + 1)
+    return out
+
+
+class BitsetCausalOrder:
+    """
+    Causal relation stored as bit rows over dense vertex slots.
+
+    fut[s] has bit t set when the vertex in slot s precedes the vertex
+    in slot t (reflexive: every vertex precedes itself); past is the
+    transpose. Rows are Python ints, so relation tests are a shift and
+    interval sizes |J+(u) ∩ J-(v)| a single AND + popcount.
+    """
+
+    transitive = False
+
+    def __init__(self):
+        self.slot = {}      # vertex id -> slot
+        self.ids = []       # slot -> vertex id (None when free)
+        self.fut = []
+        self.past = []
+        self._free = []
+
+    def __contains__(self, vid):
+        return vid in self.slot
+
+    def __len__(self):
+        return len(self.slot)
+
+    # ---------- Vertices ----------
+
+    def add(self, vid):
+        if vid in self.slot:
+            return self.slot[vid]
+        if self._free:
+            s = self._free.pop()
+            self.ids[s] = vid
+        else:
+            s = len(self.ids)
+            self.ids.append(vid)
+            self.fut.append(0)
+            self.past.append(0)
+        self.slot[vid] = s
+        self.fut[s] = self.past[s] = 1 << s  # reflexivity
+        return s
+
+    def remove(self, vid):
+        """
+        Drop a vertex and every relation it takes part in.
+        """
+        s = self.slot.pop(vid)
+        mask = ~(1 << s)
+        for t in bit_positions(self.past[s]):
+            self.fut[t] &= mask
+        for t in bit_positions(self.fut[s]):
+            self.past[t] &= mask
+        self.fut[s] = self.past[s] = 0
+        self.ids[s] = None
+        self._free.append(s)
+
+    # ---------- Relations ----------
+
+    def relate(self, uid, vid):
+        """
+        Add u → v. Returns False if it was already present.
+        """
+        su, sv = self.slot[uid], self.slot[vid]
+        bit = 1 << sv
+        if self.fut[su] & bit:
+            return False
+        self.fut[su] |= bit
+        self.past[sv] |= 1 << su
+        return True
+
+    def unrelate(self, uid, vid):
+        su, sv = self.slot[uid], self.slot[vid]
+        self.fut[su] &= ~(1 << sv)
+        self.past[sv] &= ~(1 << su)
+
+    def related(self, uid, vid):
+        su = self.slot.get(uid)
+        sv = self.slot.get(vid)
+        if su is None or sv is None:
+            return False
+        return (self.fut[su] >> sv) & 1 == 1
+
+    def redirect(self, old, new):
+        """
+        Every u → old becomes u → new (vertex fusion). Returns the
+        (added, dropped) relations u → new, as lists of u ids.
+        """
+        so, sn = self.slot[old], self.slot[new]
+        preds = self.past[so] & ~(1 << so)
+        old_bit, new_bit = 1 << so, 1 << sn
+        added = [
+            self.ids[t] for t in bit_positions(preds & ~self.past[sn])
+        ]
+        for t in bit_positions(preds):
+            self.fut[t] = (self.fut[t] & ~old_bit) | new_bit
+        self.past[sn] |= preds
+        self.past[so] = old_bit
+        return added, []
+
+    # ---------- Queries ----------
+
+    def future_ids(self, vid):
+        ids = self.ids
+        return [ids[t] for t in bit_positions(self.fut[self.slot[vid]])]
+
+    def past_ids(self, vid):
+        ids = self.ids
+        return [ids[t] for t in bit_positions(self.past[self.slot[vid]])]
+
+    def stored_past_ids(self, vid):
+        """
+        Vertices with an explicitly stored relation u → v (u ≠ v).
+        """
+        s = self.slot[vid]
+        ids = self.ids
+        return [ids[t] for t in bit_positions(self.past[s] & ~(1 << s))]
+
+    def stored_future_ids(self, vid):
+        """
+        Vertices with an explicitly stored relation v → w (w ≠ v).
+        """
+        s = self.slot[vid]
+        ids = self.ids
+        return [ids[t] for t in bit_positions(self.fut[s] & ~(1 << s))]
+
+    def interval_size(self, uid, vid):
+        """
+        |J+(u) ∩ J-(v)|
+        """
+        return (self.fut[self.slot[uid]] & self.past[self.slot[vid]]).bit_count()
+
+    def interval_sizes(self, pairs):
+        """
+        Interval sizes for a batch of (u_id, v_id) pairs.
+        """
+        fut, past, slot = self.fut, self.past, self.slot
+        return [(fut[slot[u]] & past[slot[v]]).bit_count() for u, v in pairs]
+
+
+class CausalOrderView(Mapping):
+    """
+    Read-only {u.id: set of v.id} view of a causal order backend,
+    the layout Hypergraph.causal_order used to store directly.
+    """
+
+    def __init__(self, order):
+        self.order = order
+
+    def __getitem__(self, vid):
+        if vid not in self.order:
+            return frozenset()
+        return frozenset(self.order.future_ids(vid))
+
+    def __contains__(self, vid):
+        return vid in self.order
+
+    def __iter__(self):
+        return iter(self.order.slot)
+
+    def __len__(self):
+        return len(self.order)
+
+
+class CompactCausalOrder:
+    """
+    Causal order kept as a transitive reduction plus a reachability index.
+
+    Only non-implied relations are stored (each vertex keeps an antichain
+    of parents), so memory is O(V + E_reduced) instead of dense ancestor
+    sets. Relations are the transitive closure of the stored edges.
+
+    Queries are pruned depth-first searches over the reduction, cut by
+      * topological levels: u can only reach v if level[u] < level[v];
+      * GRAIL interval labels from a few post-order traversals: if v is
+        reachable from u, v's interval lies inside u's in every traversal.
+    Labels are rebuilt lazily. Appending sinks never changes reachability
+    among labelled vertices, so the usual growth keeps them valid.
+    """
+
+    transitive = True
+    TRAVERSALS = 2
+
+    def __init__(self):
+        self.slot = {}      # vertex id -> slot
+        self.ids = []       # slot -> vertex id (None when free)
+        self.parents = []
+        self.children = []
+        self.level = array("l")
+        self._free = []
+
+        self._low = [array("l") for _ in range(self.TRAVERSALS)]
+        self._post = [array("l") for _ in range(self.TRAVERSALS)]
+        self._labelled = bytearray()
+        self._n_labelled = 0
+
+    def __contains__(self, vid):
+        return vid in self.slot
+
+    def __len__(self):
+        return len(self.slot)
+
+    # ---------- Vertices ----------
+
+    def add(self, vid):
+        if vid in self.slot:
+            return self.slot[vid]
+        if self._free:
+            s = self._free.pop()
+            self.ids[s] = vid
+            self.parents[s] = array("l")
+            self.children[s] = array("l")
+            self.level[s] = 0
+        else:
+            s = len(self.ids)
+            self.ids.append(vid)
+            self.parents.append(array("l"))
+            self.children.append(array("l"))
+            self.level.append(0)
+            for k in range(self.TRAVERSALS):
+                self._low[k].append(0)
+                self._post[k].append(0)
+            self._labelled.append(0)
+        self.slot[vid] = s
+        return s
+
+    def remove(self, vid):
+        s = self.slot.pop(vid)
+        for p in self.parents[s]:
+            self._drop(self.children[p], s)
+        for c in self.children[s]:
+            self._drop(self.parents[c], s)
+        self.parents[s] = array("l")
+        self.children[s] = array("l")
+        self.ids[s] = None
+        self._unlabel(s)
+        self._free.append(s)
+
+    @staticmethod
+    def _drop(arr, x):
+        try:
+            arr.remove(x)
+        except ValueError:
+            pass
+
+    # ---------- Relations ----------
+
+    def relate(self, uid, vid):
+        """
+        Add u → v unless already implied. Returns False if implied.
+        Parents of v that u now covers are dropped from the reduction.
+        Raises ValueError if v already reaches u: the order must stay
+        acyclic (levels would be raised around the loop forever).
+        """
+        return self._link(self.slot[uid], self.slot[vid]) is not None
+
+    def _link(self, su, sv):
+        """
+        relate() on slots. Returns the parents of v dropped from the
+        reduction, or None if u → v was already implied.
+        """
+        if self._reaches(su, sv):
+            return None
+        if self._reaches(sv, su):
+            raise ValueError(
+                f"{self.ids[su]} -> {self.ids[sv]} would close a causal cycle"
+            )
+        if self._labelled[sv] or self.children[sv]:
+            self._invalidate_labels()
+
+        covered = [p for p in self.parents[sv] if self._reaches(p, su)]
+        for p in covered:
+            self._drop(self.parents[sv], p)
+            self._drop(self.children[p], sv)
+
+        self.parents[sv].append(su)
+        self.children[su].append(sv)
+        self._raise_level(sv, self.level[su] + 1)
+        return covered
+
+    def unrelate(self, uid, vid):
+        su, sv = self.slot[uid], self.slot[vid]
+        self._drop(self.parents[sv], su)
+        self._drop(self.children[su], sv)
+
+    def related(self, uid, vid):
+        su = self.slot.get(uid)
+        sv = self.slot.get(vid)
+        if su is None or sv is None:
+            return False
+        self._ensure_labels()
+        return self._reaches(su, sv)
+
+    def redirect(self, old, new):
+        """
+        Every u → old becomes u → new (vertex fusion). Returns the
+        (added, dropped) stored relations u → new, as lists of u ids.
+        """
+        so, sn = self.slot[old], self.slot[new]
+        added, dropped = [], []
+        for p in list(self.parents[so]):
+            if p != sn and not self._reaches(sn, p):
+                covered = self._link(p, sn)
+                if covered is not None:
+                    added.append(self.ids[p])
+                    dropped.extend(self.ids[c] for c in covered)
+        return added, dropped
+
+    # ---------- Levels + labels ----------
+
+    def _raise_level(self, s, lvl):
+        if self.level[s] >= lvl:
+            return
+        self.level[s] = lvl
+        stack = [s]
+        while stack:
+            x = stack.pop()
+            nxt = self.level[x] + 1
+            for c in self.children[x]:
+                if self.level[c] < nxt:
+                    self.level[c] = nxt
+                    stack.append(c)
+
+    def _unlabel(self, s):
+        if self._labelled[s]:
+            self._labelled[s] = 0
+            self._n_labelled -= 1
+
+    def _invalidate_labels(self):
+        self._labelled = bytearray(len(self.ids))
+        self._n_labelled = 0
+
+    def _ensure_labels(self):
+        if 4 * (len(self.slot) - self._n_labelled) <= len(self.slot):
+            return
+        n = len(self.ids)
+        live = [s for s in range(n) if self.ids[s] is not None]
+        roots = [s for s in live if not self.parents[s]]
+
+        reached = None
+        for k in range(self.TRAVERSALS):
+            low, post = self._low[k], self._post[k]
+            visited = bytearray(n)
+            counter = 0
+            order = roots if k % 2 == 0 else roots[::-1]
+            for r in order:
+                if visited[r]:
+                    continue
+                visited[r] = 1
+                stack = [(r, 0)]
+                while stack:
+                    x, i = stack[-1]
+                    kids = self.children[x]
+                    if k % 2:
+                        kids = kids[::-1]
+                    if i < len(kids):
+                        stack[-1] = (x, i + 1)
+                        c = kids[i]
+                        if not visited[c]:
+                            visited[c] = 1
+                            stack.append((c, 0))
+                        continue
+                    stack.pop()
+                    lo = counter
+                    for c in kids:
+                        if low[c] < lo:
+                            lo = low[c]
+                    low[x] = lo
+                    post[x] = counter
+                    counter += 1
+            reached = visited if reached is None else bytes(
+                a & b for a, b in zip(reached, visited)
+            )
+
+        # a vertex on a cycle is never reached from a root: leave it
+        # unlabelled so it is never cut
+        self._labelled = bytearray(reached or b"")
+        self._n_labelled = sum(self._labelled)
+
+    def _may_reach(self, su, sx):
+        """
+        False only if x is certainly not reachable from u.
+        """
+        if self.level[sx] <= self.level[su]:
+            return False
+        if self._labelled[su] and self._labelled[sx]:
+            for k in range(self.TRAVERSALS):
+                low, post = self._low[k], self._post[k]
+                if low[sx] < low[su] or post[sx] > post[su]:
+                    return False
+        return True
+
+    def _reaches(self, su, sv):
+        if su == sv:
+            return True
+        if not self._may_reach(su, sv):
+            return False
+        stack = [sv]
+        seen = {sv}
+        while stack:
+            x = stack.pop()
+            for p in self.parents[x]:
+                if p == su:
+                    return True
+                if p in seen or not self._may_reach(su, p):
+                    continue
+                seen.add(p)
+                stack.append(p)
+        return False
+
+    # ---------- Queries ----------
+
+    def _closure(self, s, edges, keep=None):
+        out = {s}
+        stack = [s]
+        while stack:
+            x = stack.pop()
+            for y in edges[x]:
+                if y not in out and (keep is None or keep(y)):
+                    out.add(y)
+                    stack.append(y)
+        return out
+
+    def future_ids(self, vid):
+        ids = self.ids
+        return [ids[s] for s in self._closure(self.slot[vid], self.children)]
+
+    def past_ids(self, vid):
+        ids = self.ids
+        return [ids[s] for s in self._closure(self.slot[vid], self.parents)]
+
+    def stored_past_ids(self, vid):
+        """
+        Parents in the transitive reduction.
+        """
+        ids = self.ids
+        return [ids[p] for p in self.parents[self.slot[vid]]]
+
+    def stored_future_ids(self, vid):
+        """
+        Children in the transitive reduction.
+        """
+        ids = self.ids
+        return [ids[c] for c in self.children[self.slot[vid]]]
+
+    def interval_size(self, uid, vid):
+        """
+        |J+(u) ∩ J-(v)|: ancestors of v above u's level, then the part
+        of them reachable from u.
+        """
+        self._ensure_labels()
+        su, sv = self.slot[uid], self.slot[vid]
+        if not self._reaches(su, sv):
+            return 0
+        lu = self.level[su]
+        anc = self._closure(
+            sv, self.parents, keep=lambda y: self.level[y] >= lu
+        )
+        return len(self._closure(su, self.children, keep=anc.__contains__))
+
+    def interval_sizes(self, pairs):
+        return [self.interval_size(u, v) for u, v in pairs]
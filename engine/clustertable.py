@@ -0,0 +1,85 @@
+# engine/clustertable.py
+
+import struct
+import sys
+from array import array
+
+
+MAGIC = b"HCSNCT1\n"
+
+# long-format columns, all int64 little-endian
+COLUMNS = (
+    ("time", "q"),
+    ("cluster_id", "q"),
+    ("size", "q"),
+    ("xi_support", "q"),   # ξ-support size of the whole state at `time`
+)
+
+# cluster_id of the one row every recorded step gets, so steps without
+# clusters still exist in the table (size is 0 on these rows)
+STEP_ROW = -1
+
+CHUNK_HEADER = struct.Struct("<I")   # number of rows in the chunk
+
+
+class ClusterTableWriter:
+    """
+    Append-only binary table of ξ-cluster sizes, one row per
+    (time, cluster), written in chunks.
+
+    The file is MAGIC followed by chunks; a chunk is its row count and
+    then each column of COLUMNS as raw int64 values. Readers can stream
+    it chunk by chunk (analysis/cluster_table.py) without loading it.
+    """
+
+    def __init__(self, path, chunk_rows=65536):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._cols = [array(code) for _, code in COLUMNS]
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self.rows = 0
+        self.closed = False
+
+    def append(self, time, sizes, xi_support=0):
+        """
+        Record one step: `sizes` maps cluster id -> size.
+        """
+        t, cid, size, xi = self._cols
+        t.append(time)
+        cid.append(STEP_ROW)
+        size.append(0)
+        xi.append(xi_support)
+        for c, s in sizes.items():
+            t.append(time)
+            cid.append(c)
+            size.append(s)
+            xi.append(xi_support)
+        if len(t) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        n = len(self._cols[0])
+        if n == 0:
+            return
+        self._file.write(CHUNK_HEADER.pack(n))
+        for i, col in enumerate(self._cols):
+            if sys.byteorder == "big":
+                col.byteswap()
+            col.tofile(self._file)
+            self._cols[i] = array(col.typecode)
+        self._file.flush()
+        self.rows += n
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,71 @@
+# engine/defects.py
+
+
+class DefectDetector:
+    """
+    Streaming defect detector, fed once per engine step.
+
+    A committed step is a defect event when Ω jumps by more than
+    omega_threshold and the jump is topological (label frustration
+    changed, ΔQ ≠ 0) or carried by ξ (the rewrite site holds ξ).
+    Events closer than `gap` steps belong to one defect, whose
+    birth_time is the time of its first event.
+
+    Every record has the same fields, see FIELDS. The detector only
+    looks at per-step deltas the engine already has, so each call is O(1)
+    apart from the ξ check over the rewrite site.
+    """
+
+    FIELDS = (
+        "time",
+        "birth_time",
+        "omega",
+        "delta_omega",
+        "delta_Q",
+        "xi_active",
+        "anchor_vertex",
+        "forced",
+    )
+
+    def __init__(self, log, omega_threshold=0.08, gap=10):
+        self.log = log
+        self.omega_threshold = omega_threshold
+        self.gap = gap
+        self._birth = None
+        self._last = None
+
+    def _record(self, time, omega, delta_omega, delta_q, xi_active,
+                anchor, forced):
+        if self._last is None or time - self._last > self.gap:
+            self._birth = time
+        self._last = time
+        record = {
+            "time": time,
+            "birth_time": self._birth,
+            "omega": omega,
+            "delta_omega": delta_omega,
+            "delta_Q": delta_q,
+            "xi_active": xi_active,
+            "anchor_vertex": anchor,
+            "forced": forced,
+        }
+        self.log.append(record)
+        return record
+
+    def observe(self, time, omega, delta_omega, delta_q, xi_active, anchor):
+        """
+        Feed one committed step. Returns the record if it is a defect.
+        """
+        if abs(delta_omega) <= self.omega_threshold:
+            return None
+        if not delta_q and not xi_active:
+            return None
+        return self._record(
+            time, omega, delta_omega, delta_q, xi_active, anchor, False
+        )
+
+    def inject(self, time, omega, delta_q, anchor):
+        """
+        Record a defect forced by hand (engine.force_defect).
+        """
+        return self._record(time, omega, 0.0, delta_q, True, anchor, True)
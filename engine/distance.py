@@ -0,0 +1,240 @@
+# engine/distance.py
+
+from array import array
+
+
+# Sources advanced together per bit-parallel sweep
+WORD_BITS = 64
+
+
+class CSRGraph:
+    """
+    Compact CSR snapshot of an undirected interaction graph.
+    inter: dict {node_id: set(neighbors)}
+
+    Vertex ids are mapped to dense slots 0..n-1; neighbors of slot i
+    are indices[indptr[i]:indptr[i + 1]]. The snapshot does not follow
+    later mutations of inter.
+    """
+
+    def __init__(self, inter):
+        index = {}
+        ids = []
+        for v, nbrs in inter.items():
+            if v not in index:
+                index[v] = len(ids)
+                ids.append(v)
+            for u in nbrs:
+                if u not in index:
+                    index[u] = len(ids)
+                    ids.append(u)
+
+        indptr = array("l", [0])
+        indices = array("l")
+        for v in ids:
+            indices.extend(index[u] for u in inter.get(v, ()))
+            indptr.append(len(indices))
+
+        self.ids = ids
+        self.index = index
+        self.indptr = indptr
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.ids)
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def slots(self, vids):
+        index = self.index
+        return [index[v] for v in vids if v in index]
+
+
+def _expand(csr, frontier, dist):
+    indptr, indices = csr.indptr, csr.indices
+    depth = dist[frontier[0]] + 1
+    nxt = []
+    for v in frontier:
+        for k in range(indptr[v], indptr[v + 1]):
+            u = indices[k]
+            if dist[u] < 0:
+                dist[u] = depth
+                nxt.append(u)
+    return nxt
+
+
+def set_distance(csr, sources, targets, max_depth=50):
+    """
+    Shortest path length from any source to any target (vertex ids).
+    Bidirectional BFS: the smaller frontier is expanded one level at
+    a time until the two searches meet. Returns inf beyond max_depth.
+    """
+    targets = targets if isinstance(targets, (set, frozenset, dict)) else set(targets)
+    for s in sources:
+        if s in targets:
+            return 0
+
+    n = len(csr)
+    fwd = array("l", [-1]) * n
+    bwd = array("l", [-1]) * n
+    ff = csr.slots(set(sources))
+    bf = csr.slots(targets)
+    if not ff or not bf:
+        return float("inf")
+    for i in ff:
+        fwd[i] = 0
+    for i in bf:
+        bwd[i] = 0
+
+    df = db = 0
+    while ff and bf and df + db < max_depth:
+        if len(ff) <= len(bf):
+            ff = _expand(csr, ff, fwd)
+            df += 1
+            hits = [bwd[u] for u in ff if bwd[u] >= 0]
+            if hits:
+                return df + min(hits)
+        else:
+            bf = _expand(csr, bf, bwd)
+            db += 1
+            hits = [fwd[u] for u in bf if fwd[u] >= 0]
+            if hits:
+                return db + min(hits)
+
+    return float("inf")
+
+
+def multi_source_distances(csr, sources, max_depth=50):
+    """
+    Distance from every reachable vertex to the nearest source.
+    Returns {vertex_id: distance}; vertices beyond max_depth are left out.
+    """
+    dist = array("l", [-1]) * len(csr)
+    frontier = csr.slots(set(sources))
+    for i in frontier:
+        dist[i] = 0
+
+    depth = 0
+    while frontier and depth < max_depth:
+        frontier = _expand(csr, frontier, dist)
+        depth += 1
+
+    out = {v: 0 for v in sources}
+    ids = csr.ids
+    for i, d in enumerate(dist):
+        if d >= 0:
+            out[ids[i]] = d
+    return out
+
+
+def _bit_sweep(csr, groups, max_depth, on_arrival):
+    """
+    Bit-parallel BFS for up to WORD_BITS source groups at once.
+    Every slot carries a word whose bit b is set once group b has
+    reached it; one pass over the frontier advances all groups.
+    on_arrival(slot, bits, depth) sees the newly arrived bits and
+    returns True to stop early.
+    """
+    n = len(csr)
+    indptr, indices = csr.indptr, csr.indices
+    seen = [0] * n
+    frontier = {}
+    for b, group in enumerate(groups):
+        bit = 1 << b
+        for i in csr.slots(group):
+            seen[i] |= bit
+            frontier[i] = frontier.get(i, 0) | bit
+
+    for i, bits in frontier.items():
+        if on_arrival(i, bits, 0):
+            return
+
+    depth = 0
+    while frontier and depth < max_depth:
+        depth += 1
+        nxt = {}
+        for v, bits in frontier.items():
+            for k in range(indptr[v], indptr[v + 1]):
+                u = indices[k]
+                new = bits & ~seen[u]
+                if new:
+                    seen[u] |= new
+                    nxt[u] = nxt.get(u, 0) | new
+        for u, bits in nxt.items():
+            if on_arrival(u, bits, depth):
+                return
+        frontier = nxt
+
+
+def batch_set_distances(csr, source_groups, targets, max_depth=50):
+    """
+    Distance from each source group (iterable of vertex ids) to targets.
+    Groups are advanced WORD_BITS at a time by a bit-parallel sweep.
+    Returns a list aligned with source_groups; inf beyond max_depth.
+    """
+    source_groups = [list(g) for g in source_groups]
+    target_slots = set(csr.slots(targets))
+    targets = set(targets)
+    out = []
+
+    for base in range(0, len(source_groups), WORD_BITS):
+        chunk = source_groups[base:base + WORD_BITS]
+        found = [
+            0 if any(s in targets for s in g) else float("inf")
+            for g in chunk
+        ]
+        pending = 0
+        for b, d in enumerate(found):
+            if d:
+                pending |= 1 << b
+
+        def on_arrival(slot, bits, depth):
+            nonlocal pending
+            hit = bits & pending if slot in target_slots else 0
+            while hit:
+                low = hit & -hit
+                found[low.bit_length() - 1] = depth
+                pending ^= low
+                hit ^= low
+            return not pending
+
+        if pending:
+            _bit_sweep(csr, chunk, max_depth, on_arrival)
+        out.extend(found)
+
+    return out
+
+
+def pairwise_group_distances(csr, groups, max_depth=50):
+    """
+    Distances between all pairs of disjoint vertex groups.
+    Returns {(i, j): d} for i < j, only for pairs within max_depth.
+    """
+    groups = [list(g) for g in groups]
+    owner = {}
+    for j, group in enumerate(groups):
+        for i in csr.slots(group):
+            owner[i] = j
+
+    out = {}
+    for base in range(0, len(groups), WORD_BITS):
+        chunk = groups[base:base + WORD_BITS]
+
+        def on_arrival(slot, bits, depth):
+            j = owner.get(slot)
+            if j is None:
+                return False
+            while bits:
+                low = bits & -bits
+                i = base + low.bit_length() - 1
+                bits ^= low
+                if i != j:
+                    key = (min(i, j), max(i, j))
+                    if key not in out:
+                        out[key] = depth
+            return False
+
+        _bit_sweep(csr, chunk, max_depth, on_arrival)
+
+    return out
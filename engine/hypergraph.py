@@ -1,7 +1,13 @@
 # engine/hypergraph.py
 import random
 import itertools
-from collections import defaultdict
+
+from engine.causal import (
+    BitsetCausalOrder,
+    CompactCausalOrder,
+    CausalOrderView,
+)
+from engine.memo import VersionedDict, ObservableCache
 
 
 class Vertex:
@@ -33,34 +39,133 @@ class Hyperedge:
         return f"E{self.id}({ids})"
 
 
+def is_mixed(edge):
+    """
+    True if the edge joins vertices of different labels (a frustrated edge).
+    """
+    labels = {getattr(v, "label", None) for v in edge.vertices}
+    return len(labels) > 1
+
+
+class _EdgeDict(VersionedDict):
+    """
+    Hyperedge dict that keeps the owner's edge counters (mixed_edges,
+    incidences) current on every change.
+    """
+
+    def _count(self, edge, sign):
+        owner = self.owner
+        owner.incidences += sign * len(set(edge.vertices))
+        if is_mixed(edge):
+            owner.mixed_edges += sign
+
+    def __setitem__(self, key, edge):
+        old = self.get(key)
+        if old is not None:
+            self._count(old, -1)
+        super().__setitem__(key, edge)
+        self._count(edge, +1)
+
+    def __delitem__(self, key):
+        edge = self[key]
+        super().__delitem__(key)
+        self._count(edge, -1)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        edge = super().pop(key)
+        self._count(edge, -1)
+        return edge
+
+    def popitem(self):
+        key, edge = super().popitem()
+        self._count(edge, -1)
+        return key, edge
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, edge in dict(*args, **kwargs).items():
+            self[key] = edge
+
+    def clear(self):
+        super().clear()
+        self.owner.mixed_edges = 0
+        self.owner.incidences = 0
+
+
 class Hypergraph:
     """
     Core data structure for HCSN.
     Represents a causal quantum hypergraph.
+
+    causal="bitset" stores every relation as bit rows (dense, fast
+    interval counts); causal="compact" stores a transitive reduction
+    with a reachability index, for long runs where dense ancestor
+    sets would not fit in memory.
+
+    version increases on every mutation (vertex/edge dicts and causal
+    relations); memo caches observables until it does.
     """
 
-    def __init__(self):
-        self.vertices = {}
-        self.hyperedges = {}
-        self.causal_order = defaultdict(set)  # u.id -> set of v.id
+    def __init__(self, causal="bitset"):
+        self.version = 0
+        self.vertices = VersionedDict(self)
+        self.mixed_edges = 0    # hyperedges with mixed vertex labels
+        self.incidences = 0     # Σ over hyperedges of their vertex count
+        self.hyperedges = _EdgeDict(self)
+        self.memo = ObservableCache(self)
+
+        # depth -> ids of the vertices at that depth
+        self.depth_buckets = {}
+        self._max_depth = 0
+        if causal == "compact":
+            self.causal = CompactCausalOrder()
+        else:
+            self.causal = BitsetCausalOrder()
+        self.causal_order = CausalOrderView(self.causal)  # u.id -> set of v.id
 
     # ---------- Vertex operations ----------
 
-    def add_vertex(self):
+    def new_vertex(self):
+        """
+        Create a labelled vertex without inserting it.
+        """
         v = Vertex()
-        
+
         #NEW: topological/charge-like label
         v.label = random.choice([-1, +1])
+        return v
+
+    def add_vertex(self):
+        return self.insert_vertex(self.new_vertex())
+
+    def insert_vertex(self, v):
         self.vertices[v.id] = v
-        self.causal_order[v.id].add(v.id)  # reflexivity
+        self.causal.add(v.id)  # reflexivity
+        self._bucket_add(v.id, v.depth)
         return v
 
+    def remove_vertex(self, v):
+        """
+        Remove v together with every causal relation it takes part in.
+        """
+        del self.vertices[v.id]
+        self.causal.remove(v.id)
+        self._bucket_remove(v.id, v.depth)
+
     # ---------- Hyperedge operations ----------
 
     def add_hyperedge(self, vertices):
         for v in vertices:
             assert hasattr(v, "id"), f"Non-Vertex in hyperedge: {v}"
-        edge = Hyperedge(vertices)
+        return self.insert_hyperedge(Hyperedge(vertices))
+
+    def insert_hyperedge(self, edge):
         self.hyperedges[edge.id] = edge
         return edge
 
@@ -70,24 +175,37 @@ class Hypergraph:
         """
         Add causal relation u → v and update worldline depth.
         """
-        if v.id not in self.causal_order[u.id]:
-            self.causal_order[u.id].add(v.id)
-
+        if self.causal.relate(u.id, v.id):
+            self.version += 1
             # Worldline inertia: propagate depth
-            v.depth = max(v.depth, u.depth + 1)
+            if u.depth + 1 > v.depth:
+                if v.id in self.vertices:
+                    self._bucket_remove(v.id, v.depth)
+                    self._bucket_add(v.id, u.depth + 1)
+                v.depth = u.depth + 1
+
+    def redirect_causal(self, v_old, v_new):
+        """
+        Every relation u → v_old becomes u → v_new. Returns the
+        (added, dropped) stored relations u → v_new, as lists of u ids.
+        """
+        self.version += 1
+        return self.causal.redirect(v_old.id, v_new.id)
 
     def is_causally_related(self, u, v):
-        return v.id in self.causal_order[u.id]
+        return self.causal.related(u.id, v.id)
 
     def causal_future(self, v):
-        return {self.vertices[i] for i in self.causal_order[v.id]}
+        return {self.vertices[i] for i in self.causal.future_ids(v.id)}
 
     def causal_past(self, v):
-        return {
-            self.vertices[u_id]
-            for u_id in self.vertices
-            if v.id in self.causal_order[u_id]
-        }
+        return {self.vertices[i] for i in self.causal.past_ids(v.id)}
+
+    def causal_interval_size(self, u, v):
+        """
+        |J+(u) ∩ J-(v)| by popcount.
+        """
+        return self.causal.interval_size(u.id, v.id)
 
     # ---------- Observables ----------
 
@@ -98,22 +216,81 @@ class Hypergraph:
         return sum(1 for e in self.hyperedges.values() if v in e.vertices)
 
     def average_coordination(self):
+        """
+        <k> = Σ_v coordination_number(v) / |V|, i.e. incidences / |V|
+        (every hyperedge's vertices are in the hypergraph).
+        """
         if not self.vertices:
             return 0.0
-        return sum(
-            self.coordination_number(v)
-            for v in self.vertices.values()
-        ) / len(self.vertices)
+        return self.incidences / len(self.vertices)
 
     # ---------- Worldline inertia ----------
 
+    def _bucket_add(self, vid, depth):
+        bucket = self.depth_buckets.get(depth)
+        if bucket is None:
+            bucket = self.depth_buckets[depth] = set()
+        bucket.add(vid)
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+    def _bucket_remove(self, vid, depth):
+        bucket = self.depth_buckets[depth]
+        bucket.discard(vid)
+        if bucket:
+            return
+        del self.depth_buckets[depth]
+        if depth == self._max_depth:
+            while self._max_depth > 0 and self._max_depth not in self.depth_buckets:
+                self._max_depth -= 1
+
     def max_chain_length(self):
         """
         Maximum causal chain length in the hypergraph.
         """
-        if not self.vertices:
-            return 0
-        return max(v.depth for v in self.vertices.values())
+        return self._max_depth
+
+    def depth_histogram(self):
+        """
+        {depth: number of vertices at that depth}
+        """
+        return {d: len(b) for d, b in sorted(self.depth_buckets.items())}
+
+    def worldline_cutoff(self, fraction=0.6):
+        return int(fraction * self._max_depth)
+
+    def vertex_ids_at_depth(self, lo, hi=None):
+        """
+        Ids of vertices with lo <= depth <= hi (hi defaults to the max).
+        """
+        hi = self._max_depth if hi is None else hi
+        out = set()
+        buckets = self.depth_buckets
+        for d in range(max(lo, 0), hi + 1):
+            bucket = buckets.get(d)
+            if bucket:
+                out |= bucket
+        return out
+
+    def worldline_ids(self, fraction=0.6):
+        """
+        Ids of deep worldlines: depth >= int(fraction * max depth).
+        """
+        return self.vertex_ids_at_depth(self.worldline_cutoff(fraction))
+
+    def worldline_shift(self, old_cutoff, fraction=0.6):
+        """
+        How the worldline set changed because the cutoff moved from
+        old_cutoff. Returns (cutoff, entered, left): vertex ids that
+        crossed the moving cutoff. Vertices that were added, removed
+        or deepened in the meantime are the rewrite's to report.
+        """
+        cutoff = self.worldline_cutoff(fraction)
+        if cutoff < old_cutoff:
+            return cutoff, self.vertex_ids_at_depth(cutoff, old_cutoff - 1), set()
+        if cutoff > old_cutoff:
+            return cutoff, set(), self.vertex_ids_at_depth(old_cutoff, cutoff - 1)
+        return cutoff, set(), set()
 
     # ---------- Debug ----------
 
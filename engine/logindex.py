@@ -0,0 +1,170 @@
+# engine/logindex.py
+
+import json
+import os
+import re
+from array import array
+
+
+RUN_MARKER = b"RUN STARTED:"
+DEFECT_MARKER = b"*** DEFECT EVENT"
+
+# columns of a run-table row: name, typecode, column in the "|" split
+ROW_COLUMNS = (
+    ("t", "q", 0),
+    ("k", "d", 2),
+    ("phi", "d", 6),
+    ("psi", "d", 7),
+    ("acc", "d", 8),
+    ("omega", "d", 9),
+)
+
+
+class LogIndex:
+    """
+    Byte offsets of run headers and defect markers in simulation.log.
+
+    The index lives next to the log (path + ".idx") together with the
+    number of bytes already scanned, so update() only reads what was
+    appended since. A log that was replaced (rotated: new inode) or
+    shrank (truncated) is re-indexed from the start.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.inode = None
+        self.scanned = 0
+        self.runs = []       # offset of each "RUN STARTED:" line
+        self.defects = []    # [offset, t] of each defect marker line
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.inode = data.get("inode")
+        self.scanned = data["scanned"]
+        self.runs = data["runs"]
+        self.defects = data["defects"]
+
+    def save(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "inode": self.inode,
+                "scanned": self.scanned,
+                "runs": self.runs,
+                "defects": self.defects,
+            }, f)
+        os.replace(tmp, self.index_path)
+
+    def update(self):
+        """
+        Index lines appended since the last update. Returns self.
+        """
+        st = os.stat(self.path)
+        size = st.st_size
+        if size < self.scanned or st.st_ino != self.inode:
+            self.inode = st.st_ino
+            self.scanned = 0
+            self.runs = []
+            self.defects = []
+        if size == self.scanned:
+            return self
+
+        with open(self.path, "rb") as f:
+            f.seek(self.scanned)
+            offset = self.scanned
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                if RUN_MARKER in line:
+                    self.runs.append(offset)
+                elif line.lstrip().startswith(DEFECT_MARKER):
+                    m = re.search(rb"t=(\d+)", line)
+                    if m:
+                        self.defects.append([offset, int(m.group(1))])
+                offset += len(line)
+        self.scanned = offset
+        self.save()
+        return self
+
+    def run_span(self, run=-1):
+        """
+        (start, end) byte offsets of a run; end is None for the last.
+        """
+        start = self.runs[run]
+        i = self.runs.index(start)
+        end = self.runs[i + 1] if i + 1 < len(self.runs) else None
+        return start, end
+
+
+def parse_row(line):
+    """
+    Run-table row -> tuple of ROW_COLUMNS values, or None.
+    """
+    if "|" not in line:
+        return None
+    parts = [p.strip() for p in line.split("|")]
+    if len(parts) < 10:
+        return None
+    try:
+        return tuple(
+            (int if code == "q" else float)(parts[i].replace("%", ""))
+            for _, code, i in ROW_COLUMNS
+        )
+    except ValueError:
+        return None
+
+
+def iter_run_lines(path, run=-1, index=None):
+    """
+    Lines of one run, read by seeking straight to its header.
+    """
+    index = (index or LogIndex(path)).update()
+    if not index.runs:
+        raise RuntimeError(f"No RUN STARTED marker found in {path}")
+    start, end = index.run_span(run)
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        for raw in f:
+            if end is not None and pos >= end:
+                return
+            pos += len(raw)
+            yield raw.decode("utf-8", errors="replace")
+
+
+def read_run(path, run=-1, index=None):
+    """
+    One run of the log as typed arrays: t, k, phi, psi, acc, omega
+    (run-table rows) and defect_times.
+    """
+    out = {name: array(code) for name, code, _ in ROW_COLUMNS}
+    out["defect_times"] = array("q")
+    columns = [out[name] for name, _, _ in ROW_COLUMNS]
+
+    for line in iter_run_lines(path, run, index):
+        line = line.strip()
+        if line.startswith("*** DEFECT EVENT"):
+            m = re.search(r"t=(\d+)", line)
+            if m:
+                out["defect_times"].append(int(m.group(1)))
+            continue
+        if (
+            not line
+            or line.startswith("=")
+            or line.startswith("RUN STARTED")
+            or line.startswith("time |")
+        ):
+            continue
+        row = parse_row(line)
+        if row is None:
+            continue
+        for col, value in zip(columns, row):
+            col.append(value)
+
+    return out
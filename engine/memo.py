@@ -0,0 +1,92 @@
+# engine/memo.py
+
+
+class VersionedDict(dict):
+    """
+    dict that bumps its owner's version on every mutation.
+    Reads are plain dict reads.
+    """
+
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def __reduce__(self):
+        # unpickle without going through __setitem__: the owner's
+        # version and counters are restored with the owner itself
+        return _restore, (type(self), self.owner, dict(self))
+
+    def __setitem__(self, key, value):
+        self.owner.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.owner.version += 1
+        super().__delitem__(key)
+
+    def pop(self, *args):
+        self.owner.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.owner.version += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.owner.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.owner.version += 1
+        super().update(*args, **kwargs)
+
+    def clear(self):
+        self.owner.version += 1
+        super().clear()
+
+
+def _restore(cls, owner, items):
+    d = cls.__new__(cls)
+    d.owner = owner
+    dict.update(d, items)
+    return d
+
+
+class ObservableCache:
+    """
+    Observable values of one Hypergraph at its current version.
+    Keys are (observable name, parameters); every entry is dropped as
+    soon as the graph's version moves on.
+    """
+
+    def __init__(self, H):
+        self.H = H
+        self.version = None
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self):
+        if self.version != self.H.version:
+            self.values.clear()
+            self.version = self.H.version
+
+    def get(self, key, compute):
+        self._sync()
+        try:
+            value = self.values[key]
+        except KeyError:
+            self.misses += 1
+            value = self.values[key] = compute()
+            return value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Record a value computed elsewhere (e.g. by the engine) for the
+        current version.
+        """
+        self._sync()
+        self.values[key] = value
@@ -2,6 +2,11 @@
 
 import random
 import math
+import time
+from array import array
+
+from engine.causal import bit_positions
+from engine.distance import CSRGraph
 
 
 def average_coordination(H):
@@ -15,66 +20,282 @@ def causal_interval_size(H, u, v):
     """
     |I(u, v)| = |J+(u) ∩ J-(v)|
     """
-    future_u = H.causal_future(u)
-    past_v = H.causal_past(v)
-    return len(future_u.intersection(past_v))
+    return H.causal_interval_size(u, v)
 
 
-def myrheim_meyer_dimension(H, samples=200, min_interval=10):
+def _sample_interval_sizes(H, samples, min_interval):
     """
-    Myrheim–Meyer dimension estimator with interval filtering.
-    Only considers sufficiently large causal intervals.
+    Interval sizes of randomly drawn causally related pairs,
+    evaluated as one batch of bitset AND + popcount queries.
     """
+    vids = list(H.vertices)
+    causal = H.causal
 
-    vertices = list(H.vertices.values())
-    if len(vertices) < 2:
-        return None
+    pairs = []
+    for _ in range(samples):
+        u, v = random.sample(vids, 2)
+        if causal.related(u, v):
+            pairs.append((u, v))
 
-    sizes = []
+    return [I for I in causal.interval_sizes(pairs) if I >= min_interval]
+
+
+def _sample_related_intervals(H, samples, min_interval):
+    """
+    Importance sampler over causally related pairs: u uniform, then v
+    uniform in J+(u) − {u}. A pair is drawn with probability
+    1 / (N (|J+(u)| − 1)), so weighting it by |J+(u)| − 1 recovers the
+    uniform distribution over related pairs that the rejection sampler
+    targets. Returns (sizes, weights) for intervals ≥ min_interval.
+    """
+    vids = list(H.vertices)
+    causal = H.causal
 
+    pairs = []
+    weights = []
     for _ in range(samples):
-        u, v = random.sample(vertices, 2)
-        if H.is_causally_related(u, v):
-            I = causal_interval_size(H, u, v)
-            if I >= min_interval:
-                sizes.append(I)
+        u = random.choice(vids)
+        future = [x for x in causal.future_ids(u) if x != u]
+        if not future:
+            continue
+        pairs.append((u, random.choice(future)))
+        weights.append(len(future))
 
-    if not sizes:
-        return None
+    sizes = []
+    kept = []
+    for I, w in zip(causal.interval_sizes(pairs), weights):
+        if I >= min_interval:
+            sizes.append(I)
+            kept.append(w)
+    return sizes, kept
 
-    avg_I = sum(sizes) / len(sizes)
-    N = len(H.vertices)
 
+def _dimension_from_mean(N, avg_I):
     if avg_I <= 1:
         return None
-
     try:
         return 2 * math.log(N) / math.log(avg_I)
     except (ValueError, ZeroDivisionError):
         return None
 
+
+def myrheim_meyer_dimension(H, samples=200, min_interval=10, sampler="uniform"):
+    """
+    Myrheim–Meyer dimension estimator with interval filtering.
+    Only considers sufficiently large causal intervals.
+
+    sampler="uniform" draws vertex pairs and discards unrelated ones;
+    sampler="related" draws only related pairs and reweights them, so
+    every sample counts in sparse causal sets.
+    """
+
+    if len(H.vertices) < 2:
+        return None
+
+    if sampler == "related":
+        sizes, weights = _sample_related_intervals(H, samples, min_interval)
+    else:
+        sizes = _sample_interval_sizes(H, samples, min_interval)
+        weights = [1] * len(sizes)
+
+    if not sizes:
+        return None
+
+    avg_I = sum(w * I for w, I in zip(weights, sizes)) / sum(weights)
+    N = len(H.vertices)
+
+    return _dimension_from_mean(N, avg_I)
+
+
+def adaptive_myrheim_meyer_dimension(H, tol=0.05, min_interval=10,
+                                     batch=200, time_budget=5.0,
+                                     max_empty_batches=3):
+    """
+    Myrheim–Meyer dimension from the related-pair sampler, sampled in
+    batches until the 95% confidence half-width of the dimension drops
+    below tol, time_budget seconds have passed, or max_empty_batches
+    batches in a row found no interval of min_interval (then, with no
+    data at all, the dimension is None).
+    Returns (dimension, half_width, samples_used).
+    """
+    N = len(H.vertices)
+    if N < 2:
+        return None, None, 0
+
+    sizes, weights = [], []
+    drawn = 0
+    t0 = time.perf_counter()
+    dim, half = None, None
+    empty = 0
+
+    while True:
+        s, w = _sample_related_intervals(H, batch, min_interval)
+        sizes += s
+        weights += w
+        drawn += batch
+
+        empty = 0 if s else empty + 1
+        if empty >= max_empty_batches:
+            break
+
+        if len(sizes) >= 2:
+            W = sum(weights)
+            mu = sum(wi * I for wi, I in zip(weights, sizes)) / W
+            dim = _dimension_from_mean(N, mu)
+            if dim is not None:
+                # self-normalised IS variance, propagated by the delta method
+                var_mu = sum(
+                    (wi * (I - mu)) ** 2 for wi, I in zip(weights, sizes)
+                ) / W ** 2
+                slope = 2 * math.log(N) / (mu * math.log(mu) ** 2)
+                half = 1.96 * slope * math.sqrt(var_mu)
+                if half < tol:
+                    break
+
+        if time.perf_counter() - t0 > time_budget:
+            break
+
+    return dim, half, drawn
+
 def average_large_interval(H, samples=50, min_interval=20):
     """
     Measure average size of large causal intervals.
     Returns 0 if none exist.
     """
-    vertices = list(H.vertices.values())
-    if len(vertices) < 2:
+    if len(H.vertices) < 2:
         return 0.0
 
-    sizes = []
-    for _ in range(samples):
-        u, v = random.sample(vertices, 2)
-        if H.is_causally_related(u, v):
-            I = causal_interval_size(H, u, v)
-            if I >= min_interval:
-                sizes.append(I)
+    sizes = _sample_interval_sizes(H, samples, min_interval)
 
     if not sizes:
         return 0.0
 
     return sum(sizes) / len(sizes)
 
+def ordering_fraction_dimension(r, lo=1.0, hi=20.0):
+    """
+    Invert the Minkowski ordering fraction
+    r(d) = Γ(d+1) Γ(d/2) / (2 Γ(3d/2)); r(1) = 1, r(2) = 1/2, r(4) = 1/10.
+    """
+    if r is None or r <= 0:
+        return None
+
+    def f(d):
+        return math.exp(
+            math.lgamma(d + 1) + math.lgamma(d / 2)
+            - math.lgamma(3 * d / 2) - math.log(2)
+        )
+
+    if r >= f(lo):
+        return lo
+    if r <= f(hi):
+        return hi
+    for _ in range(60):
+        mid = 0.5 * (lo + hi)
+        if f(mid) > r:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def _topological_order(vertices, stored):
+    indeg = {v.id: len(stored[v.id]) for v in vertices}
+    children = {v.id: [] for v in vertices}
+    for v in vertices:
+        for u in stored[v.id]:
+            children[u].append(v)
+    ready = [v for v in vertices if indeg[v.id] == 0]
+    order = []
+    while ready:
+        v = ready.pop()
+        order.append(v)
+        for w in children[v.id]:
+            indeg[w.id] -= 1
+            if indeg[w.id] == 0:
+                ready.append(w)
+    if len(order) < len(vertices):
+        raise ValueError("causal relation has a cycle")
+    return order
+
+
+def exact_ordering_fraction(H, chunk=4096, intervals=False):
+    """
+    Exact Myrheim–Meyer ordering fraction from the full causal relation.
+
+    Vertices are taken in topological order by depth and each one's
+    ancestor set is built as a packed bit row (OR of its predecessors'
+    rows), so the transitive closure costs word-level operations only.
+    Columns are processed chunk vertices at a time, keeping memory at
+    about N * chunk / 8 bytes.
+
+    intervals=True also returns the distribution {|I(u, v)|: count}
+    over all related pairs; that needs full ancestor and descendant
+    rows (about N² / 4 bytes), so use it on moderate universes.
+    """
+    order = sorted(H.vertices.values(), key=lambda v: (v.depth, v.id))
+    N = len(order)
+    if N < 2:
+        return None
+
+    causal = H.causal
+    stored = {
+        v.id: [u for u in causal.stored_past_ids(v.id) if u in H.vertices]
+        for v in order
+    }
+    pos = {v.id: i for i, v in enumerate(order)}
+    if any(pos[u] >= pos[v.id] for v in order for u in stored[v.id]):
+        # depth lags behind a relation (e.g. a forced bridge): Kahn order
+        order = _topological_order(order, stored)
+        pos = {v.id: i for i, v in enumerate(order)}
+    preds = [[pos[u] for u in stored[v.id]] for v in order]
+
+    relations = 0
+    for c0 in range(0, N, chunk):
+        c1 = min(c0 + chunk, N)
+        rows = [0] * N
+        for i in range(N):
+            row = 1 << (i - c0) if c0 <= i < c1 else 0
+            for p in preds[i]:
+                row |= rows[p]
+            rows[i] = row
+            relations += row.bit_count()
+        # reflexive bits of this chunk
+        relations -= c1 - c0
+
+    pairs = N * (N - 1) // 2
+    r = relations / pairs
+    result = {
+        "N": N,
+        "relations": relations,
+        "ordering_fraction": r,
+        "dimension": ordering_fraction_dimension(r),
+        "interval_sizes": None,
+    }
+
+    if intervals:
+        anc = [0] * N
+        for i in range(N):
+            row = 1 << i
+            for p in preds[i]:
+                row |= anc[p]
+            anc[i] = row
+        desc = [1 << i for i in range(N)]
+        for i in range(N - 1, -1, -1):
+            for p in preds[i]:
+                desc[p] |= desc[i]
+
+        hist = {}
+        for j in range(N):
+            a = anc[j]
+            for i in bit_positions(a & ~(1 << j)):
+                size = (a & desc[i]).bit_count()
+                hist[size] = hist.get(size, 0) + 1
+        result["interval_sizes"] = hist
+
+    return result
+
+
 def adjacency_overlap(H_before, H_after):
     """
     Fraction of hyperedges that persist after a rewrite.
@@ -105,11 +326,7 @@ def worldline_interaction_graph(H, fraction=0.6):
     """
     from collections import defaultdict
 
-    max_depth = H.max_chain_length()
-    cutoff = int(fraction * max_depth)
-
-    worldlines = [v for v in H.vertices.values() if v.depth >= cutoff]
-    wl_ids = {v.id for v in worldlines}
+    wl_ids = H.worldline_ids(fraction)
 
     interactions = defaultdict(set)
 
@@ -122,23 +339,72 @@ def worldline_interaction_graph(H, fraction=0.6):
 
     return interactions
 
-def count_triangles(interactions):
+def triangle_census(interactions, listing=True):
     """
-    Count triangles in an undirected interaction graph.
-    interactions: dict {node_id: set(neighbors)}
+    Triangles of an undirected interaction graph.
+    interactions: dict {node_id: set(neighbors)}, symmetric and without
+    self-loops (as worldline_interaction_graph builds it)
+
+    Each edge u < v is visited once and intersects the two neighbour
+    sets; set intersection walks the smaller set, so an edge costs
+    min(deg u, deg v) and the whole census O(E sqrt(E)) even with hubs,
+    close to O(E) on sparse graphs. Counting only needs the sizes of
+    the intersections (each triangle is seen from its three edges);
+    listing keeps the common neighbours w > v.
+
+    Returns a dict with
+        count:     number of triangles
+        ids:       node ids, aligned with per_node
+        per_node:  array('q') of triangles through each node
+        triangles: array('q') of node ids, three per triangle
+    per_node / triangles are only filled when listing=True.
     """
-    triangles = 0
+    empty = frozenset()
+    ids = list(interactions)
+
+    if not listing:
+        seen = 0
+        for u, nbrs_u in interactions.items():
+            for v in nbrs_u:
+                if v > u:
+                    seen += len(nbrs_u & interactions.get(v, empty))
+        return {
+            "count": seen // 3,
+            "ids": ids,
+            "per_node": None,
+            "triangles": None,
+        }
+
+    index = {u: i for i, u in enumerate(ids)}
+    per_node = array("q", bytes(8 * len(ids)))
+    triangles = array("q")
+    count = 0
     for u, nbrs_u in interactions.items():
         for v in nbrs_u:
             if v <= u:
                 continue
-            nbrs_v = interactions.get(v, set())
-            # common neighbors w form triangles u-v-w
-            common = nbrs_u & nbrs_v
-            for w in common:
+            for w in nbrs_u & interactions.get(v, empty):
                 if w > v:
-                    triangles += 1
-    return triangles
+                    count += 1
+                    per_node[index[u]] += 1
+                    per_node[index[v]] += 1
+                    per_node[index[w]] += 1
+                    triangles.extend((u, v, w))
+
+    return {
+        "count": count,
+        "ids": ids,
+        "per_node": per_node,
+        "triangles": triangles,
+    }
+
+
+def count_triangles(interactions):
+    """
+    Count triangles in an undirected interaction graph.
+    interactions: dict {node_id: set(neighbors)}
+    """
+    return triangle_census(interactions, listing=False)["count"]
 
 
 def closure_density(interactions):
@@ -198,32 +464,80 @@ def coarse_grain_interactions(H, interactions, scale=2):
     return coarse_interactions, coarse_depths
 
 
-def hierarchical_closure(H, interactions, scales=(2, 4, 8)):
+def coarse_grain_pyramid(H, interactions, scales=(2, 4, 8, 16),
+                         depths=True):
     """
-    Measure stability of closure under coarse-graining.
-    RG-aware: unpacks (interactions, depths) tuples.
+    All coarse-graining levels of an interaction graph in one pass.
+
+    Node i (in key order) belongs to block i // (s1 * ... * sk) at level
+    k, so each level is an integer relabelling of the previous level's
+    edge list followed by dedup; no per-level dicts of block members
+    are rebuilt. Levels match repeated coarse_grain_interactions calls,
+    including its depth rule (members looked up in H.vertices by id).
+
+    Returns a list of {scale, interactions, depths, psi} per level;
+    depths is None when depths=False.
     """
-    from engine.observables import coarse_grain_interactions, closure_density
+    nodes = list(interactions.keys())
+    pos = {u: i for i, u in enumerate(nodes)}
+
+    pairs = set()
+    for u, nbrs in interactions.items():
+        i = pos[u]
+        for v in nbrs:
+            j = pos.get(v)
+            if j is not None and j != i:
+                pairs.add((i, j))
 
-    psi_vals = []
-    current = interactions
+    levels = []
+    members = nodes
+    count = len(nodes)
 
     for s in scales:
-        result = coarse_grain_interactions(H, current, scale=s)
+        nb = (count + s - 1) // s
 
-        # RG-aware unpacking
-        if isinstance(result, tuple):
-            coarse_inter, _ = result
-        else:
-            coarse_inter = result
+        level_depths = None
+        if depths:
+            level_depths = {}
+            for b in range(nb):
+                ds = [
+                    H.vertices[u].depth
+                    for u in members[b * s:(b + 1) * s]
+                    if u in H.vertices
+                ]
+                level_depths[b] = sum(ds) / len(ds) if ds else 0.0
+
+        pairs = {
+            (a // s, b // s) for a, b in pairs
+            if a // s != b // s
+        }
+        coarse = {b: set() for b in range(nb)}
+        for a, b in pairs:
+            coarse[a].add(b)
+
+        levels.append({
+            "scale": s,
+            "interactions": coarse,
+            "depths": level_depths,
+            "psi": closure_density(coarse),
+        })
+        members = range(nb)
+        count = nb
+
+    return levels
 
-        psi_vals.append(closure_density(coarse_inter))
-        current = coarse_inter
 
-    if not psi_vals:
+def hierarchical_closure(H, interactions, scales=(2, 4, 8)):
+    """
+    Measure stability of closure under coarse-graining.
+    Ω = min Ψ over the coarse-graining pyramid.
+    """
+    levels = coarse_grain_pyramid(H, interactions, scales, depths=False)
+    if not levels:
         return 0.0
 
-    return min(psi_vals)
+    return min(level["psi"] for level in levels)
+
 def loop_mismatch_weights(interactions, depths, beta=0.05):
     """
     Protected metric mismatch: degree mismatch × time variance.
@@ -235,28 +549,23 @@ def loop_mismatch_weights(interactions, depths, beta=0.05):
     avg_d = sum(degrees.values()) / len(degrees)
     weights = []
 
-    for u, nbrs_u in interactions.items():
-        for v in nbrs_u:
-            if v <= u:
-                continue
-            nbrs_v = interactions.get(v, set())
-            common = nbrs_u & nbrs_v
-            for w in common:
-                if w > v:
-                    du, dv, dw = degrees[u], degrees[v], degrees[w]
-                    base = abs((du + dv + dw) - 3 * avg_d)
+    tri = triangle_census(interactions)["triangles"]
+    for k in range(0, len(tri), 3):
+        u, v, w = tri[k], tri[k + 1], tri[k + 2]
+        du, dv, dw = degrees[u], degrees[v], degrees[w]
+        base = abs((du + dv + dw) - 3 * avg_d)
 
-                    tu = depths.get(u, 0.0)
-                    tv = depths.get(v, 0.0)
-                    tw = depths.get(w, 0.0)
+        tu = depths.get(u, 0.0)
+        tv = depths.get(v, 0.0)
+        tw = depths.get(w, 0.0)
 
-                    mean_t = (tu + tv + tw) / 3
-                    var_t = ((tu - mean_t)**2 +
-                             (tv - mean_t)**2 +
-                             (tw - mean_t)**2) / 3
+        mean_t = (tu + tv + tw) / 3
+        var_t = ((tu - mean_t)**2 +
+                 (tv - mean_t)**2 +
+                 (tw - mean_t)**2) / 3
 
-                    theta = base * (1 + beta * var_t)
-                    weights.append(theta)
+        theta = base * (1 + beta * var_t)
+        weights.append(theta)
 
     return weights
 
@@ -274,23 +583,21 @@ def renormalized_distance_scales(H, interactions, depths,
     """
     Compute protected emergent distance scale under coarse-graining.
     """
-    results = {}
-    current_inter = interactions
-    current_depths = depths
-
-    for s in scales:
-        coarse_inter, coarse_depths = coarse_grain_interactions(
-            H, current_inter, scale=s
+    levels = coarse_grain_pyramid(H, interactions, scales)
+    return {
+        level["scale"]: emergent_distance_scale(
+            level["interactions"], level["depths"], beta
         )
-        results[s] = emergent_distance_scale(
-            coarse_inter, coarse_depths, beta
-        )
-        current_inter = coarse_inter
-        current_depths = coarse_depths
-
-    return results
+        for level in levels
+    }
  
 def label_frustration(H):
+    """
+    Number of hyperedges with mixed vertex labels.
+    Hypergraph keeps this count as edges come and go.
+    """
+    if hasattr(H, "mixed_edges"):
+        return H.mixed_edges
     mismatches = 0
     for edge in H.hyperedges.values():
         labels = {v.label for v in edge.vertices}
@@ -348,4 +655,255 @@ def local_omega(H, inter, v):
         if u in inter and v in inter[u]:
             closed += 1
 
-    return closed / max(len(neighbors), 1)
\ No newline at end of file
+    return closed / max(len(neighbors), 1)
+
+
+class LocalOmegaField:
+    """
+    local_omega for every interaction-graph vertex at once.
+
+    Each vertex keeps two counters, its degree and the number of its
+    neighbours that list it back, so the field is closed / degree.
+    The full build is one pass over CSR adjacency; update() only
+    recounts the vertices a rewrite can have changed.
+    """
+
+    def __init__(self, inter):
+        csr = CSRGraph(inter)
+        n = len(csr)
+        indptr, indices = csr.indptr, csr.indices
+
+        arcs = set()
+        for i in range(n):
+            for k in range(indptr[i], indptr[i + 1]):
+                arcs.add(i * n + indices[k])
+
+        degree = array("l", bytes(8 * n))
+        closed = array("l", bytes(8 * n))
+        for i in range(n):
+            lo, hi = indptr[i], indptr[i + 1]
+            degree[i] = hi - lo
+            closed[i] = sum(
+                1 for k in range(lo, hi) if indices[k] * n + i in arcs
+            )
+
+        self.ids = list(csr.ids)
+        self.index = dict(csr.index)
+        self.degree = degree
+        self.closed = closed
+        self.inter = inter
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, vid):
+        i = self.index.get(vid)
+        if i is None or not self.degree[i]:
+            return 0.0
+        return self.closed[i] / self.degree[i]
+
+    def values(self):
+        """
+        array('d') aligned with self.ids.
+        """
+        return array("d", (
+            c / d if d else 0.0 for c, d in zip(self.closed, self.degree)
+        ))
+
+    def mean(self, vids):
+        """
+        Mean local Ω over the given vertices (0.0 if none are present).
+        """
+        vals = [self[v] for v in vids if v in self.index]
+        return sum(vals) / len(vals) if vals else 0.0
+
+    def update(self, inter, touched):
+        """
+        Move to a new interaction graph. touched must contain every
+        vertex whose neighbour set changed; their old and new
+        neighbours are recounted with them. Returns the recounted ids.
+        """
+        old = self.inter
+        affected = set(touched)
+        for v in touched:
+            affected.update(old.get(v, ()))
+            affected.update(inter.get(v, ()))
+
+        for v in affected:
+            nbrs = inter.get(v, ())
+            i = self.index.get(v)
+            if i is None:
+                if not nbrs:
+                    continue
+                i = self.index[v] = len(self.ids)
+                self.ids.append(v)
+                self.degree.append(0)
+                self.closed.append(0)
+            self.degree[i] = len(nbrs)
+            self.closed[i] = sum(
+                1 for u in nbrs if v in inter.get(u, ())
+            )
+
+        self.inter = inter
+        return affected
+
+
+def local_clustering(H, inter, v):
+    """
+    Local clustering of v: the fraction of pairs of v's interaction
+    partners that also interact with each other (closed triangles at v
+    over C(deg, 2)). inter must be symmetric, as
+    worldline_interaction_graph builds it. Unlike local_omega, it
+    varies across the (symmetric) worldline graph.
+    """
+    neighbors = inter.get(v, ())
+    d = len(neighbors)
+    if d < 2:
+        return 0.0
+    return 2 * _closed_pairs(inter, neighbors) / (d * (d - 1))
+
+
+def _closed_pairs(inter, neighbors):
+    """
+    Number of interacting pairs among neighbors.
+    """
+    nbrs = set(neighbors)
+    return sum(len(nbrs.intersection(inter.get(u, ()))) for u in nbrs) // 2
+
+
+class LocalClusteringField:
+    """
+    local_clustering for every interaction-graph vertex at once.
+
+    Each vertex keeps two counters, its degree and the number of closed
+    triangles through it, so the field is triangles / C(degree, 2).
+    update() only recounts the vertices a rewrite can have changed: a
+    triangle at w changes only through an edge with an endpoint in the
+    touched set, and w is then that endpoint or one of its old or new
+    neighbours.
+    """
+
+    def __init__(self, inter):
+        csr = CSRGraph(inter)
+        n = len(csr)
+        degree = array("l", bytes(8 * n))
+        triangles = array("l", bytes(8 * n))
+        for i, v in enumerate(csr.ids):
+            nbrs = inter.get(v, ())
+            degree[i] = len(nbrs)
+            triangles[i] = _closed_pairs(inter, nbrs)
+
+        self.ids = list(csr.ids)
+        self.index = dict(csr.index)
+        self.degree = degree
+        self.triangles = triangles
+        self.inter = inter
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, vid):
+        """
+        Whether vid is currently in the interaction graph.
+        """
+        i = self.index.get(vid)
+        return i is not None and self.degree[i] > 0
+
+    def __getitem__(self, vid):
+        i = self.index.get(vid)
+        if i is None:
+            return 0.0
+        return _clustering(self.triangles[i], self.degree[i])
+
+    def values(self):
+        """
+        array('d') aligned with self.ids.
+        """
+        return array("d", (
+            _clustering(t, d) for t, d in zip(self.triangles, self.degree)
+        ))
+
+    def mean(self, vids):
+        """
+        Mean local clustering over the given vertices (0.0 if none are present).
+        """
+        vals = [self[v] for v in vids if v in self]
+        return sum(vals) / len(vals) if vals else 0.0
+
+    def update(self, inter, touched):
+        """
+        Move to a new interaction graph. touched must contain every
+        vertex whose neighbour set changed; their old and new
+        neighbours are recounted with them. Returns the recounted ids.
+        """
+        old = self.inter
+        affected = set(touched)
+        for v in touched:
+            affected.update(old.get(v, ()))
+            affected.update(inter.get(v, ()))
+
+        for v in affected:
+            nbrs = inter.get(v, ())
+            i = self.index.get(v)
+            if i is None:
+                if not nbrs:
+                    continue
+                i = self.index[v] = len(self.ids)
+                self.ids.append(v)
+                self.degree.append(0)
+                self.triangles.append(0)
+            self.degree[i] = len(nbrs)
+            self.triangles[i] = _closed_pairs(inter, nbrs)
+
+        self.inter = inter
+        return affected
+
+
+def _clustering(triangles, degree):
+    if degree < 2:
+        return 0.0
+    return 2 * triangles / (degree * (degree - 1))
+
+
+# ------------------------------------------------------------
+# Version-memoized observables
+# ------------------------------------------------------------
+
+def _observed_interaction_graph(H, fraction=0.6):
+    return worldline_interaction_graph(H, fraction)
+
+
+def _observed_omega(H, scales=(2, 4, 8)):
+    return hierarchical_closure(H, observe(H, "interaction_graph"), scales)
+
+
+def _observed_closure_density(H):
+    return closure_density(observe(H, "interaction_graph"))
+
+
+def _observed_interaction_concentration(H):
+    return interaction_concentration(observe(H, "interaction_graph"))
+
+
+OBSERVABLES = {
+    "interaction_graph": _observed_interaction_graph,
+    "omega": _observed_omega,
+    "closure_density": _observed_closure_density,
+    "interaction_concentration": _observed_interaction_concentration,
+    "label_frustration": label_frustration,
+    "defect_density": defect_density,
+}
+
+
+def observe(H, name, *params):
+    """
+    OBSERVABLES[name](H, *params), memoized on H.version.
+
+    Values are shared until the next mutation of H, including the
+    interaction graph and Ω the engine already computed for the
+    current state. Treat returned objects as read-only.
+    """
+    memo = getattr(H, "memo", None)
+    if memo is None:
+        return OBSERVABLES[name](H, *params)
+    return memo.get((name, params), lambda: OBSERVABLES[name](H, *params))
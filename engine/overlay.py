@@ -0,0 +1,109 @@
+# engine/overlay.py
+
+from collections.abc import Mapping
+
+from engine.hypergraph import is_mixed
+
+
+class _OverlayMapping(Mapping):
+    """
+    base ∪ added − removed, iterated in the order the mutated dict would have.
+    """
+
+    def __init__(self, base, added=None, removed=()):
+        self.base = base
+        self.added = added or {}
+        self.removed = set(removed)
+
+    def __getitem__(self, key):
+        if key in self.added:
+            return self.added[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __contains__(self, key):
+        if key in self.added:
+            return True
+        return key not in self.removed and key in self.base
+
+    def __iter__(self):
+        removed = self.removed
+        for key in self.base:
+            if key not in removed:
+                yield key
+        yield from self.added
+
+    def __len__(self):
+        return len(self.base) - len(self.removed) + len(self.added)
+
+    def values(self):
+        removed = self.removed
+        for key, value in self.base.items():
+            if key not in removed:
+                yield value
+        yield from self.added.values()
+
+    def items(self):
+        removed = self.removed
+        for item in self.base.items():
+            if item[0] not in removed:
+                yield item
+        yield from self.added.items()
+
+
+class OverlayView:
+    """
+    Read-only view of a Hypergraph with a proposed rewrite applied.
+    Exposes the vertices/hyperedges/max_chain_length interface used by
+    the observables, so ΔΩ can be scored without mutating H.
+    """
+
+    def __init__(self, H, delta):
+        self.H = H
+        self.delta = delta
+
+        if delta["kind"] == "create":
+            v = delta["new_vertex"]
+            e = delta["new_edge"]
+            self.vertices = _OverlayMapping(H.vertices, {v.id: v})
+            self.hyperedges = _OverlayMapping(H.hyperedges, {e.id: e})
+        else:
+            self.vertices = _OverlayMapping(
+                H.vertices, removed=(delta["v_remove"].id,)
+            )
+            self.hyperedges = _OverlayMapping(
+                H.hyperedges, removed=delta["removed_edges"]
+            )
+
+    @property
+    def mixed_edges(self):
+        if self.delta["kind"] == "create":
+            return self.H.mixed_edges + is_mixed(self.delta["new_edge"])
+        return self.H.mixed_edges - sum(
+            is_mixed(self.H.hyperedges[eid])
+            for eid in self.delta["removed_edges"]
+        )
+
+    def max_chain_length(self):
+        if self.delta["kind"] == "create":
+            return max(
+                self.H.max_chain_length(), self.delta["new_vertex"].depth
+            )
+        base = self.H.max_chain_length()
+        depth = self.delta["v_remove"].depth
+        if depth < base or len(self.H.depth_buckets[depth]) > 1:
+            return base
+        lower = [d for d in self.H.depth_buckets if d < depth]
+        return max(lower) if lower else 0
+
+    def worldline_ids(self, fraction=0.6):
+        cutoff = int(fraction * self.max_chain_length())
+        ids = self.H.vertex_ids_at_depth(cutoff)
+        if self.delta["kind"] == "create":
+            v = self.delta["new_vertex"]
+            if v.depth >= cutoff:
+                ids.add(v.id)
+        else:
+            ids.discard(self.delta["v_remove"].id)
+        return ids
@@ -3,30 +3,96 @@
 import random
 import time
 import math
+import pickle
 from collections import defaultdict
-
-from engine.rules import edge_creation_rule, vertex_fusion_rule
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.rules import (
+    edge_creation_rule,
+    propose_edge_creation,
+    propose_vertex_fusion,
+    apply_rewrite,
+    rewrite_summary,
+    rewrite_class,
+)
+from engine.overlay import OverlayView
 from engine.observables import (
     worldline_interaction_graph,
     interaction_concentration,
     closure_density,
     hierarchical_closure,
+    local_omega,
+    LocalOmegaField,
+    LocalClusteringField,
 )
 from engine.physics_params import GAMMA_DEFECT
+from engine.series import StepSeries
+from engine.defects import DefectDetector
+from engine.activity import ParticleActivityTracker
+from engine.runlog import DEBUG, INFO
+from engine import distance
 
 
 # --------------------------------------------------
-# Local Ω proxy
+# Proposal scoring (also run in batch worker processes)
 # --------------------------------------------------
-def local_omega(H, inter, v):
-    neighbors = inter.get(v, [])
-    if not neighbors:
-        return 0.0
-    closed = 0
-    for u in neighbors:
-        if u in inter and v in inter[u]:
-            closed += 1
-    return closed / max(len(neighbors), 1)
+def acceptance_probability(delta_omega, V, epsilon, gamma_defect=None):
+    if gamma_defect is None:
+        gamma_defect = GAMMA_DEFECT
+    accept_prob = 1.0
+    if abs(delta_omega) > epsilon:
+        gamma = gamma_defect * math.exp(-V / 800)
+        accept_prob *= math.exp(-gamma * abs(delta_omega))
+    return accept_prob
+
+
+def score_delta(H, delta, omega_before, xi, xi_threshold, epsilon,
+                gamma_defect=None):
+    """
+    Evaluate a proposed delta against base + overlay views of H
+    (see RewriteEngine.score_proposal).
+    """
+    view = OverlayView(H, delta)
+    inter_after = worldline_interaction_graph(view)
+    omega_after = hierarchical_closure(view, inter_after)
+    delta_omega = omega_after - omega_before
+
+    summary = rewrite_summary(delta)
+    parents = [
+        v for v in summary["added_vertices"] + summary["removed_vertices"]
+        if v in xi and xi[v] > xi_threshold
+    ]
+    inherited = (
+        0.5 * sum(xi[p] for p in parents) / len(parents)
+        if parents else 0.0
+    )
+
+    return {
+        "omega": omega_after,
+        "delta_omega": delta_omega,
+        "accept_prob": acceptance_probability(
+            delta_omega, len(view.vertices), epsilon, gamma_defect
+        ),
+        "inter": inter_after,
+        "xi_inherited": {
+            vid: inherited for vid in summary["added_vertices"]
+        } if parents else {},
+    }
+
+
+def _score_chunk(job):
+    """
+    Worker: score candidates[i] for i in indices on an unpickled
+    snapshot (H and the candidates are pickled together, so the
+    candidates' vertices are the snapshot's).
+    """
+    snapshot, indices, omega_before, xi_threshold, epsilon, gamma = job
+    H, candidates, xi = pickle.loads(snapshot)
+    return [
+        score_delta(H, candidates[i], omega_before, xi, xi_threshold,
+                    epsilon, gamma)
+        for i in indices
+    ]
 
 
 # --------------------------------------------------
@@ -52,6 +118,13 @@ class RewriteEngine:
         XI_COUPLING=0.6,
         verbose=True,
         print_interval=50,
+        speculative=False,
+        rejection_free=False,
+        max_attempts=100000,
+        track_local_omega=False,
+        clustering_log_interval=None,
+        record_series=True,
+        logger=None,
     ):
         self.H = hypergraph
         self.p_create = p_create
@@ -74,12 +147,18 @@ class RewriteEngine:
         self.xi_distance_memory = {}
         self.DISTANCE_MEMORY_DECAY = 0.9
         self.geometry_stride = 5
-        
+        self._csr_cache = None
+
 
         # logs
         self.rewrite_history = []
         self.xi_current_log = []
         self.defect_log = []
+        self.defect_detector = DefectDetector(
+            self.defect_log, omega_threshold=epsilon_label_violation
+        )
+        self.particle_activity = {}
+        self.particle_tracker = None
 
         # rewrite bookkeeping
         self.last_rewrite = None
@@ -87,6 +166,38 @@ class RewriteEngine:
         self.time = 0
         self.verbose = verbose
         self.print_interval = print_interval
+        self.logger = logger  # RunLogger; plain print() when None
+
+        # score proposals on an overlay instead of mutate/undo
+        self.speculative = speculative
+
+        # worker processes of step_batch(workers=...)
+        self._pool = None
+        self._pool_workers = None
+
+        # rejection-free: one accepted event per step, clock advanced
+        # by the attempts it took; last_event counts those attempts and
+        # the overlay evaluations they needed
+        self.rejection_free = rejection_free
+        self.max_attempts = max_attempts
+        self.last_event = None
+
+        # per-vertex local Ω, updated around each accepted rewrite
+        self.track_local_omega = track_local_omega
+        self.local_omega_field = None
+        self.local_clustering_field = None
+        self.local_omega_log = []
+        # opt-in per-vertex local clustering, logged every
+        # clustering_log_interval steps as the values changed since
+        # the previous record (replayed by build_local_omega_channels)
+        self.clustering_log_interval = clustering_log_interval
+        self.local_clustering_log = []
+        self._clustering_dirty = set()
+        self._clustering_rebuilt = False
+        self._wl_cutoff = 0
+
+        # per-step Ω, |V|, |E|, <k>, L, acceptance
+        self.series = StepSeries() if record_series else None
 
         if seed is not None:
             random.seed(seed)
@@ -95,6 +206,17 @@ class RewriteEngine:
     # Main step
     # --------------------------------------------------
     def step(self):
+        omega_before, q_before = self.current_omega(), self.H.mixed_edges
+        if self.rejection_free:
+            accepted = self._rejection_free_step()
+        else:
+            accepted = self._metropolis_step()
+        self._detect_defect(omega_before, q_before, accepted)
+        self._track_activity(accepted)
+        self._record_series(int(accepted))
+        return accepted
+
+    def _metropolis_step(self):
         self.time += 1
         _t0 = time.perf_counter()
         self.prev_xi = dict(self.xi)
@@ -102,106 +224,248 @@ class RewriteEngine:
         # ---------------------------------
         # Reuse cached state
         # ---------------------------------
-        if hasattr(self, "_cached_inter"):
-            inter_before = self._cached_inter
-            omega_before = self._cached_omega
-        else:
-            inter_before = worldline_interaction_graph(self.H)
-            omega_before = hierarchical_closure(self.H, inter_before)
+        omega_before = self.current_omega()
+        inter_before = self._cached_inter
 
         # ---------------------------------
         # Propose rewrite
         # ---------------------------------
-        undo = self._propose_rewrite()
-        if undo is None:
-            return False
-
-        self.last_rewrite = {
-            "added_vertices": undo.get("added_vertices", []),
-            "removed_vertices": (
-                [undo["removed_vertex"].id]
-                if "removed_vertex" in undo else []
-            ),
-            "added_edges": undo.get("added_edges", []),
-        }
+        if self.speculative:
+            # Score base + overlay; H is only touched on acceptance
+            delta = self._propose_delta()
+            if delta is None:
+                return False
+            self.last_rewrite = rewrite_summary(delta)
+            score = self.score_proposal(delta, omega_before)
+            inter_after = score["inter"]
+            omega_after = score["omega"]
+            accept_prob = score["accept_prob"]
+        else:
+            delta = self._propose_delta()
+            if delta is None:
+                return False
+            undo = apply_rewrite(self.H, delta)
+            self.last_rewrite = rewrite_summary(delta)
 
-        # ---------------------------------
-        # Tentative interaction graph
-        # ---------------------------------
-        inter_after = worldline_interaction_graph(self.H)
-        omega_after = hierarchical_closure(self.H, inter_after)
-        delta_omega = omega_after - omega_before
+            # -----------------------------
+            # Tentative interaction graph
+            # -----------------------------
+            inter_after = worldline_interaction_graph(self.H)
+            omega_after = hierarchical_closure(self.H, inter_after)
+            accept_prob = self.acceptance_probability(
+                omega_after - omega_before, len(self.H.vertices)
+            )
 
         # ---------------------------------
         # Acceptance rule
         # ---------------------------------
-        accept_prob = 1.0
-        if abs(delta_omega) > self.epsilon_label_violation:
-            V = len(self.H.vertices)
-            gamma = GAMMA_DEFECT * math.exp(-V / 800)
-            accept_prob *= math.exp(-gamma * abs(delta_omega))
-
         accepted = random.random() <= accept_prob
 
         if not accepted:
-            self.undo_changes(undo)
+            if not self.speculative:
+                self.undo_changes(undo)
             self._cached_inter = inter_before
             self._cached_omega = omega_before
+            if self.speculative or "removed_vertex" not in undo:
+                # undoing a creation restores H exactly
+                self._publish_state()
             omega_print = omega_before
 
         else:
-            # Cache accepted state
-            self._cached_inter = inter_after
-            self._cached_omega = omega_after
+            if self.speculative:
+                undo = apply_rewrite(self.H, delta)
+            self._commit_accepted(
+                [undo], inter_after, omega_after,
+                geometry_due=self.time % self.geometry_stride == 0,
+            )
             omega_print = omega_after
 
-            # -----------------------------
-            # ξ inheritance
-            # -----------------------------
-            parents = [
-                v for v in self.touched_vertices()
-                if v in self.xi and self.xi[v] > self.xi_threshold
-            ]
-            for vid in self.last_rewrite["added_vertices"]:
-                if parents:
-                    inherited = sum(self.xi[p] for p in parents) / len(parents)
-                    self.xi[vid] = self.xi.get(vid, 0.0) + 0.5 * inherited
-
-            # -----------------------------
-            # ξ propagation
-            # -----------------------------
-            xi_clusters = self.xi_clusters(inter_after)
-            self._propagate_xi(inter_after, xi_clusters)
-            
-            geom_inter = self.full_interaction_graph()
-            # -----------------------------
-            # Geometry updates - matter defined
-            # -----------------------------
-            if self.time % self.geometry_stride == 0:
-                # ξ must exist to define geometry
-                xi_support = {
-                    v for v, x in self.xi.items()
-                    if x > self.xi_threshold and math.isfinite(x)
-                }
-                
-                if len(xi_support) >= 2:
-                    xi_geom_clusters = self.xi_clusters(geom_inter)
-                    if len(set(xi_geom_clusters.values())) >= 2:
-                        self._update_xi_distance_memory(geom_inter)
-            # -----------------------------
-            # Logs
-            # -----------------------------
-            self._record_rewrite(undo)
-            self._record_xi_current(geom_inter)
-
         # ---------------------------------
         # Timing + diagnostics
         # ---------------------------------
         self._last_step_time = time.perf_counter() - _t0
-        
-        if self.verbose and self.time % self.print_interval == 0:
+        self._report(omega_print, self.time % self.print_interval == 0)
+
+        return accepted
+
+    def run(self, steps):
+        """
+        Advance the universe by `steps` calls to step().
+        Returns the number of accepted rewrites.
+        """
+        accepted = 0
+        for _ in range(steps):
+            if self.step():
+                accepted += 1
+        return accepted
+
+    def _commit_accepted(self, undos, inter_after, omega_after, geometry_due):
+        # Cache accepted state
+        self._cached_inter = inter_after
+        self._cached_omega = omega_after
+        self._publish_state()
+        if self.track_local_omega:
+            self._update_local_omega(undos, inter_after)
+
+        # -----------------------------
+        # ξ inheritance
+        # -----------------------------
+        parents = [
+            v for v in self.touched_vertices()
+            if v in self.xi and self.xi[v] > self.xi_threshold
+        ]
+        for vid in self.last_rewrite["added_vertices"]:
+            if parents:
+                inherited = sum(self.xi[p] for p in parents) / len(parents)
+                self.xi[vid] = self.xi.get(vid, 0.0) + 0.5 * inherited
+
+        # -----------------------------
+        # ξ propagation
+        # -----------------------------
+        xi_clusters = self.xi_clusters(inter_after)
+        self._propagate_xi(inter_after, xi_clusters)
+
+        geom_inter = self.full_interaction_graph()
+        # -----------------------------
+        # Geometry updates - matter defined
+        # -----------------------------
+        if geometry_due:
+            # ξ must exist to define geometry
+            xi_support = {
+                v for v, x in self.xi.items()
+                if x > self.xi_threshold and math.isfinite(x)
+            }
+
+            if len(xi_support) >= 2:
+                xi_geom_clusters = self.xi_clusters(geom_inter)
+                if len(set(xi_geom_clusters.values())) >= 2:
+                    self._update_xi_distance_memory(geom_inter)
+        # -----------------------------
+        # Logs
+        # -----------------------------
+        for undo in undos:
+            self._record_rewrite(undo)
+        self._record_xi_current(geom_inter)
+
+    def _update_local_omega(self, undos, inter):
+        """
+        Recount local Ω and local clustering around the committed
+        rewrites and log their means over the rewrite site (vertices
+        of the added / removed edges).
+        """
+        site = self.touched_vertices()
+        for undo in undos:
+            for eid in undo.get("added_edges", []):
+                e = self.H.hyperedges.get(eid)
+                if e is not None:
+                    site.update(v.id for v in e.vertices)
+            for e in undo.get("removed_edges", {}).values():
+                site.update(v.id for v in e.vertices)
+
+        cutoff, entered, left = self.H.worldline_shift(self._wl_cutoff)
+        self._wl_cutoff = cutoff
+        touched = site | entered | left
+        if self.local_omega_field is None:
+            self.local_omega_field = LocalOmegaField(inter)
+            self.local_clustering_field = LocalClusteringField(inter)
+            self._clustering_rebuilt = True
+            self._clustering_dirty = set(self.local_clustering_field.ids)
+        else:
+            self.local_omega_field.update(inter, touched)
+            self._clustering_dirty |= self.local_clustering_field.update(
+                inter, touched
+            )
+
+        self.local_omega_log.append({
+            "time": self.time,
+            "local_omega": self.local_omega_field.mean(site),
+            "local_clustering": self.local_clustering_field.mean(site),
+        })
+        self._log_clustering()
+
+    def _log_clustering(self):
+        interval = self.clustering_log_interval
+        if not interval:
+            return
+        last = self.local_clustering_log[-1]["time"] \
+            if self.local_clustering_log else None
+        if last is not None and self.time // interval == last // interval:
+            return
+        field = self.local_clustering_field
+        self.local_clustering_log.append({
+            "time": self.time,
+            "rebuilt": self._clustering_rebuilt,
+            # None once a vertex has left the interaction graph
+            "values": [
+                [v, field[v] if v in field else None]
+                for v in sorted(self._clustering_dirty)
+            ],
+        })
+        self._clustering_dirty = set()
+        self._clustering_rebuilt = False
+
+    def _detect_defect(self, omega_before, q_before, accepted):
+        """
+        Feed the step's ΔΩ, ΔQ (label frustration) and ξ activity at
+        the rewrite site to the streaming defect detector, anchored at
+        the vertex the rewrite grew from (or fused into).
+        """
+        if not accepted:
+            return
+        site = self.touched_vertices()
+        omega = self.current_omega()
+        self.defect_detector.observe(
+            self.time,
+            omega,
+            omega - omega_before,
+            self.H.mixed_edges - q_before,
+            any(self.xi.get(v, 0.0) > self.xi_threshold for v in site),
+            self.last_rewrite.get("anchor"),
+        )
+
+    def track_particles(self, particles):
+        """
+        Count, in self.particle_activity, the accepted rewrites that
+        touch each particle's support.
+        """
+        self.particle_tracker = ParticleActivityTracker(
+            particles, self.particle_activity
+        )
+
+    def _track_activity(self, accepted):
+        if accepted and self.particle_tracker is not None:
+            self.particle_tracker.update(self.touched_vertices())
+
+    def _record_series(self, accepted):
+        if self.series is None:
+            return
+        H = self.H
+        self.series.record(
+            self.time,
+            self.current_omega(),
+            len(H.vertices),
+            len(H.hyperedges),
+            H.average_coordination(),
+            H.max_chain_length(),
+            accepted,
+        )
+
+    def _log_enabled(self, category, level=INFO):
+        if self.logger is None:
+            return True
+        return self.logger.enabled(category, level)
+
+    def _log(self, category, message, level=INFO):
+        if self.logger is None:
+            print(message)
+        else:
+            self.logger.log(category, message, level)
+
+    def _report(self, omega_print, due):
+        if self.verbose and due and self._log_enabled("engine"):
             xi_count = sum(1 for x in self.xi.values() if x > self.xi_threshold)
-            print(
+            self._log(
+                "engine",
                 f"[engine] t={self.time} "
                 f"step={self._last_step_time*1000:.2f}ms "
                 f"Ω={omega_print:.6f} "
@@ -209,26 +473,345 @@ class RewriteEngine:
                 f"geom_pairs={len(self.topo_distance_memory) + len(self.xi_distance_memory)}"
             )
 
+    # --------------------------------------------------
+    # Rejection-free step
+    # --------------------------------------------------
+    def _next_event(self, omega_before):
+        """
+        Draw Metropolis attempts until one is accepted.
+
+        Each attempt is the proposal _propose_delta makes, accepted
+        with its acceptance probability, so the event is drawn with
+        probability ∝ q·a over the true proposal distribution and the
+        number of attempts is exactly the geometric waiting time of the
+        current total rate. H does not change between attempts, so the
+        acceptance weight of each rewrite class (rewrite_class) is
+        scored once per event: repeated proposals of a class cost one
+        draw instead of an overlay evaluation. Returns (delta, score,
+        attempts); delta is None when max_attempts ran out.
+        """
+        weights = {}
+        self.last_event = {"attempts": 0, "evaluations": 0}
+        for attempts in range(1, self.max_attempts + 1):
+            self.last_event["attempts"] = attempts
+            delta = self._propose_delta()
+            if delta is None:
+                continue
+            cls = rewrite_class(delta)
+            score = None
+            if cls not in weights:
+                score = self.score_proposal(delta, omega_before)
+                weights[cls] = score["accept_prob"]
+                self.last_event["evaluations"] += 1
+            if random.random() <= weights[cls]:
+                if score is None:
+                    # the commit needs this delta's own interaction graph
+                    score = self.score_proposal(delta, omega_before)
+                    self.last_event["evaluations"] += 1
+                return delta, score, attempts
+        return None, None, self.max_attempts
+
+    def _rejection_free_step(self):
+        """
+        Advance to the next accepted rewrite. Rejected attempts never
+        mutate H, each rewrite class is scored at most once per event
+        (_next_event), and the per-step bookkeeping runs once per event
+        instead of once per attempt. With the same seed, the accepted
+        events and their times are those of the speculative Metropolis
+        engine.
+        """
+        t_prev = self.time
+        _t0 = time.perf_counter()
+        self.prev_xi = dict(self.xi)
+        omega_before = self.current_omega()
+
+        delta, score, attempts = self._next_event(omega_before)
+        self.time += attempts
+        if delta is None:
+            self._last_step_time = time.perf_counter() - _t0
+            return False
+
+        self.last_rewrite = rewrite_summary(delta)
+        undo = apply_rewrite(self.H, delta)
+        self._commit_accepted(
+            [undo], score["inter"], score["omega"],
+            geometry_due=(
+                self.time // self.geometry_stride
+                != t_prev // self.geometry_stride
+            ),
+        )
+
+        self._last_step_time = time.perf_counter() - _t0
+        self._report(
+            score["omega"],
+            self.time // self.print_interval != t_prev // self.print_interval,
+        )
+        return True
+
+    # --------------------------------------------------
+    # Batch step (causally independent generation)
+    # --------------------------------------------------
+    def step_batch(self, size=8, workers=None, check_serial=False):
+        """
+        Apply one generation of non-overlapping rewrites.
+
+        Up to `size` proposals are drawn that do not overlap: no
+        candidate writes what another one reads or writes (see
+        _footprint). All are scored against the same snapshot and the
+        accepted ones are committed together. Each candidate counts as
+        one attempt on the clock.
+
+        workers > 1 scores the candidates in that many worker
+        processes (kept until close()), on a pickled snapshot of H.
+        Scoring is pure Python, so threads would be held to one core
+        by the GIL; the snapshot costs about one scoring, so this pays
+        off for batches of several candidates per worker.
+
+        check_serial re-scores every candidate, in order, against the
+        state left by the candidates committed before it. The number of
+        candidates whose accept/reject decision would differ (same
+        uniform draw) goes to last_batch["serial_mismatches"], their
+        details to last_batch["mismatches"]. last_batch["footprints"]
+        holds the (reads, writes) of the committed rewrites.
+
+        Returns the number of accepted rewrites.
+        """
+        omega_before, q_before = self.current_omega(), self.H.mixed_edges
+        accepted = self._batch_step(size, workers, check_serial)
+        self._detect_defect(omega_before, q_before, accepted)
+        self._track_activity(accepted)
+        self._record_series(accepted)
         return accepted
-    
+
+    def _batch_step(self, size, workers, check_serial):
+        t_prev = self.time
+        _t0 = time.perf_counter()
+        self.prev_xi = dict(self.xi)
+        omega_before = self.current_omega()
+        inter_before = self._cached_inter
+
+        candidates = []
+        footprints = []
+        reads = set()
+        writes = set()
+        draws = 0
+        while len(candidates) < size and draws < 4 * size:
+            draws += 1
+            delta = self._propose_delta()
+            if delta is None:
+                self.time += 1
+                continue
+            r, w = self._footprint(delta, inter_before)
+            if w & (reads | writes) or r & writes:
+                continue
+            reads |= r
+            writes |= w
+            candidates.append(delta)
+            footprints.append((r, w))
+
+        if not candidates:
+            self._last_step_time = time.perf_counter() - _t0
+            return 0
+
+        if workers and workers > 1 and len(candidates) > 1:
+            scores = self._score_in_workers(candidates, omega_before, workers)
+        else:
+            scores = [self.score_proposal(d, omega_before) for d in candidates]
+
+        draws_u = [random.random() for _ in candidates]
+        self.time += len(candidates)
+
+        undos = []
+        summaries = []
+        accepted_scores = []
+        mismatches = []
+        omega_serial = omega_before
+        committed_footprints = []
+        for delta, score, u, fp in zip(candidates, scores, draws_u,
+                                       footprints):
+            accepted = u <= score["accept_prob"]
+
+            if check_serial:
+                serial = self.score_proposal(delta, omega_serial)
+                if (u <= serial["accept_prob"]) != accepted:
+                    mismatches.append({
+                        "summary": rewrite_summary(delta),
+                        "batch_accept_prob": score["accept_prob"],
+                        "serial_accept_prob": serial["accept_prob"],
+                    })
+
+            if accepted:
+                undos.append(apply_rewrite(self.H, delta))
+                summaries.append(rewrite_summary(delta))
+                committed_footprints.append(fp)
+                accepted_scores.append(score)
+                if check_serial:
+                    omega_serial = serial["omega"]
+
+        self.last_batch = {
+            "time": self.time,
+            "candidates": len(candidates),
+            "accepted": len(undos),
+            "footprints": committed_footprints,
+            "serial_mismatches": len(mismatches),
+            "mismatches": mismatches,
+        }
+
+        if not undos:
+            self._last_step_time = time.perf_counter() - _t0
+            return 0
+
+        self.last_rewrite = {
+            key: [x for summary in summaries for x in summary[key]]
+            for key in ("added_vertices", "removed_vertices", "added_edges")
+        }
+        self.last_rewrite["anchor"] = summaries[0]["anchor"]
+
+        if len(undos) == 1:
+            # lone commit: its overlay score already is the new state
+            inter_after = accepted_scores[0]["inter"]
+            omega_after = accepted_scores[0]["omega"]
+        else:
+            inter_after = worldline_interaction_graph(self.H)
+            omega_after = hierarchical_closure(self.H, inter_after)
+
+        self._commit_accepted(
+            undos, inter_after, omega_after,
+            geometry_due=(
+                self.time // self.geometry_stride
+                != t_prev // self.geometry_stride
+            ),
+        )
+
+        self._last_step_time = time.perf_counter() - _t0
+        self._report(
+            omega_after,
+            self.time // self.print_interval != t_prev // self.print_interval,
+        )
+        return len(undos)
+
+    def _score_in_workers(self, candidates, omega_before, workers):
+        """
+        score_proposal for every candidate, split over worker
+        processes. H, the candidates and ξ are pickled once into a
+        read-only snapshot that every worker unpickles.
+        """
+        if self._pool is None or self._pool_workers != workers:
+            self.close()
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+            self._pool_workers = workers
+
+        snapshot = pickle.dumps(
+            (self.H, candidates, self.xi), pickle.HIGHEST_PROTOCOL
+        )
+        n = min(workers, len(candidates))
+        jobs = [
+            (snapshot, range(k, len(candidates), n), omega_before,
+             self.xi_threshold, self.epsilon_label_violation, GAMMA_DEFECT)
+            for k in range(n)
+        ]
+        scores = [None] * len(candidates)
+        for k, chunk in enumerate(self._pool.map(_score_chunk, jobs)):
+            scores[k::n] = chunk
+        return scores
+
+    def close(self):
+        """
+        Shut down the worker processes of step_batch(workers=...).
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = None
+
+    def _footprint(self, delta, inter):
+        """
+        (read, write) vertex-id sets of a delta. Writes (the anchor
+        edge of a creation, the fused vertices and removed edges of a
+        fusion) are widened by one interaction-graph hop so that batch
+        members stay apart.
+        """
+        if delta["kind"] == "create":
+            # the new edge changes the anchor vertices' adjacency and
+            # closure, so the anchor edge and its one-hop neighbourhood
+            # are written
+            anchor = {v.id for v in delta["new_edge"].vertices[:-1]}
+            reads = anchor | {u.id for u in delta["causal_parents"]}
+            writes = set(anchor)
+            for v in anchor:
+                writes.update(inter.get(v, ()))
+            return reads, writes
+
+        core = {delta["v_keep"].id, delta["v_remove"].id}
+        for eid in delta["removed_edges"]:
+            core |= {v.id for v in self.H.hyperedges[eid].vertices}
+        writes = set(core)
+        for v in core:
+            writes.update(inter.get(v, ()))
+        return core, writes
+
     # --------------------------------------------------
     # Rewrite proposal
     # --------------------------------------------------
-    def _propose_rewrite(self):
+    def _propose_delta(self):
         protected_ids = [
             vid for vid, x in self.xi.items()
             if x > self.xi_threshold and vid in self.H.vertices
         ]
-    
+
         if protected_ids and random.random() < 0.7:
             vid = random.choice(protected_ids)
             v_obj = self.H.vertices[vid]
-            return edge_creation_rule(self.H, anchor_vertex=v_obj)
-    
+            return propose_edge_creation(self.H, anchor_vertex=v_obj)
+
         if random.random() < 0.6:
-            return edge_creation_rule(self.H)
-    
-        return vertex_fusion_rule(self.H)
+            return propose_edge_creation(self.H)
+
+        return propose_vertex_fusion(self.H)
+
+    # --------------------------------------------------
+    # Acceptance
+    # --------------------------------------------------
+    def acceptance_probability(self, delta_omega, V):
+        return acceptance_probability(
+            delta_omega, V, self.epsilon_label_violation
+        )
+
+    def score_proposal(self, delta, omega_before=None):
+        """
+        Evaluate a proposed delta against base + overlay views.
+        H is not mutated, so several proposals can be scored against
+        the same base state. Returns Ω after, ΔΩ, the acceptance
+        probability, the tentative interaction graph and the ξ
+        that added vertices would inherit.
+        """
+        if omega_before is None:
+            omega_before = self.current_omega()
+        return score_delta(
+            self.H, delta, omega_before, self.xi, self.xi_threshold,
+            self.epsilon_label_violation,
+        )
+
+    def current_omega(self):
+        if not hasattr(self, "_cached_omega"):
+            self._cached_inter = worldline_interaction_graph(self.H)
+            self._cached_omega = hierarchical_closure(
+                self.H, self._cached_inter
+            )
+            self._publish_state()
+        return self._cached_omega
+
+    def _publish_state(self):
+        """
+        Share the cached interaction graph / Ω through H.memo, so
+        observe(H, ...) at this version does not recompute them.
+        """
+        memo = getattr(self.H, "memo", None)
+        if memo is None:
+            return
+        memo.put(("interaction_graph", ()), self._cached_inter)
+        memo.put(("omega", ()), self._cached_omega)
+
     # --------------------------------------------------
     # ξ propagation (cluster-aware, ORIGINAL)
     # --------------------------------------------------
@@ -341,19 +924,21 @@ class RewriteEngine:
         if not topo_ids:
             return
 
+        pair_d = distance.pairwise_group_distances(
+            self._csr(inter),
+            [topo_groups[cid] for cid in topo_ids],
+            max_depth=6,
+        )
+
         for i in range(len(topo_ids)):
             for j in range(i + 1, len(topo_ids)):
-                A = topo_groups[topo_ids[i]]
-                B = set(topo_groups[topo_ids[j]])
-
-                d = min(
-                    self.graph_distance(inter, v, B, max_depth=6)
-                    for v in A
-                )
+                d = pair_d.get((i, j), float("inf"))
                 if not math.isfinite(d):
-                    if self.verbose:
-                        print(
-                            f"[geom-skip] infinite distance skipped "
+                    if self.verbose and self._log_enabled("geom", DEBUG):
+                        self._log(
+                            "geom",
+                            f"[geom-skip] infinite distance skipped ",
+                            DEBUG,
                         )
                     continue
 
@@ -383,15 +968,15 @@ class RewriteEngine:
         if len(cluster_ids) < 2:
             return
 
+        pair_d = distance.pairwise_group_distances(
+            self._csr(inter),
+            [cluster_to_vertices[cid] for cid in cluster_ids],
+            max_depth=8,
+        )
+
         for i in range(len(cluster_ids)):
             for j in range(i + 1, len(cluster_ids)):
-                A = cluster_to_vertices[cluster_ids[i]]
-                B = set(cluster_to_vertices[cluster_ids[j]])
-
-                d = min(
-                    self.graph_distance(inter, v, B, max_depth=8)
-                    for v in A
-                )
+                d = pair_d.get((i, j), float("inf"))
 
                 if not math.isfinite(d):
                     continue
@@ -403,9 +988,11 @@ class RewriteEngine:
                     + (1 - self.DISTANCE_MEMORY_DECAY) * d
                 )
 
-                if self.verbose:
-                    print(
-                        f"[geom-add] xi_pair ({cluster_ids[i]}, {cluster_ids[j]}) d={d}"
+                if self.verbose and self._log_enabled("geom", DEBUG):
+                    self._log(
+                        "geom",
+                        f"[geom-add] xi_pair ({cluster_ids[i]}, {cluster_ids[j]}) d={d}",
+                        DEBUG,
                     )
     # --------------------------------------------------
     # ξ-current logging
@@ -453,26 +1040,28 @@ class RewriteEngine:
 
         return inter
 
+    def _csr(self, inter):
+        """
+        CSR snapshot of inter, reused while the same graph object is queried.
+        """
+        if self._csr_cache is None or self._csr_cache[0] is not inter:
+            self._csr_cache = (inter, distance.CSRGraph(inter))
+        return self._csr_cache[1]
+
     def graph_distance(self, inter, start, targets, max_depth=50):
-        if start in targets:
-            return 0
-        visited = {start}
-        frontier = {start}
-        depth = 0
-
-        while frontier and depth < max_depth:
-            depth += 1
-            nxt = set()
-            for v in frontier:
-                for u in inter.get(v, []):
-                    if u in visited:
-                        continue
-                    if u in targets:
-                        return depth
-                    visited.add(u)
-                    nxt.add(u)
-            frontier = nxt
-        return float("inf")
+        return distance.set_distance(
+            self._csr(inter), (start,), targets, max_depth=max_depth
+        )
+
+    def multi_source_distances(self, inter, sources, max_depth=50):
+        """
+        Distance from every reachable vertex to the nearest source.
+        Single BFS seeded with all sources; vertices farther than
+        max_depth are left out.
+        """
+        return distance.multi_source_distances(
+            self._csr(inter), sources, max_depth=max_depth
+        )
 
     def _record_rewrite(self, undo):
         self.rewrite_history.append({
@@ -509,6 +1098,7 @@ class RewriteEngine:
     def force_defect(self, magnitude):
         vid = random.choice(list(self.H.vertices.keys()))
         v_obj = self._vid_to_vertex(vid)
+        q_before = self.H.mixed_edges
         undo = edge_creation_rule(self.H, anchor_vertex=v_obj)
         if undo is None:
             return False
@@ -516,9 +1106,13 @@ class RewriteEngine:
         self.xi[vid] = self.xi.get(vid, 0.0) + magnitude
         self.forced_time = self.time
         self._record_rewrite(undo)
+        self.defect_detector.inject(
+            self.time, self.current_omega(),
+            self.H.mixed_edges - q_before, vid,
+        )
         
         if self.verbose:
-            print(f"[inject] defect at t={self.time} v={vid}")
+            self._log("inject", f"[inject] defect at t={self.time} v={vid}")
         return True
 
     def force_second_proto_object(self, omega_kick, xi_seed, min_distance):
@@ -527,36 +1121,47 @@ class RewriteEngine:
         if not xi_support:
             return False
 
-        best_vid = None
-        best_d = -1
-
+        # One multi-source BFS labels every vertex with its distance
+        # to the ξ support; unreached vertices are beyond max_depth.
+        dist = self.multi_source_distances(inter, xi_support, max_depth=20)
+        layers = defaultdict(list)
         for vid in self.H.vertices.keys():
-            d = self.graph_distance(inter, vid, xi_support, max_depth=20)
-            if d > best_d:
-                best_d = d
-                best_vid = vid
-
-            if d >= min_distance:
-                self.xi[vid] = xi_seed
-                # 🔧 FORCE causal bridge (DEBUG ONLY)
-                u = next(iter(xi_support))
-                self.H.add_causal_relation(
-                    self.H.vertices[u],
-                    self.H.vertices[vid],
-                )
-                self.forced_time = self.time
-                print(
-                    f"### SECOND PROBE at t={self.time} | v={vid} | d={d}"
-                )
-                return True
+            layers[dist.get(vid, float("inf"))].append(vid)
+
+        far = [
+            vid for d, vids in layers.items()
+            if d >= min_distance
+            for vid in vids
+        ]
+        if far:
+            vid = random.choice(far)
+            d = dist.get(vid, float("inf"))
+            self.xi[vid] = xi_seed
+            # 🔧 FORCE causal bridge (DEBUG ONLY), unless it would close
+            # a causal cycle (vid already in u's past)
+            u = next(iter(xi_support))
+            src, dst = self.H.vertices[u], self.H.vertices[vid]
+            if u != vid and not self.H.is_causally_related(dst, src):
+                self.H.add_causal_relation(src, dst)
+            # depths moved outside a rewrite: rebuild local Ω next commit
+            self.local_omega_field = None
+            self.forced_time = self.time
+            self._log(
+                "probe",
+                f"### SECOND PROBE at t={self.time} | v={vid} | d={d}",
+            )
+            return True
 
-        # fallback
-        if best_vid is not None and best_d > 0:
+        # fallback: farthest layer
+        best_d = max(layers) if layers else -1
+        if best_d > 0:
+            best_vid = random.choice(layers[best_d])
             self.xi[best_vid] = xi_seed
             self.forced_time = self.time
-            print(
+            self._log(
+                "probe",
                 f"### SECOND PROBE (fallback) at t={self.time} | "
-                f"v={best_vid} | max_d={best_d}"
+                f"v={best_vid} | max_d={best_d}",
             )
             return True
 
@@ -565,8 +1170,23 @@ class RewriteEngine:
     def undo_changes(self, undo):
         if "removed_vertex" in undo:
             v = undo["removed_vertex"]
-            self.H.vertices[v.id] = v
-            self.H.causal_order[v.id] = set()
+            self.H.insert_vertex(v)
+            causal = self.H.causal
+            keep = undo.get("kept_vertex")
+            if keep in causal:
+                # redirected first, so the uncovered ones are not implied
+                for uid in undo.get("redirected", []):
+                    if uid in causal:
+                        causal.unrelate(uid, keep)
+                for uid in undo.get("uncovered", []):
+                    if uid in causal:
+                        causal.relate(uid, keep)
+            for uid in undo.get("old_past", []):
+                if uid in causal:
+                    causal.relate(uid, v.id)
+            for wid in undo.get("old_future", []):
+                if wid in causal:
+                    causal.relate(v.id, wid)
 
         for eid, e in undo.get("removed_edges", {}).items():
             self.H.hyperedges[eid] = e
@@ -575,5 +1195,6 @@ class RewriteEngine:
             self.H.hyperedges.pop(eid, None)
 
         for vid in undo.get("added_vertices", []):
-            self.H.vertices.pop(vid, None)
-            self.H.causal_order.pop(vid, None)
\ No newline at end of file
+            v = self.H.vertices.get(vid)
+            if v is not None:
+                self.H.remove_vertex(v)
\ No newline at end of file
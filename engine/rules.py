@@ -2,18 +2,18 @@
 
 import random
 
+from engine.hypergraph import Hyperedge
 
-def edge_creation_rule(H, anchor_vertex=None):
+
+# ------------------------------------------------------------
+# Proposals: a rule draws a delta without touching H
+# ------------------------------------------------------------
+
+def propose_edge_creation(H, anchor_vertex=None):
 
     if not H.hyperedges:
         return None
 
-    undo = {
-        "added_vertices": [],
-        "added_edges": [],
-        "added_causal": []
-    }
-
     if anchor_vertex is None:
         edge = random.choice(list(H.hyperedges.values()))
     else:
@@ -25,75 +25,172 @@ def edge_creation_rule(H, anchor_vertex=None):
             return None
         edge = random.choice(candidates)
 
-    new_vertex = H.add_vertex()
-    undo["added_vertices"].append(new_vertex.id)
+    new_vertex = H.new_vertex()
 
     # connect causally to vertices in the chosen edge
-    for v in edge.vertices:
-        H.add_causal_relation(v, new_vertex)
-        undo["added_causal"].append((v.id, new_vertex.id))
-
-    # causal thickening
-    for v in edge.vertices:
-        for u in H.causal_past(v):
-            if random.random() < 0.3:
-                H.add_causal_relation(u, new_vertex)
-                undo["added_causal"].append((u.id, new_vertex.id))
-
-    # create new hyperedge
-    e = H.add_hyperedge(list(edge.vertices) + [new_vertex])
-    undo["added_edges"].append(e.id)
+    causal = [v for v in edge.vertices]
+
+    # causal thickening (already implied when the order is transitive)
+    if not H.causal.transitive:
+        for v in edge.vertices:
+            # id order, so the draws do not depend on set layout
+            for u in sorted(H.causal_past(v), key=lambda u: u.id):
+                if random.random() < 0.3:
+                    causal.append(u)
+
+    # depth the new vertex will have once its relations exist
+    for u in causal:
+        new_vertex.depth = max(new_vertex.depth, u.depth + 1)
+
+    # the vertex the rewrite grows from: the requested anchor, or the
+    # tip of the edge it extends
+    anchor = anchor_vertex if anchor_vertex is not None else edge.vertices[-1]
+
+    return {
+        "kind": "create",
+        "anchor": anchor.id,
+        "new_vertex": new_vertex,
+        "causal_parents": causal,
+        "new_edge": Hyperedge(list(edge.vertices) + [new_vertex]),
+    }
 
-    return undo
 
-def vertex_fusion_rule(H):
-    
+def propose_vertex_fusion(H):
+
     if len(H.vertices) < 3 or len(H.hyperedges) < 1:
         return None
 
     edge = random.choice(list(H.hyperedges.values()))
-    
+
     if len(edge.vertices) < 3:
         return None
 
     v_keep = edge.vertices[0]
     v_remove = edge.vertices[1]
-    
 
-    remaining_edges = [
-        e for e in H.hyperedges.values()
-        if v_remove not in e.vertices
+    removed_edges = [
+        eid for eid, e in H.hyperedges.items()
+        if v_remove in e.vertices
     ]
-    
-    if not remaining_edges:
+
+    if len(removed_edges) == len(H.hyperedges):
         return None
 
+    return {
+        "kind": "fusion",
+        "v_keep": v_keep,
+        "v_remove": v_remove,
+        "removed_edges": removed_edges,
+    }
+
+
+def rewrite_summary(delta):
+    """
+    Vertex/edge ids a delta adds or removes, and the id of the vertex it
+    is anchored at (engine.last_rewrite format).
+    """
+    if delta["kind"] == "create":
+        return {
+            "anchor": delta["anchor"],
+            "added_vertices": [delta["new_vertex"].id],
+            "removed_vertices": [],
+            "added_edges": [delta["new_edge"].id],
+        }
+    return {
+        "anchor": delta["v_keep"].id,
+        "added_vertices": [],
+        "removed_vertices": [delta["v_remove"].id],
+        "added_edges": [],
+    }
+
+
+def rewrite_class(delta):
+    """
+    Key of the rewrite a delta makes, independent of the ids of the
+    vertex and edge it would create: two deltas with the same class
+    lead to the same state up to those ids, so they have the same ΔΩ.
+    """
+    if delta["kind"] == "create":
+        return (
+            "create",
+            tuple(v.id for v in delta["new_edge"].vertices[:-1]),
+            tuple(u.id for u in delta["causal_parents"]),
+        )
+    return ("fusion", delta["v_keep"].id, delta["v_remove"].id)
+
+
+# ------------------------------------------------------------
+# Application: commit a delta, returning its undo record
+# ------------------------------------------------------------
+
+def apply_rewrite(H, delta):
+    if delta["kind"] == "create":
+        return _apply_edge_creation(H, delta)
+    return _apply_vertex_fusion(H, delta)
+
+
+def _apply_edge_creation(H, delta):
+    undo = {
+        "added_vertices": [],
+        "added_edges": [],
+        "added_causal": []
+    }
+
+    new_vertex = H.insert_vertex(delta["new_vertex"])
+    undo["added_vertices"].append(new_vertex.id)
+
+    for u in delta["causal_parents"]:
+        H.add_causal_relation(u, new_vertex)
+        undo["added_causal"].append((u.id, new_vertex.id))
+
+    e = H.insert_hyperedge(delta["new_edge"])
+    undo["added_edges"].append(e.id)
+
+    return undo
+
+
+def _apply_vertex_fusion(H, delta):
+    v_keep = delta["v_keep"]
+    v_remove = delta["v_remove"]
+
+    # log only the stored relations fusion changes: those of v_remove,
+    # and the u → v_keep that redirect adds or makes redundant
     undo = {
         "removed_vertex": v_remove,
+        "kept_vertex": v_keep.id,
         "removed_edges": {},
-        "old_causal": {}
+        "old_past": H.causal.stored_past_ids(v_remove.id),
+        "old_future": H.causal.stored_future_ids(v_remove.id),
     }
 
-    # log causal relations
-    for u in H.vertices.values():
-        if v_remove.id in H.causal_order[u.id]:
-            undo["old_causal"][u.id] = set(H.causal_order[u.id])
-
     # redirect causal relations
-    for u in H.vertices.values():
-        if v_remove.id in H.causal_order[u.id]:
-            H.causal_order[u.id].add(v_keep.id)
-            H.causal_order[u.id].discard(v_remove.id)
+    undo["redirected"], undo["uncovered"] = H.redirect_causal(
+        v_remove, v_keep
+    )
 
     # remove edges containing v_remove
-    for eid in list(H.hyperedges.keys()):
-        e = H.hyperedges[eid]
-        if v_remove in e.vertices:
-            undo["removed_edges"][eid] = e
-            del H.hyperedges[eid]
+    for eid in delta["removed_edges"]:
+        undo["removed_edges"][eid] = H.hyperedges.pop(eid)
 
     # remove vertex
-    del H.vertices[v_remove.id]
-    del H.causal_order[v_remove.id]
+    H.remove_vertex(v_remove)
+
+    return undo
+
 
-    return undo
\ No newline at end of file
+# ------------------------------------------------------------
+# Mutating rules (propose + apply)
+# ------------------------------------------------------------
+
+def edge_creation_rule(H, anchor_vertex=None):
+    delta = propose_edge_creation(H, anchor_vertex)
+    if delta is None:
+        return None
+    return apply_rewrite(H, delta)
+
+
+def vertex_fusion_rule(H):
+    delta = propose_vertex_fusion(H)
+    if delta is None:
+        return None
+    return apply_rewrite(H, delta)
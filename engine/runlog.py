@@ -0,0 +1,194 @@
+# engine/runlog.py
+
+import atexit
+import gzip
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+_STOP = object()
+
+
+class RunLogger:
+    """
+    Buffered run log: console + append-only file, written off-thread.
+
+    Records are (category, level, message). A record is kept when its
+    level reaches the category's threshold (levels[category], else
+    default_level); kept records go to the file unchanged, one per
+    line, so the log stays the plain text the plot/parse scripts read.
+
+    File writes happen on a background thread in batches of up to
+    batch_lines (or every flush_interval seconds). The console shows
+    at most one line of a category every console_interval[category]
+    seconds (unlisted categories and WARNING and above: every line).
+
+    A logger writes one run, so rotation happens only when it opens
+    the file: a log already past max_bytes is moved to path.1
+    (gzip-compressed with compress=True), keeping `backups` old files.
+    A run is never split across files (the live file may grow past
+    max_bytes while it runs), so read_run always finds its header.
+    The writer thread is a daemon; close() is registered with atexit
+    so queued records still reach the file when the process exits
+    without closing the logger.
+
+    The logger is also a text stream, so it can stand in for
+    sys.stdout: printed lines become records of category "stdout".
+    """
+
+    def __init__(
+        self,
+        path,
+        console=None,
+        levels=None,
+        default_level=INFO,
+        console_interval=None,
+        batch_lines=256,
+        flush_interval=1.0,
+        max_bytes=64 * 1024 * 1024,
+        backups=3,
+        compress=True,
+    ):
+        self.path = path
+        self.console = sys.stdout if console is None else console
+        self.levels = dict(levels or {})
+        self.default_level = default_level
+        self.console_interval = dict(console_interval or {})
+        self.batch_lines = batch_lines
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+
+        self._console_last = {}
+        self._partial = ""
+        self._queue = queue.SimpleQueue()
+        if (
+            max_bytes
+            and os.path.exists(path)
+            and os.path.getsize(path) >= max_bytes
+        ):
+            self._rotate()
+        self._file = open(path, "a")
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        self.closed = False
+        atexit.register(self.close)
+
+    # ---------- Records ----------
+
+    def enabled(self, category, level=INFO):
+        """
+        True if a record of this category/level would be kept; check
+        before formatting expensive messages.
+        """
+        return level >= self.levels.get(category, self.default_level)
+
+    def log(self, category, message, level=INFO):
+        if not self.enabled(category, level):
+            return
+        self._queue.put(message)
+        self._to_console(category, message, level)
+
+    def _to_console(self, category, message, level):
+        if self.console is None:
+            return
+        interval = self.console_interval.get(category, 0.0)
+        if level < WARNING and interval > 0:
+            now = time.monotonic()
+            last = self._console_last.get(category)
+            if last is not None and now - last < interval:
+                return
+            self._console_last[category] = now
+        self.console.write(message + "\n")
+
+    # ---------- Stream interface (sys.stdout replacement) ----------
+
+    def write(self, text):
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self.log("stdout", line)
+        return len(text)
+
+    def flush(self):
+        if self.console is not None:
+            self.console.flush()
+
+    # ---------- Writer thread ----------
+
+    def _writer(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if item is not None and not stop:
+                batch.append(item)
+
+            if batch and (
+                stop
+                or len(batch) >= self.batch_lines
+                or time.monotonic() >= deadline
+            ):
+                self._write_batch(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        self._file.write("\n".join(batch) + "\n")
+        self._file.flush()
+
+    def _rotate(self):
+        suffix = ".gz" if self.compress else ""
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}{suffix}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}{suffix}")
+        if self.backups > 0:
+            if self.compress:
+                with open(self.path, "rb") as src, \
+                        gzip.open(f"{self.path}.1.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """
+        Flush everything queued and stop the writer thread.
+        """
+        if self.closed:
+            return
+        atexit.unregister(self.close)
+        if self._partial:
+            self.log("stdout", self._partial)
+            self._partial = ""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file.close()
+        self.flush()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+# engine/series.py
+
+from array import array
+
+
+class StepSeries:
+    """
+    Per-step observables in typed columns.
+
+    Columns are preallocated arrays that double when full, so a record
+    is a handful of slot writes; every value comes from state the engine
+    already holds (cached Ω, counters, depth index), never a rebuild.
+    """
+
+    COLUMNS = (
+        ("t", "q"),          # engine clock after the step
+        ("omega", "d"),      # Ω of the current state
+        ("V", "q"),          # number of vertices
+        ("E", "q"),          # number of hyperedges
+        ("k", "d"),          # <k>
+        ("L", "q"),          # max chain length
+        ("accepted", "q"),   # rewrites committed by the step
+    )
+
+    def __init__(self, capacity=1024):
+        self.n = 0
+        self.capacity = capacity
+        self.columns = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, code in self.COLUMNS
+        }
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self):
+        for col in self.columns.values():
+            col.extend(array(col.typecode, bytes(col.itemsize * self.capacity)))
+        self.capacity *= 2
+
+    def record(self, t, omega, V, E, k, L, accepted):
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        c = self.columns
+        c["t"][i] = t
+        c["omega"][i] = omega
+        c["V"][i] = V
+        c["E"][i] = E
+        c["k"][i] = k
+        c["L"][i] = L
+        c["accepted"][i] = accepted
+        self.n = i + 1
+
+    def column(self, name):
+        """
+        The filled part of a column (a copy).
+        """
+        return self.columns[name][:self.n]
+
+    def to_dict(self, stride=1):
+        """
+        JSON-ready {column: list}, keeping the last step of every
+        stride-step window (a trailing partial window is dropped).
+        accepted is summed over each window, so acceptance counts
+        survive decimation.
+        """
+        n = self.n
+        out = {
+            name: self.columns[name][stride - 1:n:stride].tolist()
+            for name, _ in self.COLUMNS
+            if name != "accepted"
+        }
+        acc = self.columns["accepted"]
+        out["accepted"] = [
+            sum(acc[i - stride + 1:i + 1])
+            for i in range(stride - 1, n, stride)
+        ]
+        out["stride"] = stride
+        return out
@@ -2,7 +2,11 @@
 
 from engine.hypergraph import Hypergraph
 from engine.rewrite_engine import RewriteEngine
-from engine.observables import average_coordination, myrheim_meyer_dimension
+from engine.observables import (
+    average_coordination,
+    myrheim_meyer_dimension,
+    exact_ordering_fraction,
+)
 
 
 def run_universe(p_create, steps=10000, seed=0):
@@ -18,28 +22,32 @@ def run_universe(p_create, steps=10000, seed=0):
 
     k_avg = average_coordination(H)
     dim = myrheim_meyer_dimension(H, samples=800, min_interval=20)
+    exact = exact_ordering_fraction(H)
+    dim_exact = exact["dimension"] if exact else None
 
-    return len(H.vertices), k_avg, dim
+    return len(H.vertices), k_avg, dim, dim_exact
 
 
 def main():
-    print("p_create | vertices | <k>    | dimension")
-    print("------------------------------------------")
+    print("p_create | vertices | <k>    | dimension | exact dim")
+    print("------------------------------------------------------")
 
     for p in [0.47, 0.48, 0.49, 0.50, 0.51, 0.52, 0.53]:
-        vertices, k_avg, dim = run_universe(
+        vertices, k_avg, dim, dim_exact = run_universe(
             p_create=p,
             steps=10000,
             seed=1
         )
 
         dim_str = f"{dim:.2f}" if dim is not None else "None"
+        exact_str = f"{dim_exact:.2f}" if dim_exact is not None else "None"
 
         print(
             f"{p:7.2f} | "
             f"{vertices:8d} | "
             f"{k_avg:6.2f} | "
-            f"{dim_str}"
+            f"{dim_str:>9} | "
+            f"{exact_str}"
         )
 
 
@@ -2,7 +2,11 @@
 
 from engine.hypergraph import Hypergraph
 from engine.rewrite_engine import RewriteEngine
-from engine.observables import average_coordination, myrheim_meyer_dimension
+from engine.observables import (
+    average_coordination,
+    myrheim_meyer_dimension,
+    exact_ordering_fraction,
+)
 
 
 def run_experiment(p_create, steps=8000, seed=0):
@@ -21,28 +25,32 @@ def run_experiment(p_create, steps=8000, seed=0):
 
     k_avg = average_coordination(H)
     dim = myrheim_meyer_dimension(H, samples=500, min_interval=15)
+    exact = exact_ordering_fraction(H)
+    dim_exact = exact["dimension"] if exact else None
 
-    return len(H.vertices), k_avg, dim
+    return len(H.vertices), k_avg, dim, dim_exact
 
 
 def main():
-    print("p_create | vertices | <k>    | dimension")
-    print("------------------------------------------")
+    print("p_create | vertices | <k>    | dimension | exact dim")
+    print("------------------------------------------------------")
 
     for p in [0.45, 0.50, 0.55, 0.58, 0.60, 0.62, 0.65, 0.68]:
-        vertices, k_avg, dim = run_experiment(
+        vertices, k_avg, dim, dim_exact = run_experiment(
             p_create=p,
             steps=8000,
             seed=1
         )
 
         dim_str = f"{dim:.2f}" if dim is not None else "None"
+        exact_str = f"{dim_exact:.2f}" if dim_exact is not None else "None"
 
         print(
             f"{p:7.2f} | "
             f"{vertices:8d} | "
             f"{k_avg:6.2f} | "
-            f"{dim_str}"
+            f"{dim_str:>9} | "
+            f"{exact_str}"
         )
 
 
@@ -7,13 +7,7 @@ def extract_worldlines(H, fraction=0.6):
     """
     Identify worldline vertices by depth threshold.
     """
-    max_depth = H.max_chain_length()
-    cutoff = int(fraction * max_depth)
-
-    worldline_vertices = [
-        v for v in H.vertices.values() if v.depth >= cutoff
-    ]
-    return worldline_vertices
+    return [H.vertices[vid] for vid in sorted(H.worldline_ids(fraction))]
 
 
 def build_interaction_graph(H, worldline_vertices):
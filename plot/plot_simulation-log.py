@@ -1,86 +1,29 @@
-import re
-import matplotlib.pyplot as plt
-
-LOG_FILE = "simulation.log"
+import os
+import sys
 
-# -----------------------------
-# Read full log
-# -----------------------------
-with open(LOG_FILE, "r") as f:
-    lines = f.readlines()
-
-# -----------------------------
-# Find last run
-# -----------------------------
-run_start_indices = [
-    i for i, line in enumerate(lines)
-    if "RUN STARTED:" in line
-]
+import matplotlib.pyplot as plt
 
-if not run_start_indices:
-    raise RuntimeError("No RUN STARTED marker found in simulation.log")
+# run as `python plot/plot_simulation-log.py` (the hyphen rules out -m):
+# put the repository root on the path so the engine package imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-start_idx = run_start_indices[-1]
-run_lines = lines[start_idx:]
+from engine.logindex import read_run
 
-# -----------------------------
-# Storage
-# -----------------------------
-t = []
-k = []
-phi = []
-psi = []
-omega = []
-acc = []
-defect_times = []
+LOG_FILE = "simulation.log"
 
 # -----------------------------
-# Parse only last run
+# Parse only the last run: the log index (simulation.log.idx) seeks
+# straight to its header, scanning only what was appended since
 # -----------------------------
-for line in run_lines:
-    line = line.strip()
-
-    # Defect events
-    if line.startswith("*** DEFECT EVENT"):
-        m = re.search(r"t=(\d+)", line)
-        if m:
-            defect_times.append(int(m.group(1)))
-        continue
-
-    # Skip headers
-    if (
-        not line
-        or line.startswith("=")
-        or line.startswith("RUN STARTED")
-        or line.startswith("time |")
-    ):
-        continue
-
-    if "|" in line:
-        parts = [p.strip() for p in line.split("|")]
-
-        # We require omega column explicitly
-        if len(parts) < 10:
-            continue
-
-        try:
-            t_val = int(parts[0])
-            k_val = float(parts[2])
-            phi_val = float(parts[6])
-            psi_val = float(parts[7])
-            acc_val = float(parts[8].replace("%", ""))
-            omega_val = float(parts[9])
-
-        except ValueError:
-            continue
+run = read_run(LOG_FILE, run=-1)
 
-        # Append ONLY if everything parsed
-        t.append(t_val)
-        k.append(k_val)
-        phi.append(phi_val)
-        psi.append(psi_val)
-        acc.append(acc_val)
-        omega.append(omega_val)
+t = run["t"]
+k = run["k"]
+phi = run["phi"]
+psi = run["psi"]
+omega = run["omega"]
+acc = run["acc"]
+defect_times = run["defect_times"]
 
 # --- checker --
 
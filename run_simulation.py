@@ -4,15 +4,11 @@ import json
 import sys
 from datetime import datetime
 
-from analysis.update_particle_activity import update_particle_activity  
 from engine.hypergraph import Hypergraph
 from engine.rewrite_engine import RewriteEngine
-from engine.observables import (
-    worldline_interaction_graph,
-    interaction_concentration,
-    closure_density,
-    hierarchical_closure,
-)
+from engine.observables import observe
+from engine.runlog import RunLogger, INFO
+from engine import physics_params
 
 # ============================================================
 # Configuration (EXPERIMENT-LEVEL ONLY)
@@ -22,32 +18,22 @@ CONFIG = {
     "seed": 1,
     "max_steps": 10000,
     "sample_interval": 100,
+    "series_stride": 1,        # keep every n-th step of the per-step series
     "log_file": "simulation.log",
     "timeseries_file": "timeseries.json",
 }
 
 
 # ============================================================
-# Dual-output logger (terminal + file, append-only)
+# Run logger (terminal + file, append-only, written off-thread)
 # ============================================================
 
-class DualOutput:
-    def __init__(self, filename):
-        self.terminal = sys.stdout
-        self.log = open(filename, "a")
-
-    def write(self, message):
-        self.terminal.write(message)
-        self.log.write(message)
-        self.terminal.flush()
-        self.log.flush()
-
-    def flush(self):
-        self.terminal.flush()
-        self.log.flush()
-
-
-sys.stdout = DualOutput(CONFIG["log_file"])
+log = RunLogger(
+    CONFIG["log_file"],
+    levels={"geom": INFO},            # [geom-*] lines are DEBUG
+    console_interval={"engine": 0.5},  # file still gets every line
+)
+sys.stdout = log
 
 # ============================================================
 # Initialize universe (NO PHYSICS TUNING HERE)
@@ -59,13 +45,17 @@ v2 = H.add_vertex()
 H.add_causal_relation(v1, v2)
 H.add_hyperedge([v1, v2])
 
-engine = RewriteEngine(H, seed=CONFIG["seed"])
+engine = RewriteEngine(
+    H, seed=CONFIG["seed"], track_local_omega=True,
+    clustering_log_interval=CONFIG["sample_interval"], logger=log,
+)
 # Load particle tracks from previous run (if any)
 try:
     with open("analysis/particles.json", "r") as f:
         particles = json.load(f)
 except FileNotFoundError:
     particles = []
+engine.track_particles(particles)
 
 # ============================================================
 # Diagnostics state
@@ -76,7 +66,7 @@ rejected = 0
 
 last_k = H.average_coordination()
 last_L = H.max_chain_length()
-last_omega = hierarchical_closure(H, worldline_interaction_graph(H))
+last_omega = observe(H, "omega")
 
 # ============================================================
 # Time-series storage (for plotting)
@@ -110,23 +100,19 @@ for _ in range(1, CONFIG["max_steps"] + 1):
     success = engine.step()
     if success:
         accepted += 1
-        
-        update_particle_activity(engine, particles)
     else:
         rejected += 1
 
     if engine.time % CONFIG["sample_interval"] != 0:
         continue
 
-    inter = worldline_interaction_graph(H)
-
     k = H.average_coordination()
     L = H.max_chain_length()
 
     dk = k - last_k
     dL = L - last_L
 
-    omega = hierarchical_closure(H, inter)
+    omega = observe(H, "omega")
     domega = omega - last_omega
 
     # --- store time series ---
@@ -143,8 +129,8 @@ for _ in range(1, CONFIG["max_steps"] + 1):
         f"{dk:+5.2f} | "
         f"{L:3d} | "
         f"{dL:+3d} | "
-        f"{interaction_concentration(inter):7.4f} | "
-        f"{closure_density(inter):7.4f} | "
+        f"{observe(H, 'interaction_concentration'):7.4f} | "
+        f"{observe(H, 'closure_density'):7.4f} | "
         f"{acc_ratio:5.2%}   | "
         f"{omega:7.4f} | "
         f"{domega:+7.4f} |"
@@ -191,9 +177,17 @@ if len(defects) > 1:
 run_record = {
     "run_started": run_timestamp,
     "config": CONFIG,
+    "physics": {
+        "gamma_defect": physics_params.GAMMA_DEFECT,
+        "inertia_scale": physics_params.INERTIA_SCALE,
+        "interaction_boost": physics_params.INTERACTION_BOOST,
+    },
     "t": timeseries_t,
     "k": timeseries_k,
     "omega": timeseries_omega,
+    "local_omega": engine.local_omega_log,
+    "local_clustering": engine.local_clustering_log,
+    "series": engine.series.to_dict(CONFIG["series_stride"]),
     "defects": defects,
     "rewrite_history": engine.rewrite_history,
     "particle_activity": engine.particle_activity
@@ -216,3 +210,7 @@ existing["runs"].append(run_record)
 
 with open(CONFIG["timeseries_file"], "w") as f:
     json.dump(existing, f, indent=2)
+
+# flush the log and hand the terminal back
+sys.stdout = log.console
+log.close()
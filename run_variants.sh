@@ -19,18 +19,8 @@ for V in "${VARIANTS[@]}"; do
 
   python3 run_simulation.py
 
-  python3 -m analysis.track_particles
-  python3 -m analysis.measure_signal_speed
-  python3 -m analysis.export_lorentz_cone
-  python3 -m analysis.export_effective_eom
-  python3 -m analysis.export_particle_stats
-
-  mkdir -p $NAME
-  cp analysis/particle_stats.json $NAME/
-  cp analysis/effective_eom.json  $NAME/
-  cp analysis/lorentz_cone.json   $NAME/
-  cp analysis/signal_speeds.npy   $NAME/
-
-  echo "Saved results to $NAME"
+  # particles → signal speed → Lorentz cone → EOM → stats, one process
+  python3 -m analysis.pipeline --cache .artifacts --registry runs.sqlite \
+    --copy-to $NAME
   echo
 done
@@ -0,0 +1,40 @@
+import pytest
+
+from engine.hypergraph import Hypergraph
+from engine.rewrite_engine import RewriteEngine
+
+
+def _hypergraph():
+    """
+    The seed universe: two vertices, one causal relation, one edge.
+    """
+    H = Hypergraph()
+    v1 = H.add_vertex()
+    v2 = H.add_vertex()
+    H.add_causal_relation(v1, v2)
+    H.add_hyperedge([v1, v2])
+    return H
+
+
+def _evolved_engine(steps=300, seed=2, **kwargs):
+    engine = RewriteEngine(_hypergraph(), seed=seed, verbose=False, **kwargs)
+    for _ in range(steps):
+        engine.step()
+    return engine
+
+
+@pytest.fixture
+def seed_hypergraph():
+    """
+    Factory for a fresh seed universe.
+    """
+    return _hypergraph
+
+
+@pytest.fixture
+def evolved_engine():
+    """
+    Factory: evolved_engine(steps, seed, **engine options) builds an
+    engine on the seed universe and runs `steps` steps.
+    """
+    return _evolved_engine
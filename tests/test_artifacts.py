@@ -0,0 +1,91 @@
+import json
+
+from analysis.artifacts import ArtifactCache, Step, content_hash, evaluate_runs
+from analysis.pipeline import run_pipeline
+
+
+CALLS = []
+
+
+def _double(run):
+    CALLS.append("double")
+    return [2 * x for x in run["xs"]]
+
+
+def _total(xs, offset=0):
+    CALLS.append("total")
+    return sum(xs) + offset
+
+
+STEPS = (
+    Step("double", _double),
+    Step("total", _total, inputs=("double",), params={"offset": 1}),
+)
+
+
+def test_second_evaluation_is_served_from_cache(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    run = {"xs": [1, 2, 3]}
+    CALLS.clear()
+
+    values, computed = cache.evaluate(STEPS, run)
+    assert values == {"double": [2, 4, 6], "total": 13}
+    assert computed == ["double", "total"]
+
+    values, computed = cache.evaluate(STEPS, {"xs": [1, 2, 3]})
+    assert values["total"] == 13
+    assert computed == []
+    assert CALLS == ["double", "total"]
+
+    manifest = cache.manifest(content_hash(run))
+    assert set(manifest) == {"double", "total"}
+
+
+def test_changed_input_or_params_recompute(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    cache.evaluate(STEPS, {"xs": [1, 2, 3]})
+
+    _, computed = cache.evaluate(STEPS, {"xs": [1, 2, 4]})
+    assert computed == ["double", "total"]
+
+    bumped = (STEPS[0], Step("total", _total, inputs=("double",),
+                             params={"offset": 2}))
+    values, computed = cache.evaluate(bumped, {"xs": [1, 2, 3]})
+    assert computed == ["total"]
+    assert values["total"] == 14
+
+    # targets limit evaluation to what they need
+    _, computed = cache.evaluate(STEPS, {"xs": [5]}, targets=["double"])
+    assert computed == ["double"]
+
+
+def test_evaluate_runs_in_worker_processes(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    runs = [{"xs": [i, i + 1]} for i in range(4)]
+    out = evaluate_runs(cache, STEPS, runs, workers=2)
+    assert [values["total"] for values, _ in out] == [4 * i + 3
+                                                       for i in range(4)]
+    again = evaluate_runs(cache, STEPS, runs)
+    assert all(computed == [] for _, computed in again)
+
+
+def test_pipeline_with_cache_matches_uncached(tmp_path):
+    history = [
+        {"time": t, "rewrite": {"added_vertices": [t // 10],
+                                "removed_vertices": []}}
+        for t in range(0, 200, 5)
+    ]
+    run = {
+        "defects": [{"time": t, "omega": 0.1} for t in (20, 30, 150)],
+        "rewrite_history": history,
+    }
+    (tmp_path / "effective_eom.json").write_text(json.dumps({}))
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    plain = run_pipeline(run, out_dir=str(tmp_path), verbose=False)
+    first = run_pipeline(run, out_dir=str(tmp_path), verbose=False,
+                         cache=cache)
+    second = run_pipeline(run, out_dir=str(tmp_path), verbose=False,
+                          cache=cache)
+    for key in ("particles", "samples", "lorentz_cone", "particle_stats"):
+        assert first[key] == plain[key] == second[key]
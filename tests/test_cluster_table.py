@@ -0,0 +1,77 @@
+import json
+import random
+
+import numpy as np
+
+from engine.clustertable import ClusterTableWriter
+from analysis.cluster_table import (
+    read_chunks,
+    read_steps,
+    cluster_row_counts,
+    iter_clusters,
+    open_table,
+)
+
+
+def _steps(seed=2, n=300):
+    rng = random.Random(seed)
+    steps = []
+    for t in range(n):
+        sizes = {c: rng.randrange(1, 20) for c in range(12)
+                 if rng.random() < 0.4}
+        steps.append((t * 2, sizes, rng.randrange(0, 6)))
+    return steps
+
+
+def test_roundtrip_in_chunks(tmp_path):
+    path = str(tmp_path / "run.clusters")
+    steps = _steps()
+    with ClusterTableWriter(path, chunk_rows=50) as w:
+        for t, sizes, xi in steps:
+            w.append(t, sizes, xi)
+
+    assert len(list(read_chunks(path))) > 1
+    times, xi = read_steps(path)
+    assert times.tolist() == [t for t, _, _ in steps]
+    assert xi.tolist() == [x for _, _, x in steps]
+
+    expected = {}
+    for t, sizes, x in steps:
+        for c, s in sizes.items():
+            expected.setdefault(c, []).append((t, s, x))
+    assert cluster_row_counts(path) == {
+        c: len(rows) for c, rows in sorted(expected.items())
+    }
+
+    # small max_rows: several streaming passes, same result
+    for max_rows in (1 << 20, 40):
+        got = list(iter_clusters(path, max_rows=max_rows))
+        assert [c for c, _ in got] == sorted(expected)
+        for c, rows in got:
+            assert list(zip(rows["time"].tolist(), rows["size"].tolist(),
+                            rows["xi_support"].tolist())) == expected[c]
+
+    only = [c for c, _ in iter_clusters(path, ids=(3, 5))]
+    assert only == [3, 5]
+
+
+def test_legacy_json_is_converted_once(tmp_path):
+    rewrites = [
+        {"time": t, "cluster_sizes": {"0": t, "10": 1},
+         "xi_support": [1] * (t % 3)}
+        for t in range(5)
+    ]
+    path = tmp_path / "interaction.json"
+    path.write_text(json.dumps({"rewrite_history": rewrites}))
+
+    table = open_table(str(path))
+    assert table == str(path) + ".clusters"
+    rows = dict(iter_clusters(table))
+    assert list(rows) == [0, 10]
+    assert rows[0]["size"].tolist() == [0, 1, 2, 3, 4]
+    assert np.array_equal(rows[10]["xi_support"], [0, 1, 2, 0, 1])
+
+    mtime = (tmp_path / "interaction.json.clusters").stat().st_mtime_ns
+    assert open_table(str(path)) == table
+    assert (tmp_path / "interaction.json.clusters").stat().st_mtime_ns == mtime
+    assert open_table(table) == table
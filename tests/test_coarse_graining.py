@@ -0,0 +1,25 @@
+from engine.observables import (
+    worldline_interaction_graph,
+    coarse_grain_interactions,
+    coarse_grain_pyramid,
+    closure_density,
+)
+
+
+def test_pyramid_matches_level_by_level_coarse_graining(evolved_engine):
+    H = evolved_engine(steps=400, seed=8).H
+
+    inter = worldline_interaction_graph(H)
+    levels = coarse_grain_pyramid(H, inter, scales=(2, 4, 8, 16))
+
+    current = inter
+    for level in levels:
+        coarse, depths = coarse_grain_interactions(H, current, level["scale"])
+        assert level["interactions"] == coarse
+        assert level["depths"] == depths
+        assert level["psi"] == closure_density(coarse)
+        current = coarse
+
+    # no state is kept between calls: another graph, another pyramid
+    empty = coarse_grain_pyramid(H, {}, scales=(2, 4, 8, 16))
+    assert all(level["interactions"] == {} for level in empty)
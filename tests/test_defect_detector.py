@@ -0,0 +1,50 @@
+from engine.defects import DefectDetector
+from engine.rewrite_engine import RewriteEngine
+
+
+def test_detector_schema_and_episodes():
+    log = []
+    det = DefectDetector(log, omega_threshold=0.1, gap=5)
+
+    assert det.observe(1, 0.5, 0.05, 1, False, 3) is None   # small ΔΩ
+    assert det.observe(2, 0.5, 0.3, 0, False, 3) is None    # not topological
+    det.observe(3, 0.6, 0.3, 1, False, 3)
+    det.observe(6, 0.2, -0.4, 0, True, 4)
+    det.observe(20, 0.5, 0.3, -2, False, 7)
+
+    assert [tuple(r) for r in log] == [DefectDetector.FIELDS] * 3
+    assert [r["time"] for r in log] == [3, 6, 20]
+    assert [r["birth_time"] for r in log] == [3, 3, 20]
+
+
+def test_engine_fills_defect_log_while_stepping(evolved_engine):
+    engine = evolved_engine(1200, seed=1)
+    H = engine.H
+
+    assert engine.defect_log
+    for d in engine.defect_log:
+        assert abs(d["delta_omega"]) > engine.epsilon_label_violation
+        assert d["delta_Q"] != 0 or d["xi_active"]
+        assert d["birth_time"] <= d["time"]
+
+    engine.force_defect(magnitude=0.3)
+    assert engine.defect_log[-1]["forced"]
+    assert engine.defect_log[-1]["anchor_vertex"] in H.vertices
+
+
+def test_defects_are_anchored_at_the_rewrite_anchor(seed_hypergraph):
+    engine = RewriteEngine(seed_hypergraph(), seed=1, verbose=False)
+    log = engine.defect_log
+    anchored = 0
+    for _ in range(1200):
+        before = set(engine.H.vertices)
+        n = len(log)
+        engine.step()
+        if len(log) > n:
+            anchor = log[-1]["anchor_vertex"]
+            assert anchor == engine.last_rewrite["anchor"]
+            # the vertex the rewrite grew from, not the one it created
+            assert anchor in before
+            assert anchor not in engine.last_rewrite["added_vertices"]
+            anchored += 1
+    assert anchored
@@ -0,0 +1,68 @@
+import random
+
+from engine.hypergraph import Hypergraph
+from engine.overlay import OverlayView
+from engine.rules import (
+    propose_edge_creation,
+    propose_vertex_fusion,
+    apply_rewrite,
+)
+
+
+def _check(H):
+    depths = [v.depth for v in H.vertices.values()]
+    assert H.max_chain_length() == max(depths, default=0)
+    hist = {}
+    for d in depths:
+        hist[d] = hist.get(d, 0) + 1
+    assert H.depth_histogram() == dict(sorted(hist.items()))
+    for fraction in (0.0, 0.3, 0.6, 0.9):
+        cutoff = int(fraction * H.max_chain_length())
+        brute = {v.id for v in H.vertices.values() if v.depth >= cutoff}
+        assert H.worldline_ids(fraction) == brute
+
+
+def test_buckets_follow_rewrites_and_undo(evolved_engine):
+    engine = evolved_engine(300, seed=2)
+    H = engine.H
+    _check(H)
+
+    random.seed(9)
+    for _ in range(60):
+        if random.random() < 0.5:
+            delta = propose_edge_creation(H)
+        else:
+            delta = propose_vertex_fusion(H)
+        if delta is None:
+            continue
+        view = OverlayView(H, delta)
+        expected_max = view.max_chain_length()
+        expected_ids = view.worldline_ids(0.6)
+
+        undo = apply_rewrite(H, delta)
+        _check(H)
+        assert H.max_chain_length() == expected_max
+        assert H.worldline_ids(0.6) == expected_ids
+
+        engine.undo_changes(undo)
+        _check(H)
+
+
+def test_worldline_shift_reports_crossings():
+    H = Hypergraph()
+    chain = [H.add_vertex() for _ in range(10)]
+    for u, v in zip(chain, chain[1:]):
+        H.add_causal_relation(u, v)
+
+    old = H.worldline_cutoff(0.6)
+    before = H.worldline_ids(0.6)
+    tip = H.add_vertex()
+    for _ in range(5):
+        H.add_causal_relation(chain[-1], tip)
+        chain.append(tip)
+        tip = H.add_vertex()
+
+    cutoff, entered, left = H.worldline_shift(old, 0.6)
+    assert cutoff > old
+    assert not entered
+    assert left == before - H.worldline_ids(0.6)
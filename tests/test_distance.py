@@ -0,0 +1,81 @@
+import random
+
+from engine.distance import (
+    CSRGraph,
+    set_distance,
+    multi_source_distances,
+    batch_set_distances,
+    pairwise_group_distances,
+)
+
+
+def _random_inter(n=200, m=260, seed=0):
+    rng = random.Random(seed)
+    inter = {}
+    for _ in range(m):
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a != b:
+            inter.setdefault(a, set()).add(b)
+            inter.setdefault(b, set()).add(a)
+    return inter
+
+
+def _reference_distance(inter, start, targets, max_depth):
+    if start in targets:
+        return 0
+    visited = {start}
+    frontier = {start}
+    depth = 0
+    while frontier and depth < max_depth:
+        depth += 1
+        nxt = set()
+        for v in frontier:
+            for u in inter.get(v, []):
+                if u in visited:
+                    continue
+                if u in targets:
+                    return depth
+                visited.add(u)
+                nxt.add(u)
+        frontier = nxt
+    return float("inf")
+
+
+def test_bidirectional_matches_reference_bfs():
+    inter = _random_inter()
+    csr = CSRGraph(inter)
+    rng = random.Random(1)
+    for _ in range(200):
+        targets = set(rng.sample(range(220), 3))
+        start = rng.randrange(220)
+        for cap in (2, 5, 50):
+            assert set_distance(csr, (start,), targets, cap) == \
+                _reference_distance(inter, start, targets, cap)
+
+
+def test_bit_parallel_matches_reference_bfs():
+    inter = _random_inter()
+    csr = CSRGraph(inter)
+    targets = {3, 17, 150}
+    starts = list(range(130))  # spans more than one machine word
+    got = batch_set_distances(csr, [[s] for s in starts], targets, 6)
+    assert got == [_reference_distance(inter, s, targets, 6) for s in starts]
+
+    dist = multi_source_distances(csr, targets, 6)
+    for v in inter:
+        expected = _reference_distance(inter, v, targets, 6)
+        assert dist.get(v, float("inf")) == expected
+
+
+def test_pairwise_group_distances():
+    inter = _random_inter()
+    csr = CSRGraph(inter)
+    groups = [[i] for i in range(0, 200, 2)]  # more than one word
+    pairs = pairwise_group_distances(csr, groups, max_depth=5)
+    for i in range(len(groups)):
+        for j in range(i + 1, len(groups)):
+            expected = min(
+                _reference_distance(inter, v, set(groups[j]), 5)
+                for v in groups[i]
+            )
+            assert pairs.get((i, j), float("inf")) == expected
@@ -0,0 +1,37 @@
+import random
+
+from engine.overlay import OverlayView
+from engine.rules import (
+    propose_edge_creation,
+    propose_vertex_fusion,
+    apply_rewrite,
+)
+from engine.observables import label_frustration, defect_density
+
+
+def _scan(H):
+    return sum(
+        1 for e in H.hyperedges.values()
+        if len({v.label for v in e.vertices}) > 1
+    )
+
+
+def test_frustration_counter_tracks_edges_and_undo(evolved_engine):
+    engine = evolved_engine(300, seed=6)
+    H = engine.H
+    assert label_frustration(H) == _scan(H)
+    assert defect_density(H) == _scan(H) / len(H.hyperedges)
+
+    random.seed(1)
+    for _ in range(60):
+        if random.random() < 0.5:
+            delta = propose_edge_creation(H)
+        else:
+            delta = propose_vertex_fusion(H)
+        if delta is None:
+            continue
+        expected = OverlayView(H, delta).mixed_edges
+        undo = apply_rewrite(H, delta)
+        assert label_frustration(H) == _scan(H) == expected
+        engine.undo_changes(undo)
+        assert label_frustration(H) == _scan(H)
@@ -0,0 +1,117 @@
+from engine.rewrite_engine import RewriteEngine
+from engine.observables import (
+    LocalOmegaField,
+    LocalClusteringField,
+    local_omega,
+    local_clustering,
+    worldline_interaction_graph,
+)
+from analysis.build_local_omega_channels import (
+    has_clustering_log,
+    support_clustering_channels,
+)
+
+
+def test_local_fields_match_pointwise_and_track_rewrites(seed_hypergraph):
+    H = seed_hypergraph()
+    engine = RewriteEngine(H, seed=11, verbose=False, track_local_omega=True)
+
+    for _ in range(40):
+        engine.run(10)
+        inter = worldline_interaction_graph(H)
+        omega, clustering = LocalOmegaField(inter), LocalClusteringField(inter)
+        tracked_omega = engine.local_omega_field
+        tracked_clustering = engine.local_clustering_field
+        for vid in set(inter) | set(tracked_omega.ids):
+            assert tracked_omega[vid] == local_omega(H, inter, vid)
+            assert omega[vid] == local_omega(H, inter, vid)
+            assert tracked_clustering[vid] == local_clustering(H, inter, vid)
+            assert clustering[vid] == local_clustering(H, inter, vid)
+
+    values = clustering.values()
+    assert len(values) == len(clustering.ids)
+    assert engine.local_omega_log
+    for r in engine.local_omega_log:
+        assert 0.0 <= r["local_omega"] <= 1.0
+        assert 0.0 <= r["local_clustering"] <= 1.0
+    # clustering, unlike reciprocity, varies on the symmetric graph
+    assert any(0.0 < x < 1.0 for x in values)
+    # the per-vertex log is opt-in
+    assert engine.local_clustering_log == []
+
+
+def test_asymmetric_graph():
+    inter = {1: {2, 3}, 2: {1}, 3: set()}
+    field = LocalOmegaField(inter)
+    assert field[1] == 0.5
+    assert field[2] == 1.0
+    assert field[3] == 0.0
+
+
+def test_clustering_of_small_graph():
+    # triangle 1-2-3 with a pendant 4 on vertex 1
+    inter = {1: {2, 3, 4}, 2: {1, 3}, 3: {1, 2}, 4: {1}}
+    field = LocalClusteringField(inter)
+    assert field[1] == 1 / 3
+    assert field[2] == 1.0
+    assert field[4] == 0.0
+    assert 5 not in field
+
+    # closing 2-4 adds triangle 1-2-4
+    inter = {1: {2, 3, 4}, 2: {1, 3, 4}, 3: {1, 2}, 4: {1, 2}}
+    field.update(inter, {2, 4})
+    assert field[1] == 2 / 3
+    assert field[2] == 2 / 3
+    assert field[4] == 1.0
+
+
+def test_clustering_log_is_decimated_and_replays(seed_hypergraph):
+    engine = RewriteEngine(
+        seed_hypergraph(), seed=11, verbose=False, track_local_omega=True,
+        clustering_log_interval=25,
+    )
+    log = engine.local_clustering_log
+    snapshots = []
+    for _ in range(300):
+        n = len(log)
+        engine.step()
+        if len(log) > n:
+            f = engine.local_clustering_field
+            snapshots.append({v: f[v] for v in f.ids if v in f})
+
+    assert 1 < len(log) <= 300 // 25 + 1
+    times = [r["time"] for r in log]
+    assert len({t // 25 for t in times}) == len(times)
+
+    field = {}
+    for record, expected in zip(log, snapshots):
+        if record["rebuilt"]:
+            field.clear()
+        for v, value in record["values"]:
+            field.pop(v, None)
+            if value is not None:
+                field[v] = value
+        assert field == expected
+
+
+def test_support_channels_index_field_by_particle_support():
+    run = {
+        "local_clustering": [
+            {"time": 0, "rebuilt": True, "values": [[1, 1.0], [2, 0.0],
+                                                     [3, 0.5], [4, 0.5]]},
+            {"time": 10, "rebuilt": False, "values": [[1, 0.0], [4, None]]},
+        ],
+        "rewrite_history": [
+            {"time": t, "rewrite": {"added_vertices": [1, 3]}}
+            for t in (0, 10, 100)
+        ],
+    }
+    particles = [{"times": [0, 5, 10]}, {"times": [500]}]
+    assert has_clustering_log(run)
+
+    channels = support_clustering_channels(particles, run)
+    assert [c["particle"] for c in channels] == [0]
+    ch = channels[0]["channel"]
+    assert [p["time"] for p in ch] == [0, 5, 10]
+    # support {1, 3}; field mean 0.5, then 1/6 once 1 drops and 4 leaves
+    assert [p["omega_local"] for p in ch] == [0.25, 0.25, 0.25 - 1 / 6]
@@ -0,0 +1,42 @@
+from engine.logindex import LogIndex, read_run
+
+
+def _run(ts, omega):
+    lines = ["", "=" * 20, "RUN STARTED: now", "=" * 20,
+             " time |   V   |  <k>  | Δ<k> |  L  | ΔL |"
+             "    Φ    |    Ψ    | acc%   |   omega   |   domega"]
+    for t in ts:
+        lines.append(
+            f"{t:5d} |    10 |  2.00 | +0.10 |   3 |  +1 | "
+            f" 0.1000 |  0.2000 | 50.00%   | {omega:7.4f} | +0.0000 |"
+        )
+    lines.append(f"*** DEFECT EVENT t={ts[-1]}")
+    lines.append("[engine] t=1 noise | not a row")
+    return "\n".join(lines) + "\n"
+
+
+def test_index_seeks_runs_and_updates_incrementally(tmp_path):
+    path = tmp_path / "simulation.log"
+    path.write_text(_run([100, 200], 0.5) + _run([100, 200, 300], 0.7))
+
+    idx = LogIndex(str(path)).update()
+    assert len(idx.runs) == 2
+    assert [t for _, t in idx.defects] == [200, 300]
+
+    last = read_run(str(path))
+    assert list(last["t"]) == [100, 200, 300]
+    assert list(last["omega"]) == [0.7, 0.7, 0.7]
+    assert list(last["defect_times"]) == [300]
+    assert list(read_run(str(path), run=0)["t"]) == [100, 200]
+
+    scanned = idx.scanned
+    with open(path, "a") as f:
+        f.write(_run([100], 0.9))
+    idx = LogIndex(str(path))          # reloads the sidecar
+    assert idx.scanned == scanned
+    idx.update()
+    assert len(idx.runs) == 3
+    assert list(read_run(str(path), index=idx)["omega"]) == [0.9]
+
+    path.write_text(_run([5], 0.1))    # truncated / rotated log
+    assert list(read_run(str(path))["t"]) == [5]
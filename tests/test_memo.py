@@ -0,0 +1,50 @@
+from engine.hypergraph import Hypergraph
+from engine.observables import (
+    observe,
+    worldline_interaction_graph,
+    hierarchical_closure,
+    closure_density,
+)
+
+
+def test_mutations_bump_version():
+    H = Hypergraph()
+    v0 = H.version
+    a = H.add_vertex()
+    b = H.add_vertex()
+    assert H.version > v0
+
+    v1 = H.version
+    H.add_causal_relation(a, b)
+    assert H.version > v1
+
+    v2 = H.version
+    H.add_causal_relation(a, b)  # already present
+    assert H.version == v2
+
+    e = H.add_hyperedge([a, b])
+    v3 = H.version
+    H.hyperedges.pop(e.id)
+    assert H.version > v3
+
+
+def test_observe_matches_fresh_computation_and_reuses_engine_state(
+    evolved_engine,
+):
+    engine = evolved_engine(steps=200, seed=4)
+    H = engine.H
+
+    inter = worldline_interaction_graph(H)
+    assert observe(H, "omega") == hierarchical_closure(H, inter)
+    assert observe(H, "closure_density") == closure_density(inter)
+
+    # the engine's cached graph is served without recomputation
+    misses = H.memo.misses
+    assert observe(H, "interaction_graph") is engine._cached_inter
+    assert observe(H, "omega") == engine._cached_omega
+    assert H.memo.misses == misses
+
+    # any mutation invalidates
+    H.add_vertex()
+    observe(H, "omega")
+    assert H.memo.misses > misses
@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+
+from analysis.defects import defect_momentum_at_time, momentum_timeseries
+from analysis.momentum_series import (
+    momentum_at,
+    momentum_series,
+    series_stats,
+    sorted_times,
+)
+
+
+def _defects(seed=3, n=60):
+    rng = random.Random(seed)
+    times = sorted(rng.randrange(0, 800) for _ in range(n))
+    return [{"time": t} for t in times]
+
+
+def test_momentum_at_matches_scan():
+    defects = _defects()
+    times = sorted_times(defects)
+    queries = list(range(-30, 850, 7)) + [d["time"] for d in defects]
+    got = momentum_at(times, queries, window=20)
+    expected = [defect_momentum_at_time(defects, q, 20) for q in queries]
+    assert got.tolist() == expected
+
+
+def test_batched_series_match_per_defect():
+    defects = _defects()
+    times = sorted_times(defects)
+    offsets, ts, ps = momentum_series(times, window=20, step=5)
+    n, lifetime, mean, var = series_stats(offsets, ts, ps)
+
+    for i, d in enumerate(defects):
+        ref_ts, ref_ps = momentum_timeseries(defects, d, window=20, step=5)
+        assert ref_ps == [defect_momentum_at_time(defects, t, 20)
+                          for t in ref_ts]
+        sl = slice(offsets[i], offsets[i + 1])
+        assert ts[sl].tolist() == ref_ts
+        assert ps[sl].tolist() == ref_ps
+        assert n[i] == len(ref_ps)
+        assert lifetime[i] == ref_ts[-1] - ref_ts[0]
+        assert np.isclose(mean[i], np.mean(ref_ps))
+        assert np.isclose(var[i], np.var(ref_ps))
+
+
+def test_empty():
+    offsets, ts, ps = momentum_series(sorted_times([]))
+    n, lifetime, _, _ = series_stats(offsets, ts, ps)
+    assert len(n) == len(lifetime) == 0
@@ -0,0 +1,27 @@
+from engine.rewrite_engine import RewriteEngine
+
+
+def test_indexed_activity_matches_particle_scan(seed_hypergraph):
+    H = seed_hypergraph()
+    engine = RewriteEngine(H, seed=3, verbose=False)
+
+    b = min(H.vertices)  # vertex ids are global; offset the supports
+    particles = [
+        {"particle_id": 0, "times": [b + 4, b + 5, b + 90]},
+        {"particle_id": 1, "times": [b + 5, b + 40, b + 41]},
+        {"particle_id": 2, "times": [b + 1000]},
+        {"particle_id": 3, "times": [], "vertices": [b + 7, b + 60]},
+    ]
+    engine.track_particles(particles)
+
+    expected = {}
+    for _ in range(200):
+        if engine.step():
+            touched = engine.touched_vertices()
+            for p in particles:
+                if touched & set(p.get("vertices", p["times"])):
+                    pid = p["particle_id"]
+                    expected[pid] = expected.get(pid, 0) + 1
+
+    assert engine.particle_activity == expected
+    assert expected
@@ -0,0 +1,92 @@
+import json
+
+from analysis.pipeline import run_pipeline, copy_outputs, VARIANT_OUTPUTS
+from analysis.track_particles import defect_support
+from analysis.measure_signal_speed import influenced
+
+
+def _run():
+    history = [
+        {"time": t, "rewrite": {"added_vertices": [t // 10],
+                                "removed_vertices": []}}
+        for t in range(0, 400, 5)
+    ]
+    defects = [
+        {"time": t, "omega": 0.1 * i}
+        for i, t in enumerate([20, 30, 45, 200, 215, 390])
+    ]
+    return {"defects": defects, "rewrite_history": history}
+
+
+def test_pipeline_matches_step_definitions(tmp_path):
+    (tmp_path / "effective_eom.json").write_text(json.dumps({"a": 1}))
+    run = _run()
+
+    res = run_pipeline(run, out_dir=str(tmp_path), verbose=False)
+
+    # signal speed: same pairs as the pairwise influence test
+    defects = run["defects"]
+    expected = []
+    for i, d1 in enumerate(defects):
+        for d2 in defects[i + 1:]:
+            dt = d2["time"] - d1["time"]
+            if dt > 0:
+                expected.append(
+                    {"dt": dt,
+                     "influence": int(influenced(d1, d2, run["rewrite_history"]))}
+                )
+    assert res["samples"] == expected
+
+    # particle tracks cover every defect once
+    covered = sorted(i for p in res["particles"] for i in p["defects"])
+    assert covered == list(range(len(defects)))
+    assert defect_support(20, run["rewrite_history"])
+
+    assert res["effective_eom"] == {"a": 1}
+    saved = json.loads((tmp_path / "lorentz_cone.json").read_text())
+    assert saved == res["lorentz_cone"]
+    assert (tmp_path / "signal_speeds.npy").exists()
+    assert json.loads((tmp_path / "particle_stats.json").read_text()) \
+        == res["particle_stats"]
+
+
+def test_pipeline_keeps_particles_without_enough_data(tmp_path, capsys):
+    (tmp_path / "effective_eom.json").write_text(json.dumps({}))
+    (tmp_path / "particles.json").write_text(json.dumps([{"kept": 1}]))
+    run = _run()
+    run["rewrite_history"] = []
+
+    res = run_pipeline(run, out_dir=str(tmp_path),
+                       targets=("particles", "signal_speed", "lorentz_cone",
+                                "particle_stats", "local_omega_channels"))
+
+    assert res["particles"] is None
+    assert "Not enough data to track particles." in capsys.readouterr().out
+    assert json.loads((tmp_path / "particles.json").read_text()) \
+        == [{"kept": 1}]
+    assert res["lorentz_cone"] is None
+    assert res["particle_stats"]["count"] == 0
+    assert res["local_omega_channels"] == []
+
+
+def test_copy_outputs_skips_and_clears_what_the_run_did_not_write(
+        tmp_path, capsys):
+    out, dest = tmp_path / "out", tmp_path / "variant"
+    out.mkdir()
+    dest.mkdir()
+    (out / "effective_eom.json").write_text(json.dumps({}))
+    # left over from an earlier run that did have a cone
+    (out / "lorentz_cone.json").write_text(json.dumps({"stale": 1}))
+    (dest / "lorentz_cone.json").write_text(json.dumps({"stale": 1}))
+    run = _run()
+    run["rewrite_history"] = []
+
+    res = run_pipeline(run, out_dir=str(out), verbose=False)
+    assert res["lorentz_cone"] is None
+    assert "lorentz_cone.json" not in res["outputs"]
+
+    missing = copy_outputs(str(out), str(dest), res["outputs"])
+    assert missing == ["lorentz_cone.json"]
+    assert "lorentz_cone.json not produced" in capsys.readouterr().out
+    assert sorted(p.name for p in dest.iterdir()) \
+        == sorted(n for n in VARIANT_OUTPUTS if n not in missing)
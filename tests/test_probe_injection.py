@@ -0,0 +1,21 @@
+from engine.observables import worldline_interaction_graph
+
+
+def test_multi_source_distances_match_single_bfs(evolved_engine):
+    engine = evolved_engine()
+    engine.force_defect(magnitude=0.3)
+    inter = worldline_interaction_graph(engine.H)
+    sources = {vid for vid, x in engine.xi.items() if x > engine.xi_threshold}
+
+    dist = engine.multi_source_distances(inter, sources, max_depth=20)
+    for vid in engine.H.vertices:
+        expected = engine.graph_distance(inter, vid, sources, max_depth=20)
+        assert dist.get(vid, float("inf")) == expected
+
+
+def test_second_probe_is_placed(evolved_engine):
+    engine = evolved_engine()
+    engine.force_defect(magnitude=0.3)
+    assert engine.force_second_proto_object(
+        omega_kick=0.0, xi_seed=0.3, min_distance=3
+    )
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from analysis.registry import RunRegistry
+
+
+def _run(seed, t_final, gamma=0.15):
+    return {
+        "run_started": f"2026-01-0{seed}",
+        "config": {"seed": seed, "log_file": "simulation.log"},
+        "physics": {"gamma_defect": gamma, "inertia_scale": 1.0,
+                    "interaction_boost": 1.02},
+        "t": [0, t_final],
+        "defects": [{"time": 5}, {"time": 9}],
+    }
+
+
+def test_register_and_query(tmp_path):
+    db = str(tmp_path / "runs.sqlite")
+    with RunRegistry(db) as reg:
+        k1 = reg.register_run(_run(1, 100), run_index=0,
+                              timeseries_path="timeseries.json")
+        k2 = reg.register_run(_run(2, 200, gamma=0.2), run_index=1)
+        reg.record_metrics(k1, omega_c=0.7, nu=1.1)
+        reg.record_metrics(k2, omega_c=float("nan"))
+        reg.record_pipeline(
+            k1,
+            {"lorentz_cone": {"v_max": 1.0, "violations": 0},
+             "effective_eom": {"c_omega_sq": 1.02, "m_omega_sq": 0.006},
+             "particle_stats": {"count": 3, "mean_lifetime": 17.2}},
+            variant="variant_1", variant_dir="variant_1",
+        )
+
+    # reopening sees the same rows; re-registering does not duplicate
+    with RunRegistry(db) as reg:
+        reg.register_run(_run(1, 100))
+        rows = reg.query("SELECT * FROM runs ORDER BY id")
+        assert len(rows) == 2
+        r1 = rows[0]
+        assert r1["seed"] == 1 and r1["t_final"] == 100
+        assert r1["n_defects"] == 2
+        assert r1["run_index"] == 0
+        assert r1["timeseries_path"] == "timeseries.json"
+        assert r1["variant"] == "variant_1"
+        assert (r1["v_max"], r1["c2"], r1["mean_lifetime"]) == (1.0, 1.02, 17.2)
+        assert json.loads(r1["config"])["seed"] == 1
+
+        fit = reg.query(
+            "SELECT omega_c, t_final FROM runs WHERE omega_c IS NOT NULL"
+        )
+        assert fit == [{"omega_c": 0.7, "t_final": 100}]
+
+        by_gamma = reg.query(
+            "SELECT seed FROM runs WHERE gamma_defect = ?", (0.2,)
+        )
+        assert by_gamma == [{"seed": 2}]
+
+        latest = reg.latest_by_variant(["variant_1", "variant_2"])
+        assert [r["variant"] for r in latest] == ["variant_1"]
+
+        with pytest.raises(ValueError):
+            reg.record_metrics(rows[0]["run_key"], speed=1)
+        with pytest.raises(KeyError):
+            reg.record_metrics("missing", v_max=1.0)
+
+        plan = " ".join(
+            str(r["detail"]) for r in reg.query(
+                "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE variant = ?",
+                ("variant_1",),
+            )
+        )
+        assert "runs_variant" in plan
+
+
+def test_runs_without_recorded_physics_store_null(tmp_path):
+    run = _run(3, 50)
+    del run["physics"]
+    with RunRegistry(str(tmp_path / "runs.sqlite")) as reg:
+        reg.register_run(run)
+        rows = reg.query(
+            "SELECT gamma_defect, inertia_scale, interaction_boost FROM runs"
+        )
+    assert rows == [{"gamma_defect": None, "inertia_scale": None,
+                     "interaction_boost": None}]
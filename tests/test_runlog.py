@@ -0,0 +1,83 @@
+import gzip
+import io
+import os
+import subprocess
+import sys
+
+from engine.runlog import RunLogger, DEBUG, INFO, WARNING
+from engine.rewrite_engine import RewriteEngine
+
+
+def test_levels_console_rate_and_stream(tmp_path):
+    path = tmp_path / "run.log"
+    console = io.StringIO()
+    log = RunLogger(
+        str(path), console=console,
+        levels={"geom": INFO},
+        console_interval={"engine": 3600},
+    )
+    log.log("geom", "dropped", DEBUG)
+    log.log("engine", "e1")
+    log.log("engine", "e2")                  # rate-limited on console only
+    log.log("engine", "warn", WARNING)
+    print("table | row", file=log)
+    log.write("partial ")
+    log.close()
+
+    lines = path.read_text().splitlines()
+    assert lines == ["e1", "e2", "warn", "table | row", "partial "]
+    assert console.getvalue().splitlines() == [
+        "e1", "warn", "table | row", "partial ",
+    ]
+
+
+def test_rotation_keeps_runs_whole_and_compresses_old_logs(tmp_path):
+    path = tmp_path / "run.log"
+    for run in range(4):
+        log = RunLogger(
+            str(path), console=io.StringIO(),
+            batch_lines=1, max_bytes=200, backups=2,
+        )
+        log.log("engine", f"RUN STARTED: {run}")
+        for i in range(20):
+            log.log("engine", f"line {i:04d} " + "x" * 20)
+        log.close()
+
+    # every run is rotated whole, once the next one opens the log
+    lines = path.read_text().splitlines()
+    assert lines[0] == "RUN STARTED: 3"
+    assert len(lines) == 21
+    assert os.path.exists(f"{path}.1.gz")
+    assert os.path.exists(f"{path}.2.gz")
+    assert not os.path.exists(f"{path}.3.gz")
+    with gzip.open(f"{path}.1.gz", "rt") as f:
+        assert f.read().splitlines()[0] == "RUN STARTED: 2"
+
+
+def test_records_are_flushed_at_exit_without_close(tmp_path):
+    path = tmp_path / "run.log"
+    code = (
+        "import io\n"
+        "from engine.runlog import RunLogger\n"
+        f"log = RunLogger({str(path)!r}, console=io.StringIO(),\n"
+        "                flush_interval=3600)\n"
+        "for i in range(10):\n"
+        "    log.log('engine', f'line {i}')\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert path.read_text().splitlines() == [f"line {i}" for i in range(10)]
+
+
+def test_engine_routes_messages_through_logger(tmp_path, seed_hypergraph):
+    path = tmp_path / "run.log"
+    log = RunLogger(str(path), console=io.StringIO())
+    engine = RewriteEngine(seed_hypergraph(), seed=1, print_interval=10,
+                           logger=log)
+    engine.run(30)
+    log.close()
+    lines = path.read_text().splitlines()
+    assert lines
+    assert all(line.startswith("[engine] t=") for line in lines)
@@ -0,0 +1,34 @@
+from engine.rewrite_engine import RewriteEngine
+from engine.observables import observe
+
+
+def test_series_records_every_step_from_engine_state(seed_hypergraph):
+    H = seed_hypergraph()
+    engine = RewriteEngine(H, seed=5, verbose=False)
+    accepted = 0
+    for _ in range(250):
+        accepted += engine.step()
+        k_scan = sum(
+            H.coordination_number(v) for v in H.vertices.values()
+        ) / len(H.vertices)
+        assert abs(H.average_coordination() - k_scan) < 1e-12
+
+    s = engine.series
+    assert len(s) == 250
+    assert list(s.column("t")) == list(range(1, 251))
+    assert sum(s.column("accepted")) == accepted
+    assert s.column("V")[-1] == len(H.vertices)
+    assert s.column("E")[-1] == len(H.hyperedges)
+    assert s.column("L")[-1] == H.max_chain_length()
+    assert s.column("omega")[-1] == observe(H, "omega")
+
+    d = s.to_dict(stride=50)
+    assert d["t"] == [50, 100, 150, 200, 250]
+    assert sum(d["accepted"]) == accepted
+
+
+def test_series_can_be_disabled(seed_hypergraph):
+    engine = RewriteEngine(seed_hypergraph(), seed=5, verbose=False,
+                           record_series=False)
+    engine.run(10)
+    assert engine.series is None
@@ -0,0 +1,191 @@
+import random
+
+from engine.hypergraph import Hypergraph
+from engine.rewrite_engine import RewriteEngine
+from engine.rules import (
+    propose_edge_creation,
+    propose_vertex_fusion,
+    apply_rewrite,
+)
+from engine.observables import worldline_interaction_graph, hierarchical_closure
+
+
+def _normalized_history(engine):
+    """
+    rewrite_history with vertex / edge ids relative to the seed
+    universe (ids are global counters).
+    """
+    H = engine.H
+    v0 = engine.base_vertex_id
+    e0 = engine.base_edge_id
+    out = []
+    for rec in engine.rewrite_history:
+        undo = rec["rewrite"]
+        entry = {
+            "time": rec["time"],
+            "added_vertices": [v - v0 for v in undo.get("added_vertices", [])],
+            "added_edges": [e - e0 for e in undo.get("added_edges", [])],
+            "added_causal": [
+                (a - v0, b - v0) for a, b in undo.get("added_causal", [])
+            ],
+        }
+        if "removed_vertex" in undo:
+            entry["removed_vertex"] = undo["removed_vertex"].id - v0
+            entry["kept_vertex"] = undo["kept_vertex"] - v0
+            entry["removed_edges"] = sorted(
+                e - e0 for e in undo["removed_edges"]
+            )
+        out.append(entry)
+    return out
+
+
+def _run(seed_hypergraph, seed, steps, **kwargs):
+    H = seed_hypergraph()
+    engine = RewriteEngine(H, seed=seed, verbose=False, **kwargs)
+    engine.base_vertex_id = min(H.vertices)
+    engine.base_edge_id = min(H.hyperedges)
+    engine.run(steps)
+    return engine
+
+
+def test_speculative_reproduces_default_trajectory(seed_hypergraph):
+    for seed in (1, 3, 8):
+        default = _run(seed_hypergraph, seed, 400, speculative=False)
+        spec = _run(seed_hypergraph, seed, 400, speculative=True)
+
+        assert _normalized_history(spec) == _normalized_history(default)
+        assert len(spec.H.vertices) == len(default.H.vertices)
+        assert len(spec.H.hyperedges) == len(default.H.hyperedges)
+        assert spec.current_omega() == default.current_omega()
+        assert spec.time == default.time
+
+
+def test_overlay_score_matches_applied_rewrite(evolved_engine):
+    engine = evolved_engine(speculative=True, seed=3)
+    H = engine.H
+    random.seed(5)
+
+    for propose in (propose_edge_creation, propose_vertex_fusion) * 5:
+        delta = propose(H)
+        if delta is None:
+            continue
+        n_vertices, n_edges = len(H.vertices), len(H.hyperedges)
+        score = engine.score_proposal(delta)
+        # scoring leaves the base state untouched
+        assert (len(H.vertices), len(H.hyperedges)) == (n_vertices, n_edges)
+
+        apply_rewrite(H, delta)
+        inter = worldline_interaction_graph(H)
+        assert dict(score["inter"]) == dict(inter)
+        assert score["omega"] == hierarchical_closure(H, inter)
+        engine._cached_inter = inter
+        engine._cached_omega = score["omega"]
+
+
+def test_speculative_universe_evolves(evolved_engine):
+    engine = evolved_engine(speculative=True, seed=3, steps=500)
+    assert len(engine.H.vertices) > 2
+    assert engine.rewrite_history
+
+
+def test_rejection_free_events_match_metropolis(seed_hypergraph):
+    for seed in (2, 4, 9):
+        nfold = _run(seed_hypergraph, seed, 150, rejection_free=True)
+        events = len(nfold.rewrite_history)
+        assert events == 150
+
+        metro = _run(seed_hypergraph, seed, 0, speculative=True)
+        while len(metro.rewrite_history) < events:
+            metro.step()
+
+        # same accepted events at the same times: the clock advanced
+        # by exactly the attempts Metropolis spent on each
+        assert _normalized_history(nfold) == _normalized_history(metro)
+        assert nfold.time == metro.time
+        assert nfold.current_omega() == metro.current_omega()
+
+
+def test_rejection_free_event_choice_is_unbiased(seed_hypergraph,
+                                                 monkeypatch):
+    # proposals A (a=1) and B (a=0.1) equally likely:
+    # P(A) = 1 / 1.1, mean waiting time = 1 / 0.55
+    monkeypatch.setattr("engine.rewrite_engine.rewrite_class", lambda d: d)
+    engine = RewriteEngine(seed_hypergraph(), seed=11, verbose=False)
+    engine._propose_delta = lambda: random.choice("AB")
+    engine.score_proposal = lambda delta, omega: {
+        "accept_prob": 1.0 if delta == "A" else 0.1
+    }
+
+    n = 20000
+    picks, waits = [], []
+    for _ in range(n):
+        delta, _, attempts = engine._next_event(0.0)
+        picks.append(delta)
+        waits.append(attempts)
+
+    assert abs(picks.count("A") / n - 1 / 1.1) < 0.01
+    assert abs(sum(waits) / n - 1 / 0.55) < 0.05
+
+
+def test_rejection_free_scores_each_class_once_per_event(seed_hypergraph,
+                                                         monkeypatch):
+    # high rejection: 20 classes with a = 0.002, ~25 attempts per class
+    monkeypatch.setattr("engine.rewrite_engine.rewrite_class", lambda d: d)
+    engine = RewriteEngine(seed_hypergraph(), seed=5, verbose=False)
+    engine._propose_delta = lambda: random.randrange(20)
+    calls = []
+
+    def score(delta, omega):
+        calls.append(delta)
+        return {"accept_prob": 0.002}
+
+    engine.score_proposal = score
+    attempts = evaluations = 0
+    for _ in range(50):
+        engine._next_event(0.0)
+        attempts += engine.last_event["attempts"]
+        evaluations += engine.last_event["evaluations"]
+
+    assert evaluations == len(calls) <= 50 * 21
+    assert attempts > 10 * evaluations
+
+
+def test_batch_generation_commits_disjoint_rewrites():
+    # six disjoint seed universes, so generations have room for
+    # several independent rewrites
+    H = Hypergraph()
+    for _ in range(6):
+        a = H.add_vertex()
+        b = H.add_vertex()
+        H.add_causal_relation(a, b)
+        H.add_hyperedge([a, b])
+    engine = RewriteEngine(H, seed=3, verbose=False)
+
+    accepted = 0
+    largest = 0
+    for _ in range(40):
+        accepted += engine.step_batch(size=6, workers=2, check_serial=True)
+        batch = engine.last_batch
+        assert batch["serial_mismatches"] == 0
+        assert batch["candidates"] >= batch["accepted"]
+
+        # no committed rewrite writes what another one reads or writes
+        fps = batch["footprints"]
+        largest = max(largest, len(fps))
+        for i, (r1, w1) in enumerate(fps):
+            for r2, w2 in fps[i + 1:]:
+                assert not w1 & (r2 | w2)
+                assert not w2 & r1
+
+    assert largest > 1
+    assert len(engine.rewrite_history) == accepted
+
+    # worker processes score a pickled snapshot exactly as in-process
+    omega = engine.current_omega()
+    deltas = [d for d in (engine._propose_delta() for _ in range(12)) if d]
+    local = [engine.score_proposal(d, omega) for d in deltas]
+    remote = engine._score_in_workers(deltas, omega, 2)
+    engine.close()
+    for a, b in zip(local, remote):
+        assert (a["omega"], a["accept_prob"], a["inter"]) \
+            == (b["omega"], b["accept_prob"], b["inter"])